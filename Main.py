@@ -1,11 +1,151 @@
 import os
+import re
 import json
 import time
+import heapq
+import random
+import sys
+import mmap
+import bisect
+import datetime
+import functools
+import contextlib
+import tracemalloc
+import hashlib
+import gzip
+import shutil
+import tempfile
+import itertools
+import unicodedata
+import threading
+import wave
+import uuid
+import queue
+import sqlite3
+import socket
+import asyncio
+import argparse
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk
 import importlib.util
 
 
+# ---------------- Tracing ----------------
+TRACE_MAX_EVENTS = 1_000_000
+TRACE_TICK_MIN_MS = 4.0  # idle UI ticks faster than this are left out of traces
+
+
+class Span:
+    # One timed region: `with trace.span("name"):` or `@trace.span("name")`.
+    # The decorator form checks the tracer on every call, so functions
+    # decorated at import time are traced once tracing is switched on.
+    __slots__ = ("tracer", "name", "cat", "args", "t0")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.t0 = None
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.cat, self.t0, time.perf_counter(), self.args)
+        return False
+
+    def __call__(self, fn):
+        tracer, name, cat, args = self.tracer, self.name, self.cat, self.args
+
+        @functools.wraps(fn)
+        def traced(*a, **kw):
+            if not tracer.enabled:
+                return fn(*a, **kw)
+            t0 = time.perf_counter()
+            try:
+                return fn(*a, **kw)
+            finally:
+                tracer.add(name, cat, t0, time.perf_counter(), args)
+        return traced
+
+
+class _IdleSpan(Span):
+    # handed out while tracing is off; stateless, so one per name is shared
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Tracer:
+    # Chrome trace-event spans (load the export in chrome://tracing or
+    # Perfetto). Off by default; a disabled span costs one attribute check.
+    # Plugins add their own through app.trace.span().
+    def __init__(self):
+        self.enabled = False
+        self.events = []  # (name, cat, t0, t1, thread id, args)
+        self.dropped = 0
+        self._t0 = time.perf_counter()
+        self._idle = {}  # (name, cat) -> shared _IdleSpan
+
+    def enable(self):
+        self.enabled = True
+        self.events = []
+        self.dropped = 0
+        self._t0 = time.perf_counter()
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name, cat="app", **args):
+        if self.enabled:
+            return Span(self, name, cat, args)
+        if args:
+            return _IdleSpan(self, name, cat, args)
+        idle = self._idle.get((name, cat))
+        if idle is None:
+            idle = self._idle[(name, cat)] = _IdleSpan(self, name, cat, args)
+        return idle
+
+    def add(self, name, cat, t0, t1, args=None):
+        if len(self.events) >= TRACE_MAX_EVENTS:
+            self.dropped += 1
+            return
+        self.events.append((name, cat, t0, t1, threading.get_ident(), args))
+
+    def chrome_events(self):
+        pid = os.getpid()
+        threads = {threading.main_thread().ident: "main"}
+        threads.update((t.ident, t.name) for t in threading.enumerate())
+        out = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": PROJECT_NAME}}]
+        for tid in sorted({e[4] for e in self.events}):
+            out.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                        "args": {"name": threads.get(tid, str(tid))}})
+        for name, cat, t0, t1, tid, args in self.events:
+            ev = {"name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                  "ts": round((t0 - self._t0) * 1e6, 1), "dur": round((t1 - t0) * 1e6, 1)}
+            if args:
+                ev["args"] = args
+            out.append(ev)
+        return out
+
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms",
+                       "otherData": {"dropped": self.dropped}}, f, ensure_ascii=False)
+
+
+TRACE = Tracer()
+
+
 # ---------------- Persistence ----------------
 DATA_FILE = "user_data.json"
 
@@ -14,41 +154,110 @@ PROJECT_NAME = "QuadroLingo"
 DEFAULT_DATA = {
     "gems": 0,
     "xp": 0,
-    "owned_items": [],
+    "inventory": {},  # item id -> count
+    "effects": [],  # active timed effects, absolute start/expiry times
+    "device_id": "",
+    "sync": {"cursor": 0, "seq": 0, "pending": [], "rejected": []},
     "completed_lessons": {},
+    "srs": {},  # "lesson_id:item_id" -> [ease, interval_days, reps, due_ts]
+    "xp_events": [],  # [ts, xp, local_day], append-only
     "settings": {
         "theme": "light",  # "light" or "dark"
+        "profile_name": "You",
+        "daily_goal": 20,
+        "sync_server": "",  # "host:port"; empty = no sync
+        "sync_user": "",
+        "leaderboard_window": "week",  # "week", "month" or "all"
+        "reduced_motion": False,
+        "audio_sink": "auto",  # "auto", "null" or "file:<dir>"
     }
 }
 
-def load_data():
-    if not os.path.exists(DATA_FILE):
-        return json.loads(json.dumps(DEFAULT_DATA))
+def upgrade_data(d):
+    # defaults + migrations for a saved user_data dict (ours or another install's)
+    merged = json.loads(json.dumps(DEFAULT_DATA))
+    # shallow merge
+    for k, v in d.items():
+        merged[k] = v
+    merged.setdefault("settings", {})
+    merged["settings"].setdefault("theme", "light")
+    merged["settings"].setdefault("reduced_motion", False)
+    merged["settings"].setdefault("audio_sink", "auto")
+    merged["settings"].setdefault("profile_name", "You")
+    merged["settings"].setdefault("daily_goal", 20)
+    merged["settings"].setdefault("sync_server", "")
+    merged["settings"].setdefault("sync_user", "")
+    merged["settings"].setdefault("leaderboard_window", "week")
+    merged.setdefault("inventory", {})
+    merged.setdefault("effects", [])
+    merged.setdefault("sync", {})
+    for k, v in DEFAULT_DATA["sync"].items():
+        merged["sync"].setdefault(k, v)
+    if not merged.get("device_id"):
+        merged["device_id"] = uuid.uuid4().hex
+    # older saves kept a list of owned ids
+    for oid in merged.pop("owned_items", None) or []:
+        merged["inventory"][oid] = merged["inventory"].get(oid, 0) + 1
+    merged.setdefault("completed_lessons", {})
+    merged.setdefault("srs", {})
+    merged.setdefault("xp_events", [])
+    return merged
+
+@TRACE.span("load_data")
+def load_data(path=None):
+    path = DATA_FILE if path is None else path
+    if not os.path.exists(path):
+        return upgrade_data({})
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             d = json.load(f) or {}
-        merged = json.loads(json.dumps(DEFAULT_DATA))
-        # shallow merge
-        for k, v in d.items():
-            merged[k] = v
-        merged.setdefault("settings", {})
-        merged["settings"].setdefault("theme", "light")
-        merged.setdefault("owned_items", [])
-        merged.setdefault("completed_lessons", {})
-        return merged
+        return upgrade_data(d)
     except Exception:
-        return json.loads(json.dumps(DEFAULT_DATA))
+        return upgrade_data({})
 
-def save_data(data):
+@TRACE.span("save_data")
+def save_data(data, path=None):
     try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
+        with open(DATA_FILE if path is None else path, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
     except Exception as e:
         print("[save error]", e)
 
 
+# ---------------- Clock ----------------
+class Clock:
+    # Time source for everything the UI animates or stamps. Live by default;
+    # a session replay freezes it and moves it forward itself, so animations,
+    # streaks and timestamps come out the same on every run.
+    def __init__(self):
+        self.virtual = None  # seconds since the epoch while frozen
+
+    @property
+    def frozen(self):
+        return self.virtual is not None
+
+    def time(self):
+        return time.time() if self.virtual is None else self.virtual
+
+    def perf_counter(self):
+        return time.perf_counter() if self.virtual is None else self.virtual
+
+    def freeze(self, at):
+        self.virtual = float(at)
+
+    def set(self, at):
+        self.virtual = max(self.virtual, float(at))
+
+    def thaw(self):
+        self.virtual = None
+
+
+CLOCK = Clock()
+
+
 # ---------------- Plugin Loading ----------------
-def load_lessons(lessons_dir="lessons"):
+@TRACE.span("load_lessons")
+def load_lessons(lessons_dir="lessons", profiler=None):
     lessons = []
     base = os.path.abspath(lessons_dir)
     if not os.path.isdir(base):
@@ -65,9 +274,12 @@ def load_lessons(lessons_dir="lessons"):
         if spec is None or spec.loader is None:
             continue
         module = importlib.util.module_from_spec(spec)
+        measure = (profiler.measure(os.path.splitext(filename)[0], "import")
+                   if profiler is not None else contextlib.nullcontext())
 
         try:
-            spec.loader.exec_module(module)
+            with measure, TRACE.span("import", cat="plugin", file=filename):
+                spec.loader.exec_module(module)
         except Exception as e:
             print(f"[Lesson load error] {filename}: {e}")
             continue
@@ -85,13 +297,2367 @@ def load_lessons(lessons_dir="lessons"):
         meta.setdefault("emoji", "📘")
         meta.setdefault("kind", "learn")
         meta.setdefault("order", 999)
-
-        lessons.append({"meta": meta, "build": build, "path": path})
+        if profiler is not None:
+            profiler.register(mod_name, os.path.splitext(filename)[0], meta["id"])
+
+        # optional item-level content for spaced repetition:
+        # [{"id", "prompt", "q", "a", "choices"(optional)}, ...]
+        review_items = getattr(module, "REVIEW_ITEMS", None)
+        if not isinstance(review_items, (list, tuple)):
+            review_items = []
+        review_items = [it for it in review_items
+                        if isinstance(it, dict) and "id" in it and "a" in it]
+
+        # optional extra phrases for the distractor index
+        phrases = getattr(module, "PHRASES", None)
+        if not isinstance(phrases, (list, tuple)):
+            phrases = []
+        phrases = [p for p in phrases if isinstance(p, str)]
+
+        lessons.append({"meta": meta, "build": build, "path": path,
+                        "review_items": review_items, "phrases": phrases})
 
     lessons.sort(key=lambda x: (x["meta"]["kind"], x["meta"].get("order", 999), x["meta"]["title"]))
     return lessons
 
 
+# ---------------- Plugin profiler ----------------
+PLUGIN_BUDGETS_FILE = "plugin_budgets.json"
+PLUGIN_BUDGETS = {
+    "import_ms": 150,      # module import
+    "build_ms": 120,       # build() call
+    "widgets": 300,        # widgets in the lesson view
+    "canvas_items": 1500,  # items across its canvases
+    "after_pending": 0,    # after() callbacks still pending when the lesson is left
+    "mem_kb": 2048,        # tracemalloc peak during import/build (profiling runs only)
+}
+
+
+def _caller_module(depth=2):
+    # module of the first caller outside tkinter (after_idle calls after) and
+    # outside the TimerRegistry, so app.timers.after() counts for the plugin
+    f = sys._getframe(depth)
+    while f is not None and (f.f_globals.get("__name__") == "tkinter" or f.f_code in _SCHEDULER_CODES):
+        f = f.f_back
+    return f.f_globals.get("__name__", "") if f is not None else ""
+
+
+class PluginProfiler:
+    # Per-plugin cost report keyed by lesson id. Import and build() are timed
+    # around the plugin call; widgets and canvas items are counted in the view
+    # it returns; after() calls made from a plugin module are tracked until
+    # they fire or are cancelled. tracemalloc is only used when trace_memory
+    # is set, since it slows everything down.
+    _hooked = False  # Misc.after/after_cancel wrapped (once per process)
+    _active = None   # profiler the wrapped after() reports to
+
+    def __init__(self, budgets=None, trace_memory=False):
+        self.budgets = dict(PLUGIN_BUDGETS)
+        self.overrides = {}
+        for k, v in (budgets or {}).items():
+            if k == "plugins" and isinstance(v, dict):
+                self.overrides = v
+            elif k in self.budgets:
+                self.budgets[k] = v
+        self.trace_memory = trace_memory
+        self.reports = {}   # lesson id -> metrics
+        self._modules = {}  # plugin module name -> lesson id
+        self._pending = {}  # lesson id -> set(after ids)
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def load(cls, path=PLUGIN_BUDGETS_FILE, trace_memory=False):
+        budgets = None
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    budgets = json.load(f)
+            except (OSError, ValueError) as e:
+                print("[budget error]", e)
+        return cls(budgets, trace_memory=trace_memory)
+
+    def _report(self, lid):
+        return self.reports.setdefault(lid, {})
+
+    def register(self, module_name, file_key, lid):
+        # import is measured before LESSON_META is read, under the file name
+        self._modules[module_name] = lid
+        if file_key != lid and file_key in self.reports:
+            self._report(lid).update(self.reports.pop(file_key))
+
+    @contextlib.contextmanager
+    def measure(self, lid, phase):
+        mem0 = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            mem0 = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            r = self._report(lid)
+            r[f"{phase}_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            if mem0 is not None:
+                kb = round((tracemalloc.get_traced_memory()[1] - mem0) / 1024, 1)
+                r[f"{phase}_mem_kb"] = kb
+                r["mem_kb"] = max(r.get("mem_kb", 0), kb)
+
+    def count_view(self, lid, view):
+        widgets = items = 0
+        stack = [view]
+        while stack:
+            w = stack.pop()
+            widgets += 1
+            if isinstance(w, tk.Canvas):
+                items += len(w.find_all())
+            stack.extend(w.winfo_children())
+        r = self._report(lid)
+        r["widgets"] = max(r.get("widgets", 0), widgets)
+        r["canvas_items"] = max(r.get("canvas_items", 0), items)
+
+    def lesson_left(self, lid, view):
+        if view is not None and view.winfo_exists():
+            self.count_view(lid, view)
+        r = self._report(lid)
+        r["after_pending"] = max(r.get("after_pending", 0), len(self._pending.get(lid, ())))
+
+    def install_after_hooks(self):
+        # attribute plugin timers to this profiler; Misc.after/after_cancel are
+        # wrapped on first use only, a later profiler just takes over the hook
+        PluginProfiler._active = self
+        if PluginProfiler._hooked:
+            return
+        PluginProfiler._hooked = True
+        orig_after = tk.Misc.after
+        orig_cancel = tk.Misc.after_cancel
+
+        def after(widget, ms, func=None, *args):
+            prof = PluginProfiler._active
+            lid = prof._modules.get(_caller_module()) if func is not None else None
+            if lid is None:
+                return orig_after(widget, ms, func, *args)
+            pending = prof._pending.setdefault(lid, set())
+            cell = []
+
+            def run(*a):
+                pending.discard(cell[0])
+                return func(*a)
+
+            after_id = orig_after(widget, ms, run, *args)
+            cell.append(after_id)
+            pending.add(after_id)
+            r = prof._report(lid)
+            r["after_scheduled"] = r.get("after_scheduled", 0) + 1
+            return after_id
+
+        def after_cancel(widget, after_id):
+            for pending in PluginProfiler._active._pending.values():
+                pending.discard(after_id)
+            return orig_cancel(widget, after_id)
+
+        tk.Misc.after = after
+        tk.Misc.after_cancel = after_cancel
+
+    def budget(self, lid, metric):
+        return self.overrides.get(lid, {}).get(metric, self.budgets[metric])
+
+    def violations(self, lid):
+        r = self.reports.get(lid, {})
+        return [(m, r[m], self.budget(lid, m)) for m in self.budgets
+                if m in r and r[m] > self.budget(lid, m)]
+
+    def report(self):
+        plugins = {}
+        for lid in sorted(self.reports):
+            entry = dict(self.reports[lid])
+            entry["violations"] = [{"metric": m, "value": v, "budget": b} for m, v, b in self.violations(lid)]
+            plugins[lid] = entry
+        return {"budgets": self.budgets, "overrides": self.overrides,
+                "trace_memory": self.trace_memory, "plugins": plugins}
+
+    def write_report(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+
+def violation_text(violations):
+    units = {"import_ms": " ms", "build_ms": " ms", "mem_kb": " KB"}
+    names = {"import_ms": "import", "build_ms": "build", "after_pending": "timers left running",
+             "canvas_items": "canvas items", "mem_kb": "memory"}
+    return ", ".join(f"{names.get(m, m)} {v:g}{units.get(m, '')}" for m, v, _b in violations)
+
+
+# ---------------- Spaced repetition ----------------
+SRS_DAY = 86400
+SRS_RELEARN = 600  # failed items come back after 10 minutes
+REVIEW_SESSION_SIZE = 10
+
+
+class ReviewScheduler:
+    # SM-2 scheduler over individual items. `state` is the persisted dict
+    # (key -> [ease, interval_days, reps, due_ts]); `items` holds the content of
+    # every item currently installed. A min-heap of (due, key) indexes what is
+    # due; grading pushes a fresh entry and leaves the old one to be skipped as
+    # stale, so building a session of N items costs O(N log M).
+    def __init__(self, state, clock=CLOCK.time):
+        self.state = state
+        self.clock = clock
+        self.items = {}
+        self._heap = []
+
+    def _due(self, key):
+        st = self.state.get(key)
+        return float(st[3]) if st else 0.0  # never-seen items are due now
+
+    def set_items(self, items):
+        # items: iterable of (key, item); rebuilds the index in O(M)
+        self.items = dict(items)
+        self._heap = [(self._due(k), k) for k in self.items]
+        heapq.heapify(self._heap)
+
+    def _compact(self):
+        if len(self._heap) > 2 * len(self.items) + 64:
+            self._heap = [(self._due(k), k) for k in self.items]
+            heapq.heapify(self._heap)
+
+    def _pop_valid(self):
+        while self._heap:
+            due, key = heapq.heappop(self._heap)
+            if key in self.items and due == self._due(key):
+                return due, key
+        return None
+
+    def has_due(self, now=None):
+        now = self.clock() if now is None else now
+        while self._heap:
+            due, key = self._heap[0]
+            if key in self.items and due == self._due(key):
+                return due <= now
+            heapq.heappop(self._heap)
+        return False
+
+    def session(self, n=REVIEW_SESSION_SIZE, now=None):
+        now = self.clock() if now is None else now
+        picked = []
+        while len(picked) < n:
+            top = self._pop_valid()
+            if top is None:
+                break
+            if top[0] > now:
+                heapq.heappush(self._heap, top)
+                break
+            picked.append(top)
+        # items stay scheduled until graded
+        for entry in picked:
+            heapq.heappush(self._heap, entry)
+        return [(key, self.items[key]) for _, key in picked]
+
+    def grade(self, key, correct, quality=None, now=None):
+        now = self.clock() if now is None else now
+        q = quality if quality is not None else (4 if correct else 2)
+        ease, interval, reps, _ = self.state.get(key, [2.5, 0, 0, 0.0])
+
+        ease = max(1.3, ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+        if q < 3:
+            reps = 0
+            interval = 0
+            due = now + SRS_RELEARN
+        else:
+            reps += 1
+            if reps == 1:
+                interval = 1
+            elif reps == 2:
+                interval = 6
+            else:
+                interval = int(round(interval * ease))
+            due = now + interval * SRS_DAY
+
+        self.state[key] = [round(ease, 3), interval, reps, due]
+        if key in self.items:
+            heapq.heappush(self._heap, (due, key))
+            self._compact()
+
+
+# ---------------- Answer log (columnar, append-only) ----------------
+ANSWER_LOG_DIR = "answer_log"
+ANSWER_LOG_FLUSH_ROWS = 512
+ANSWER_LOG_FLUSH_MS = 5000
+
+# one file per column, raw native-endian values; lesson/item ids are interned
+# into strings.txt (one JSON string per line, line number = id)
+ANSWER_LOG_COLUMNS = (
+    ("ts", "d"),          # unix time, float64
+    ("lesson", "I"),      # interned lesson id, uint32
+    ("item", "I"),        # interned item id, uint32
+    ("correct", "B"),     # 0/1, uint8
+    ("latency_ms", "I"),  # response latency, uint32 (0 = unknown)
+)
+
+
+class AnswerLog:
+    def __init__(self, path=ANSWER_LOG_DIR):
+        self.path = path
+        self._buf = {name: array(code) for name, code in ANSWER_LOG_COLUMNS}
+        self._new_strings = []
+        self.strings = self._load_strings()
+        self._ids = {s: i for i, s in enumerate(self.strings)}
+
+    def _load_strings(self):
+        try:
+            with open(os.path.join(self.path, "strings.txt"), "r", encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return []
+
+    def _intern(self, s):
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+            self._new_strings.append(s)
+        return i
+
+    @property
+    def pending(self):
+        return len(self._buf["ts"])
+
+    def record(self, lesson_id, item_id, correct, latency=None, ts=None):
+        # O(1) appends to in-memory arrays; disk is touched only by flush()
+        b = self._buf
+        b["ts"].append(CLOCK.time() if ts is None else float(ts))
+        b["lesson"].append(self._intern(str(lesson_id)))
+        b["item"].append(self._intern(str(item_id)))
+        b["correct"].append(1 if correct else 0)
+        b["latency_ms"].append(0 if latency is None else max(0, min(0xFFFFFFFF, int(latency * 1000))))
+        return self.pending
+
+    def flush(self):
+        if not self.pending and not self._new_strings:
+            return
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            meta_path = os.path.join(self.path, "meta.json")
+            if not os.path.exists(meta_path):
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": 1, "byteorder": sys.byteorder,
+                               "columns": [[n, c, array(c).itemsize] for n, c in ANSWER_LOG_COLUMNS]}, f)
+            # strings first, so every id written to a column already resolves
+            if self._new_strings:
+                with open(os.path.join(self.path, "strings.txt"), "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(s, ensure_ascii=False) + "\n" for s in self._new_strings)
+                self._new_strings = []
+            for name, code in ANSWER_LOG_COLUMNS:
+                with open(os.path.join(self.path, name + ".col"), "ab") as f:
+                    self._buf[name].tofile(f)
+                self._buf[name] = array(code)
+        except OSError as e:
+            print("[answer log error]", e)
+
+    def scan(self):
+        # memory-map every column for analysis; returns (columns, strings) where
+        # columns maps name -> memoryview of equal length (a torn last flush is cut off)
+        maps = {}
+        rows = None
+        for name, code in ANSWER_LOG_COLUMNS:
+            path = os.path.join(self.path, name + ".col")
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            n = size // array(code).itemsize
+            rows = n if rows is None else min(rows, n)
+            if size:
+                with open(path, "rb") as f:
+                    maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        columns = {}
+        for name, code in ANSWER_LOG_COLUMNS:
+            if rows and name in maps:
+                view = memoryview(maps[name]).cast(code)
+                columns[name] = view[:rows]
+            else:
+                columns[name] = memoryview(array(code))
+        return columns, list(self._load_strings())
+
+
+# ---------------- Answer matching (typed exercises) ----------------
+@functools.lru_cache(maxsize=8192)
+def normalize_answer(text):
+    # NFKD + drop combining marks (accents), fold punctuation/symbols to spaces,
+    # casefold and collapse whitespace: "  Café, s'il vous plaît! " -> "cafe s il vous plait"
+    out = []
+    for ch in unicodedata.normalize("NFKD", str(text)):
+        cat = unicodedata.category(ch)
+        if cat == "Mn":
+            continue
+        out.append(" " if cat[0] in "PS" else ch)
+    return " ".join("".join(out).casefold().split())
+
+
+def _pattern_bits(pattern):
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def bounded_edit_distance(pattern, peq, text, limit):
+    # Myers/Hyyrö bit-parallel Levenshtein distance between `pattern` (with
+    # precomputed bitmasks `peq`) and `text`. Returns limit + 1 as soon as the
+    # distance is known to exceed `limit`.
+    m, n = len(pattern), len(text)
+    if abs(m - n) > limit:
+        return limit + 1
+    if m == 0:
+        return n
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for j, ch in enumerate(text):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # the remaining characters can lower the score by at most one each
+        if score - (n - j - 1) > limit:
+            return limit + 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score if score <= limit else limit + 1
+
+
+def typo_tolerance(normalized):
+    n = len(normalized)
+    if n <= 3:
+        return 0
+    if n <= 8:
+        return 1
+    return 2
+
+
+class AnswerChecker:
+    # Accepts any of `variants` after normalization; small typos are tolerated
+    # (bounded edit distance). Normalized variants and their bitmasks are built
+    # once, so checking on every keystroke is cheap even with many variants.
+    def __init__(self, variants, max_typos=None):
+        if isinstance(variants, str):
+            variants = [variants]
+        self.variants = list(variants)
+        self.max_typos = max_typos
+        self._exact = {}
+        self._by_len = {}  # length -> [(normalized, bitmasks, tolerance, original)]
+        self._max_tol = 0
+        for v in self.variants:
+            norm = normalize_answer(v)
+            if norm in self._exact:
+                continue
+            self._exact[norm] = v
+            tol = typo_tolerance(norm) if max_typos is None else max_typos
+            if tol > 0:
+                self._by_len.setdefault(len(norm), []).append((norm, _pattern_bits(norm), tol, v))
+                self._max_tol = max(self._max_tol, tol)
+
+    @property
+    def primary(self):
+        return self.variants[0] if self.variants else ""
+
+    def check(self, answer):
+        # -> ("exact" | "typo" | "wrong", matched variant or None)
+        norm = normalize_answer(answer)
+        hit = self._exact.get(norm)
+        if hit is not None:
+            return "exact", hit
+        best, best_d = None, None
+        n = len(norm)
+        for length in range(n - self._max_tol, n + self._max_tol + 1):
+            for pattern, peq, tol, original in self._by_len.get(length, ()):
+                limit = tol if best_d is None else min(tol, best_d - 1)
+                if limit < abs(length - n):
+                    continue
+                d = bounded_edit_distance(pattern, peq, norm, limit)
+                if d <= limit:
+                    best, best_d = original, d
+            if best_d == 1:
+                break
+        if best is not None:
+            return "typo", best
+        return "wrong", None
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_checker(variants, max_typos):
+    return AnswerChecker(variants, max_typos=max_typos)
+
+
+# ---------------- Phrase index (distractors) ----------------
+PHRASE_INDEX_FILE = "phrase_index.jsonl"
+PHRASE_SCAN_BUDGET = 3000  # postings visited per query, rarest grams/tokens first
+
+
+def _length_bucket(n):
+    return n // 6
+
+
+def _trigrams(norm):
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def lesson_phrases(entry):
+    out = []
+    for item in entry.get("review_items", []):
+        out.append(item["a"])
+        out.extend(item.get("choices", []))
+    out.extend(entry.get("phrases", []))
+    return out
+
+
+class PhraseIndex:
+    # Character-trigram + token postings over every phrase in installed lesson
+    # content, with length buckets. Updated per lesson (keyed by file mtime/size)
+    # and persisted as a journal with one line per changed lesson, holding its
+    # phrases already normalized: a changed plugin appends only its own line,
+    # and startup rebuilds the postings without normalizing or reading lessons.
+    # The journal is rewritten once stale lines outnumber live ones.
+    def __init__(self, path=PHRASE_INDEX_FILE):
+        self.path = path
+        self.phrases = []   # id -> text (None once removed)
+        self.refs = []      # id -> number of lessons providing it
+        self.sources = {}   # lesson id -> {"sig": [mtime, size], "ids": [...]}
+        self._ids = {}      # normalized -> id
+        self._grams = {}    # trigram -> set(ids)
+        self._tokens = {}   # token -> set(ids)
+        self._buckets = {}  # length bucket -> set(ids)
+        self._bucket_of = []  # id -> length bucket (-1 once removed)
+        self._changed = set()  # lesson ids to write on the next save
+        self._lines = 0     # lesson lines in the journal, live or stale
+        self._torn = False  # last line half written: rewrite instead of appending
+        self.dirty = False
+
+    # ----- persistence -----
+    @classmethod
+    def load(cls, path=PHRASE_INDEX_FILE):
+        idx = cls(path)
+        if not os.path.exists(path):
+            return idx
+        latest = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if json.loads(f.readline() or "{}").get("version") != 2:
+                    return idx
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        idx._torn = True  # torn append; those lessons re-index on startup
+                        break
+                    idx._lines += 1
+                    latest[rec["lesson"]] = rec
+            for lid, rec in latest.items():
+                if rec.get("phrases") is not None:
+                    ids = [pid for pid in (idx._add(text, norm) for text, norm in rec["phrases"])
+                           if pid is not None]
+                    idx.sources[lid] = {"sig": rec["sig"], "ids": ids}
+        except Exception as e:
+            print("[phrase index error]", e)
+            return cls(path)
+        return idx
+
+    def _record(self, lid):
+        src = self.sources.get(lid)
+        if src is None:
+            return {"lesson": lid, "phrases": None}
+        return {"lesson": lid, "sig": src["sig"],
+                "phrases": [[self.phrases[pid], normalize_answer(self.phrases[pid])] for pid in src["ids"]]}
+
+    def save(self):
+        try:
+            if self._torn or self._lines > 2 * len(self.sources) + 64 or not os.path.exists(self.path):
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(json.dumps({"version": 2}) + "\n")
+                    for lid in self.sources:
+                        f.write(json.dumps(self._record(lid), ensure_ascii=False, separators=(",", ":")) + "\n")
+                os.replace(tmp, self.path)
+                self._lines = len(self.sources)
+                self._torn = False
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for lid in self._changed:
+                        f.write(json.dumps(self._record(lid), ensure_ascii=False, separators=(",", ":")) + "\n")
+                self._lines += len(self._changed)
+            self._changed.clear()
+            self.dirty = False
+        except Exception as e:
+            print("[phrase index error]", e)
+
+    # ----- incremental maintenance -----
+    def _add(self, text, norm=None):
+        norm = normalize_answer(text) if norm is None else norm
+        if not norm:
+            return None
+        pid = self._ids.get(norm)
+        if pid is not None:
+            self.refs[pid] += 1
+            return pid
+        pid = len(self.phrases)
+        self.phrases.append(text)
+        self.refs.append(1)
+        self._bucket_of.append(_length_bucket(len(norm)))
+        self._ids[norm] = pid
+        for g in _trigrams(norm):
+            self._grams.setdefault(g, set()).add(pid)
+        for tok in set(norm.split()):
+            self._tokens.setdefault(tok, set()).add(pid)
+        self._buckets.setdefault(_length_bucket(len(norm)), set()).add(pid)
+        return pid
+
+    def _release(self, pid):
+        self.refs[pid] -= 1
+        if self.refs[pid] > 0:
+            return
+        norm = normalize_answer(self.phrases[pid])
+        for g in _trigrams(norm):
+            self._grams.get(g, set()).discard(pid)
+        for tok in set(norm.split()):
+            self._tokens.get(tok, set()).discard(pid)
+        self._buckets.get(_length_bucket(len(norm)), set()).discard(pid)
+        self._ids.pop(norm, None)
+        self.phrases[pid] = None
+        self._bucket_of[pid] = -1
+
+    def update_lesson(self, lesson_id, sig, phrases):
+        old = self.sources.get(lesson_id)
+        if old is not None and old["sig"] == sig:
+            return False
+        new_ids = [pid for pid in (self._add(p) for p in phrases) if pid is not None]
+        if old is not None:
+            for pid in old["ids"]:
+                self._release(pid)
+        self.sources[lesson_id] = {"sig": sig, "ids": new_ids}
+        self._changed.add(lesson_id)
+        self.dirty = True
+        return True
+
+    def remove_lesson(self, lesson_id):
+        old = self.sources.pop(lesson_id, None)
+        if old is None:
+            return False
+        for pid in old["ids"]:
+            self._release(pid)
+        self._changed.add(lesson_id)
+        self.dirty = True
+        return True
+
+    def update_from_lessons(self, lessons):
+        seen = set()
+        for entry in lessons:
+            lid = entry["meta"]["id"]
+            seen.add(lid)
+            try:
+                st = os.stat(entry["path"])
+                sig = [int(st.st_mtime), st.st_size]
+            except OSError:
+                sig = None
+            self.update_lesson(lid, sig, lesson_phrases(entry))
+        for lid in [lid for lid in self.sources if lid not in seen]:
+            self.remove_lesson(lid)
+        return self.dirty
+
+    # ----- queries -----
+    def distractors(self, answer, k=2, exclude=()):
+        norm = normalize_answer(answer)
+        skip = {normalize_answer(x) for x in exclude}
+        skip.add(norm)
+        bucket = _length_bucket(len(norm))
+        bucket_of = self._bucket_of
+
+        # rarest postings first; stop once the scan budget is spent
+        postings = [(self._grams.get(g), 1) for g in _trigrams(norm)]
+        postings += [(self._tokens.get(tok), 2) for tok in set(norm.split())]
+        postings = sorted((p for p in postings if p[0]), key=lambda p: len(p[0]))
+
+        scores = {}
+        budget = PHRASE_SCAN_BUDGET
+        for ids, weight in postings:
+            if budget <= 0:
+                break
+            n = len(ids)
+            if n > budget:
+                ids = itertools.islice(ids, budget)
+            budget -= n
+            for pid in ids:
+                if abs(bucket_of[pid] - bucket) <= 1:
+                    scores[pid] = scores.get(pid, 0) + weight
+
+        ranked = heapq.nlargest(k + len(skip), ((sc, -pid) for pid, sc in scores.items()))
+        out = []
+        for _, neg in ranked:
+            text = self.phrases[-neg]
+            if text is None or normalize_answer(text) in skip:
+                continue
+            out.append(text)
+            skip.add(normalize_answer(text))
+            if len(out) == k:
+                return out
+
+        # not enough similar phrases: fill from the same length range
+        for b in (bucket, bucket - 1, bucket + 1):
+            for pid in self._buckets.get(b, ()):
+                text = self.phrases[pid]
+                if text is not None and normalize_answer(text) not in skip:
+                    out.append(text)
+                    skip.add(normalize_answer(text))
+                    if len(out) == k:
+                        return out
+        return out
+
+
+# ---------------- Matching board ----------------
+class MatchBoard:
+    # Match-exercise state keyed by pair id, so duplicate display texts are
+    # fine. Every click is O(1) and reports only the (side, pair_id) keys whose
+    # look changed. Large boards are split into pages; rounds can be timed.
+    SELECT = "select"
+    OK = "match"
+    MISS = "miss"
+    IGNORED = "ignored"
+
+    def __init__(self, pairs, page_size=None, time_limit=None, clock=time.monotonic, rng=None):
+        self.pairs = {}
+        order = []
+        for i, p in enumerate(pairs):
+            pid = str(p.get("id", i))
+            self.pairs[pid] = p
+            order.append(pid)
+        size = max(1, int(page_size)) if page_size else max(1, len(order))
+        self.pages = [order[i:i + size] for i in range(0, len(order), size)]
+        self.page = 0
+        self.matched = set()
+        self.selected = None  # (side, pair_id)
+        self.misses = 0
+        self.time_limit = time_limit
+        self.clock = clock
+        self.rng = rng or random
+        self.started = clock()
+        self._remaining = len(self.pages[0]) if self.pages else 0
+
+    @property
+    def total(self):
+        return len(self.pairs)
+
+    @property
+    def score(self):
+        return len(self.matched)
+
+    def layout(self):
+        # shuffled (left ids, right ids) for the current page
+        ids = list(self.pages[self.page]) if self.pages else []
+        left, right = ids[:], ids[:]
+        self.rng.shuffle(left)
+        self.rng.shuffle(right)
+        return left, right
+
+    def time_left(self):
+        if self.time_limit is None:
+            return None
+        return max(0.0, self.time_limit - (self.clock() - self.started))
+
+    @property
+    def expired(self):
+        left = self.time_left()
+        return left is not None and left <= 0
+
+    @property
+    def page_done(self):
+        return self._remaining == 0
+
+    @property
+    def done(self):
+        return self.score == self.total or self.expired
+
+    def next_page(self):
+        if self.page + 1 >= len(self.pages):
+            return False
+        self.page += 1
+        self.selected = None
+        self._remaining = len(self.pages[self.page])
+        return True
+
+    def click(self, side, pid):
+        # -> (result, changed keys)
+        key = (side, pid)
+        if pid in self.matched or self.expired:
+            return self.IGNORED, []
+        prev = self.selected
+        if prev is None:
+            self.selected = key
+            return self.SELECT, [key]
+        if prev[0] == side:
+            self.selected = key
+            return self.SELECT, [prev, key] if prev != key else [key]
+        self.selected = None
+        if prev[1] == pid:
+            self.matched.add(pid)
+            self._remaining -= 1
+            return self.OK, [prev, key]
+        self.misses += 1
+        return self.MISS, [prev, key]
+
+
+# ---------------- Lesson search ----------------
+SEARCH_PREFIX_TERMS = 2000  # vocabulary terms expanded per query token
+SEARCH_DEBOUNCE_MS = 150    # filter once typing pauses, not on every key
+
+
+class LessonSearch:
+    # Inverted index (token -> lesson ids) over titles, subtitles and item text,
+    # with a sorted vocabulary for prefix matching. Lessons are re-indexed only
+    # when their plugin file changed.
+    def __init__(self):
+        self._postings = {}  # token -> set(lesson ids)
+        self._vocab = []     # sorted tokens
+        self._docs = {}      # lesson id -> {"sig": ..., "tokens": set}
+
+    def _tokens_for(self, entry):
+        meta = entry["meta"]
+        texts = [meta.get("title", ""), meta.get("subtitle", "")]
+        texts.extend(lesson_phrases(entry))
+        for item in entry.get("review_items", []):
+            texts.append(item.get("q", ""))
+            texts.append(item.get("prompt", ""))
+        tokens = set()
+        for text in texts:
+            tokens.update(normalize_answer(text).split())
+        return tokens
+
+    def _remove(self, lid):
+        doc = self._docs.pop(lid, None)
+        if doc is None:
+            return
+        for tok in doc["tokens"]:
+            ids = self._postings.get(tok)
+            if ids is None:
+                continue
+            ids.discard(lid)
+            if not ids:
+                del self._postings[tok]
+                i = bisect.bisect_left(self._vocab, tok)
+                if i < len(self._vocab) and self._vocab[i] == tok:
+                    self._vocab.pop(i)
+
+    def update(self, lid, sig, entry):
+        doc = self._docs.get(lid)
+        if doc is not None and doc["sig"] == sig and sig is not None:
+            return False
+        self._remove(lid)
+        tokens = self._tokens_for(entry)
+        fresh = []
+        for tok in tokens:
+            ids = self._postings.get(tok)
+            if ids is None:
+                ids = self._postings[tok] = set()
+                fresh.append(tok)
+            ids.add(lid)
+        if len(fresh) > 32:
+            self._vocab = sorted(self._vocab + fresh)
+        else:
+            for tok in fresh:
+                bisect.insort(self._vocab, tok)
+        self._docs[lid] = {"sig": sig, "tokens": tokens}
+        return True
+
+    def update_from_lessons(self, lessons):
+        seen = set()
+        for entry in lessons:
+            lid = entry["meta"]["id"]
+            seen.add(lid)
+            try:
+                st = os.stat(entry["path"])
+                sig = (int(st.st_mtime), st.st_size)
+            except (OSError, KeyError):
+                sig = None
+            self.update(lid, sig, entry)
+        for lid in [lid for lid in self._docs if lid not in seen]:
+            self._remove(lid)
+
+    def _prefix(self, tok):
+        lo = bisect.bisect_left(self._vocab, tok)
+        hi = bisect.bisect_left(self._vocab, tok + "\uffff", lo)
+        out = set()
+        for term in itertools.islice(self._vocab, lo, min(hi, lo + SEARCH_PREFIX_TERMS)):
+            out |= self._postings[term]
+        return out
+
+    def search(self, query):
+        # lesson ids matching every query token as a prefix; None = no filter
+        tokens = normalize_answer(query).split()
+        if not tokens:
+            return None
+        result = None
+        # longest tokens first: usually the most selective
+        for tok in sorted(tokens, key=len, reverse=True):
+            ids = self._prefix(tok)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
+
+
+# ---------------- Leaderboard ----------------
+PROFILES_DIR = "profiles"
+SELF_PROFILE = "self"
+LEADERBOARD_WINDOWS = (("week", "This week"), ("month", "This month"), ("all", "All time"))
+
+
+def window_start(window, now=None):
+    # local-time start of the leaderboard window containing `now`
+    if window == "all":
+        return 0
+    day = datetime.date.fromtimestamp(CLOCK.time() if now is None else now)
+    if window == "week":
+        day -= datetime.timedelta(days=day.weekday())
+    else:
+        day = day.replace(day=1)
+    return time.mktime(day.timetuple())
+
+
+def events_xp(events, start=0):
+    total = 0
+    for ev in events:
+        try:
+            if ev[0] >= start:
+                total += int(ev[1])
+        except (TypeError, ValueError, IndexError):
+            continue
+    return total
+
+
+def iter_profiles(profiles_dir=PROFILES_DIR):
+    # every *.json is one profile ({"id", "name", "xp", "xp_events"}) or a
+    # class roster ({"profiles": [...]} or a bare list of profiles); yields
+    # (profile id, raw dict) one file at a time
+    if not os.path.isdir(profiles_dir):
+        return
+    for filename in sorted(os.listdir(profiles_dir)):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(profiles_dir, filename), "r", encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[profile error] {filename}: {e}")
+            continue
+        if isinstance(d, dict) and isinstance(d.get("profiles"), list):
+            items = d["profiles"]
+        elif isinstance(d, list):
+            items = d
+        else:
+            items = [d]
+        base = filename[:-5]
+        for i, p in enumerate(items):
+            if isinstance(p, dict):
+                yield str(p.get("id") or (base if len(items) == 1 else f"{base}:{i}")), p
+
+
+def load_profiles(profiles_dir=PROFILES_DIR):
+    # a profile found in several files (e.g. imported twice) is merged
+    profiles = {}
+    for pid, p in iter_profiles(profiles_dir):
+        events = p.get("xp_events")
+        if not isinstance(events, list):
+            events = []
+        try:
+            xp = int(p.get("xp", 0) or 0)
+        except (TypeError, ValueError):
+            xp = 0
+        cur = profiles.get(pid)
+        if cur is None:
+            profiles[pid] = {"name": str(p.get("name") or pid), "xp": xp, "events": events}
+        else:
+            cur["xp"] = max(cur["xp"], xp)
+            cur["events"] = _union_events(cur["events"], events)
+    return profiles
+
+
+def _union_events(a, b):
+    seen = {(ev[0], ev[1]) for ev in a if len(ev) >= 2}
+    return a + [ev for ev in b if len(ev) >= 2 and (ev[0], ev[1]) not in seen]
+
+
+class Leaderboard:
+    # Entries kept sorted by (-xp, name, id): top-K is a slice, a rank is a
+    # bisect, and an XP event moves one entry instead of re-sorting the board.
+    def __init__(self, rows=()):
+        self._xp = {}
+        self._names = {}
+        for pid, name, xp in rows:
+            self._xp[pid] = int(xp)
+            self._names[pid] = name
+        self._order = sorted(self._key(pid) for pid in self._xp)
+
+    def __len__(self):
+        return len(self._order)
+
+    def _key(self, pid):
+        return (-self._xp[pid], self._names[pid], pid)
+
+    def _index(self, pid):
+        return bisect.bisect_left(self._order, self._key(pid))
+
+    def set(self, pid, name, xp):
+        if pid in self._xp:
+            self._order.pop(self._index(pid))
+        self._xp[pid] = int(xp)
+        self._names[pid] = name
+        bisect.insort(self._order, self._key(pid))
+
+    def add(self, pid, xp):
+        if pid not in self._xp:
+            return
+        self._order.pop(self._index(pid))
+        self._xp[pid] += int(xp)
+        bisect.insort(self._order, self._key(pid))
+
+    def rank(self, pid):
+        if pid not in self._xp:
+            return None
+        return self._index(pid) + 1
+
+    def xp(self, pid):
+        return self._xp.get(pid, 0)
+
+    def rows(self, start, stop):
+        start = max(0, start)
+        return [(start + i + 1, name, -neg_xp, pid)
+                for i, (neg_xp, name, pid) in enumerate(self._order[start:stop])]
+
+    def top(self, k):
+        return self.rows(0, k)
+
+
+class LocalLeaderboards:
+    # One Leaderboard per window, built on first use from ./profiles plus the
+    # local user, rebuilt when the window rolls over, and updated in place as
+    # the local user earns XP.
+    def __init__(self, self_source, profiles_dir=PROFILES_DIR, clock=CLOCK.time):
+        self._self_source = self_source  # window -> (name, xp)
+        self.profiles_dir = profiles_dir
+        self._clock = clock
+        self._profiles = None
+        self._boards = {}  # window -> (start, Leaderboard)
+
+    def reload(self):
+        self._profiles = None
+        self._boards.clear()
+
+    def board(self, window):
+        start = window_start(window, self._clock())
+        cached = self._boards.get(window)
+        if cached is not None and cached[0] == start:
+            return cached[1]
+        if self._profiles is None:
+            self._profiles = load_profiles(self.profiles_dir)
+        rows = []
+        for pid, p in self._profiles.items():
+            if window == "all":
+                xp = p["xp"] or events_xp(p["events"])
+            else:
+                xp = events_xp(p["events"], start)
+            rows.append((pid, p["name"], xp))
+        name, xp = self._self_source(window)
+        rows.append((SELF_PROFILE, name, xp))
+        lb = Leaderboard(rows)
+        self._boards[window] = (start, lb)
+        return lb
+
+    def record(self, xp, ts):
+        for start, lb in self._boards.values():
+            if ts >= start:
+                lb.add(SELF_PROFILE, xp)
+
+    def import_roster(self, path):
+        # validate, then copy into ./profiles under a stable name
+        with open(path, "r", encoding="utf-8") as f:
+            d = json.load(f)
+        if not isinstance(d, (dict, list)):
+            raise ValueError("roster must be a JSON object or list")
+        os.makedirs(self.profiles_dir, exist_ok=True)
+        name = os.path.splitext(os.path.basename(path))[0]
+        dest = os.path.join(self.profiles_dir, f"roster_{name}.json")
+        with open(dest, "w", encoding="utf-8") as f:
+            json.dump(d, f, ensure_ascii=False)
+        self.reload()
+        return dest
+
+
+# ---------------- Profile import/export ----------------
+IMPORT_BATCH = 5000      # profiles per checkpoint and per written roster file
+IMPORT_MAX_ERRORS = 20   # invalid lines reported individually
+
+
+def validate_profile(p):
+    # normalised profile record, or ValueError explaining what is wrong
+    if not isinstance(p, dict):
+        raise ValueError("not a JSON object")
+    pid = p.get("id")
+    if not isinstance(pid, str) or not pid or len(pid) > 128:
+        raise ValueError("missing or invalid 'id'")
+    name = p.get("name", pid)
+    if not isinstance(name, str) or len(name) > 200:
+        raise ValueError("invalid 'name'")
+    xp = p.get("xp", 0)
+    if isinstance(xp, bool) or not isinstance(xp, int) or xp < 0:
+        raise ValueError("'xp' must be a non-negative integer")
+    events = p.get("xp_events", [])
+    if not isinstance(events, list):
+        raise ValueError("'xp_events' must be a list")
+    for ev in events:
+        # exact type checks: this loop dominates validation on large imports
+        if type(ev) is not list or len(ev) < 2 or type(ev[1]) is not int or type(ev[0]) not in (int, float):
+            raise ValueError("'xp_events' entries must be [ts, xp, ...]")
+    rec = {"id": pid, "name": name or pid, "xp": xp, "xp_events": events}
+    if p.get("replica") is not None:
+        rec["replica"] = ProgressReplica.validate(p["replica"])
+    return rec
+
+
+def merge_profile(a, b):
+    # two records for the same learner: CRDT merge when both carry replicas
+    out = dict(a)
+    out["name"] = b.get("name") or a.get("name")
+    out["xp_events"] = _union_events(a.get("xp_events", []), b.get("xp_events", []))
+    out["xp"] = max(a.get("xp", 0), b.get("xp", 0))
+    if a.get("replica") is not None and b.get("replica") is not None:
+        merged = ProgressReplica(json.loads(json.dumps(a["replica"]))).merge(b["replica"])
+        out["replica"] = merged.state
+        out["xp"] = max(out["xp"], merged.xp())
+    elif b.get("replica") is not None:
+        out["replica"] = b["replica"]
+    return out
+
+
+def _write_json_atomic(path, obj):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+    os.replace(tmp, path)
+
+
+def export_profiles(out, profiles_dir=PROFILES_DIR, data=None):
+    # NDJSON, one profile per line; `data` adds the local learner first
+    n = 0
+    if data is not None:
+        rec = {"id": data["device_id"], "name": data["settings"].get("profile_name", "You"),
+               "xp": int(data["xp"]), "xp_events": data.get("xp_events", [])}
+        if data.get("replica") is not None:
+            rec["replica"] = data["replica"]
+        out.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        n += 1
+    for pid, p in iter_profiles(profiles_dir):
+        rec = {"id": pid, "name": p.get("name") or pid, "xp": p.get("xp", 0),
+               "xp_events": p.get("xp_events", [])}
+        if p.get("replica") is not None:
+            rec["replica"] = p["replica"]
+        out.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        n += 1
+    return n
+
+
+def import_profiles(path, profiles_dir=PROFILES_DIR, batch_size=IMPORT_BATCH, resume=True, report=None):
+    # Stream an NDJSON file into ./profiles. Validated lines are merged by id
+    # into an SQLite staging table next to the source (<file>.import.db),
+    # which also holds the checkpoint (byte offset) and is committed once per
+    # batch, so an interrupted import resumes where it stopped. A final pass
+    # writes the staged profiles, sorted by id, as roster files of batch_size
+    # each. Memory use is bounded by one batch.
+    st = os.stat(path)
+    staging = path + ".import.db"
+    state = {"size": st.st_size, "mtime": int(st.st_mtime), "offset": 0, "line": 0,
+             "batch": 0, "files": 0, "imported": 0, "duplicates": 0, "invalid": 0, "errors": []}
+    if not resume and os.path.exists(staging):
+        os.remove(staging)
+    db = sqlite3.connect(staging)
+    try:
+        db.execute("CREATE TABLE IF NOT EXISTS profiles (id TEXT PRIMARY KEY, rec TEXT NOT NULL)")
+        db.execute("CREATE TABLE IF NOT EXISTS checkpoint (k INTEGER PRIMARY KEY CHECK (k = 0), state TEXT)")
+        row = db.execute("SELECT state FROM checkpoint").fetchone()
+        saved = json.loads(row[0]) if row else {}
+        if saved.get("size") == state["size"] and saved.get("mtime") == state["mtime"]:
+            state.update(saved)
+        elif row:  # the source changed since: start over
+            db.execute("DELETE FROM profiles")
+            db.commit()
+        state = _import_lines(path, db, state, batch_size, report)
+        state["files"] = _write_import_rosters(db, path, profiles_dir, batch_size)
+    finally:
+        db.close()
+    os.remove(staging)
+    return state
+
+
+def _import_error(state, msg):
+    state["invalid"] += 1
+    if len(state["errors"]) < IMPORT_MAX_ERRORS:
+        state["errors"].append(msg)
+
+
+def _import_lines(path, db, state, batch_size, report):
+    batch = {}  # id -> (record, line it was last seen on)
+
+    def merge(cur, rec, line):
+        try:
+            return merge_profile(cur, rec)
+        except (TypeError, KeyError, ValueError) as e:
+            _import_error(state, f"line {line}: cannot merge '{rec['id']}': {e}")
+            return cur
+
+    def flush(offset, line):
+        ids = list(batch)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = db.execute(f"SELECT id, rec FROM profiles WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            for pid, stored in rows:
+                rec, seen = batch[pid]
+                batch[pid] = (merge(json.loads(stored), rec, seen), seen)
+                state["duplicates"] += 1
+                state["imported"] -= 1
+        db.executemany("INSERT OR REPLACE INTO profiles VALUES (?, ?)",
+                       ((pid, json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+                        for pid, (rec, _seen) in batch.items()))
+        state["imported"] += len(batch)
+        state["batch"] += 1
+        batch.clear()
+        state["offset"], state["line"] = offset, line
+        db.execute("INSERT OR REPLACE INTO checkpoint VALUES (0, ?)", (json.dumps(state),))
+        db.commit()
+        if report is not None:
+            report(state)
+
+    offset, line = state["offset"], state["line"]
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            offset += len(raw)
+            line += 1
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                rec = validate_profile(json.loads(raw))
+            except ValueError as e:  # includes JSON decode errors
+                _import_error(state, f"line {line}: {e}")
+                continue
+            cur = batch.get(rec["id"])
+            if cur is not None:
+                rec = merge(cur[0], rec, line)
+                state["duplicates"] += 1
+            batch[rec["id"]] = (rec, line)
+            if len(batch) >= batch_size:
+                flush(offset, line)
+    flush(offset, line)
+    return state
+
+
+def _write_import_rosters(db, path, profiles_dir, batch_size):
+    # staged profiles -> import_<stem>_NNNNN.json; returns the file count
+    os.makedirs(profiles_dir, exist_ok=True)
+    stem = re.sub(r"[^A-Za-z0-9_-]+", "_", os.path.splitext(os.path.basename(path))[0])
+    rows = db.execute("SELECT rec FROM profiles ORDER BY id")
+    n = 0
+    while True:
+        chunk = rows.fetchmany(batch_size)
+        if not chunk:
+            break
+        profiles = [json.loads(rec) for (rec,) in chunk]
+        _write_json_atomic(os.path.join(profiles_dir, f"import_{stem}_{n:05d}.json"), {"profiles": profiles})
+        n += 1
+    # files left over from an earlier, larger import of the same source
+    pattern = re.compile(rf"^import_{re.escape(stem)}_(\d{{5}})\.json$")
+    for filename in os.listdir(profiles_dir):
+        m = pattern.match(filename)
+        if m and int(m.group(1)) >= n:
+            os.remove(os.path.join(profiles_dir, filename))
+    return n
+
+
+# ---------------- XP ledger ----------------
+DAILY_GOALS = (10, 20, 30, 50)
+
+
+def local_day(ts=None):
+    # ordinal of the local calendar day containing ts
+    return datetime.date.fromtimestamp(CLOCK.time() if ts is None else ts).toordinal()
+
+
+def week_of(day):
+    # ordinal of the Monday starting day's week (ordinal 1 is a Monday)
+    return day - (day - 1) % 7
+
+
+def month_of(day):
+    d = datetime.date.fromordinal(day)
+    return d.year * 12 + d.month - 1
+
+
+XP_DAY_BUCKETS = 400  # per-day xp rollups kept; older days only count in weeks/months
+
+
+class XPLedger:
+    # Append-only ledger of [ts, xp, local_day] events (data["xp_events"]) with
+    # daily/weekly/monthly rollups and streak state in data["xp_rollup"]. The
+    # local day is fixed when XP is earned, so later timezone changes do not
+    # move old XP between days. Rollups are persisted and caught up from the
+    # ledger tail, so queries never rescan history.
+    def __init__(self, data, take_freeze=None):
+        self.events = data.setdefault("xp_events", [])
+        r = data.get("xp_rollup")
+        if (not isinstance(r, dict) or r.get("version") != 1
+                or not 0 <= int(r.get("events", 0)) <= len(self.events)):
+            r = {"version": 1, "events": 0, "days": {}, "weeks": {}, "months": {},
+                 "streak": {"current": 0, "best": 0, "last_day": None, "frozen": []}}
+        data["xp_rollup"] = r
+        self.rollup = r
+        self.streak_state = r["streak"]
+        self.take_freeze = take_freeze  # () -> bool, consumes one streak freeze
+
+        # catch up (also migrates older [ts, xp] events)
+        for ev in self.events[r["events"]:]:
+            if len(ev) < 3:
+                ev.append(local_day(ev[0]))
+            self._apply(ev, spend_freezes=False)
+        r["events"] = len(self.events)
+
+    def _bump(self, table, key, xp):
+        t = self.rollup[table]
+        key = str(key)
+        t[key] = t.get(key, 0) + xp
+
+    def _apply(self, ev, spend_freezes=True):
+        xp, day = int(ev[1]), int(ev[2])
+        days = self.rollup["days"]
+        if str(day) not in days and len(days) >= XP_DAY_BUCKETS + 32:
+            self._compact_days(day)
+        self._bump("days", day, xp)
+        self._bump("weeks", week_of(day), xp)
+        self._bump("months", month_of(day), xp)
+        if xp > 0:
+            self._extend_streak(day, spend_freezes)
+
+    def _compact_days(self, newest):
+        # week and month totals stay; only the per-day buckets are trimmed
+        days = self.rollup["days"]
+        cutoff = max([newest] + [int(k) for k in days]) - XP_DAY_BUCKETS
+        for key in [k for k in days if int(k) <= cutoff]:
+            del days[key]
+
+    def record(self, xp, ts=None, settle=True):
+        # settle=False adds the xp without spending freezes, for history
+        # replayed from another device; settle() once after the batch
+        ts = int(CLOCK.time()) if ts is None else ts
+        ev = [ts, int(xp), local_day(ts)]
+        self.events.append(ev)
+        self._apply(ev, spend_freezes=settle)
+        self.rollup["events"] = len(self.events)
+        return ev
+
+    def settle(self, today=None):
+        # spend one streak freeze per fully missed local day before `today`;
+        # the streak breaks when they run out. Returns True if state changed.
+        s = self.streak_state
+        today = local_day() if today is None else today
+        if not s["current"] or s["last_day"] is None:
+            return False
+        changed = False
+        while s["last_day"] < today - 1:
+            if self.take_freeze is None or not self.take_freeze():
+                s["current"] = 0
+                return True
+            s["last_day"] += 1
+            s["frozen"].append(s["last_day"])
+            del s["frozen"][:-60]
+            changed = True
+        return changed
+
+    def _extend_streak(self, day, spend_freezes):
+        s = self.streak_state
+        if spend_freezes:
+            self.settle(day)
+        last = s["last_day"]
+        if last is not None and day <= last:
+            # same day, or the clock moved back across a timezone change
+            s["current"] = max(1, s["current"])
+        elif s["current"] and last == day - 1:
+            s["current"] += 1
+        else:
+            s["current"] = 1
+        if last is None or day > last:
+            s["last_day"] = day
+        s["best"] = max(s["best"], s["current"])
+
+    def streak(self, today=None):
+        s = self.streak_state
+        today = local_day() if today is None else today
+        if not s["current"] or s["last_day"] is None or s["last_day"] < today - 1:
+            return 0
+        return s["current"]
+
+    def day_xp(self, day=None):
+        return self.rollup["days"].get(str(local_day() if day is None else day), 0)
+
+    def week_xp(self, day=None):
+        return self.rollup["weeks"].get(str(week_of(local_day() if day is None else day)), 0)
+
+    def month_xp(self, day=None):
+        return self.rollup["months"].get(str(month_of(local_day() if day is None else day)), 0)
+
+
+# ---------------- Shop catalog ----------------
+SHOP_CATALOG_FILE = "shop_catalog.json"
+SHOP_PAGE_SIZE = 40  # cards shown per "Show more" step
+
+
+class ShopCatalog:
+    # Shop items from shop_catalog.json, in file order and indexed by id.
+    # Consumables can be owned several times; everything else at most once.
+    def __init__(self, items=()):
+        self.items = []
+        self.by_id = {}
+        for it in items:
+            if not isinstance(it, dict) or not it.get("id") or it["id"] in self.by_id:
+                continue
+            item = {"name": it["id"], "desc": "", "price": 0, "emoji": "🎁", "consumable": False}
+            item.update(it)
+            try:
+                item["price"] = int(item["price"])
+            except (TypeError, ValueError):
+                continue
+            self.items.append(item)
+            self.by_id[item["id"]] = item
+        self._keys = [normalize_answer(f"{it['name']} {it['desc']} {it['id']}") for it in self.items]
+
+    @classmethod
+    def load(cls, path=SHOP_CATALOG_FILE):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError) as e:
+            print("[catalog error]", e)
+            return cls()
+        items = d.get("items") if isinstance(d, dict) else d
+        return cls(items if isinstance(items, list) else ())
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, item_id):
+        return self.by_id.get(item_id)
+
+    def filter(self, query):
+        q = normalize_answer(query)
+        if not q:
+            return self.items
+        return [it for it, key in zip(self.items, self._keys) if q in key]
+
+
+# ---------------- Timed effects ----------------
+EFFECT_TIMER_MAX_MS = 3600 * 1000  # re-arm at least hourly (Tk after() wants a small int)
+
+
+class EffectsEngine:
+    # Active consumable effects ({"id", "start", "expires", "mods"}) kept in a
+    # persisted list, with an expiry heap and one Tk timer armed for the
+    # earliest expiry. Times are absolute, so effects survive restarts and
+    # whatever expired while the app was closed is dropped on load.
+    def __init__(self, effects, clock=CLOCK.time, root=None, on_expire=None):
+        self.effects = effects
+        self.clock = clock
+        self.root = root
+        self.on_expire = on_expire
+        self._timer = None
+        self._heap = [(e["expires"], e["id"]) for e in effects]
+        heapq.heapify(self._heap)
+        self.expire()
+
+    def _find(self, effect_id):
+        for e in self.effects:
+            if e["id"] == effect_id:
+                return e
+        return None
+
+    def activate(self, effect_id, mods, duration, now=None):
+        # a second activation of a running effect extends it
+        now = self.clock() if now is None else now
+        e = self._find(effect_id)
+        if e is None:
+            e = {"id": effect_id, "start": now, "expires": now, "mods": dict(mods)}
+            self.effects.append(e)
+        e["expires"] = max(e["expires"], now) + duration
+        heapq.heappush(self._heap, (e["expires"], effect_id))
+        self._arm()
+        return e
+
+    def expire(self, now=None):
+        now = self.clock() if now is None else now
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            expires, effect_id = heapq.heappop(self._heap)
+            e = self._find(effect_id)
+            if e is None or e["expires"] != expires:
+                continue  # stale entry from an extension
+            self.effects.remove(e)
+            expired.append(e)
+        self._arm()
+        if expired and self.on_expire is not None:
+            self.on_expire(expired)
+        return expired
+
+    def _arm(self):
+        if self.root is None:
+            return
+        if self._timer is not None:
+            unschedule(self.root, self._timer)
+            self._timer = None
+        if self._heap:
+            delay = max(0, int((self._heap[0][0] - self.clock()) * 1000) + 1)
+            self._timer = schedule(self.root, min(delay, EFFECT_TIMER_MAX_MS), self._fire)
+
+    def _fire(self):
+        self._timer = None
+        self.expire()
+
+    def active(self, now=None):
+        now = self.clock() if now is None else now
+        return [e for e in self.effects if e["expires"] > now]
+
+    def remaining(self, effect_id, now=None):
+        now = self.clock() if now is None else now
+        e = self._find(effect_id)
+        return max(0.0, e["expires"] - now) if e is not None else 0.0
+
+    def multiplier(self, mod, now=None):
+        now = self.clock() if now is None else now
+        m = 1.0
+        for e in self.effects:
+            if e["expires"] > now:
+                m *= e["mods"].get(mod, 1.0)
+        return m
+
+
+# ---------------- Mergeable progress ----------------
+SEED_DEVICE = "legacy"  # slot prefix for progress that predates the replica
+SYNCED_SETTINGS = ("theme", "reduced_motion", "daily_goal", "profile_name", "leaderboard_window")
+
+
+def _empty_replica():
+    return {"v": 1, "gems": {}, "xp": {}, "done": {}, "last": {}, "stock": {},
+            "adds": {}, "removes": {}, "tags": {}, "settings": {}}
+
+
+def _merge_max(mine, theirs):
+    # per-key max over {key: int}
+    for k, v in theirs.items():
+        if v > mine.get(k, 0):
+            mine[k] = v
+
+
+def _merge_pn(mine, theirs):
+    # per-key element-wise max over {key: [p, n]}
+    for k, (p, n) in theirs.items():
+        cur = mine.get(k)
+        if cur is None:
+            mine[k] = [p, n]
+        else:
+            cur[0] = max(cur[0], p)
+            cur[1] = max(cur[1], n)
+
+
+def _merge_tags(mine, theirs):
+    # per-item union over {item: [tags]}
+    for item, tags in theirs.items():
+        cur = mine.get(item)
+        if cur is None:
+            mine[item] = list(tags)
+        else:
+            have = set(cur)
+            cur.extend(t for t in tags if t not in have)
+
+
+class ProgressReplica:
+    # Progress as state-based CRDTs, stored as plain JSON in data["replica"]:
+    #   gems, stock  per-device PN counters ({device: [added, spent]})
+    #   xp, done     per-device grow-only counters
+    #   last         max register per lesson (last completion time)
+    #   adds/removes add-wins set of owned items (unique tags per add)
+    #   settings     last-writer-wins registers ([ts, device, value])
+    # merge() is a per-key max/union, so it is commutative, idempotent and
+    # linear in the size of both replicas.
+    def __init__(self, state=None, device=""):
+        self.state = state if state is not None else _empty_replica()
+        for k, v in _empty_replica().items():
+            self.state.setdefault(k, v)
+        self.device = device
+
+    @classmethod
+    def seed(cls, data, device, catalog=None):
+        # First run: record existing plain progress in a slot named after its
+        # content, so copies of one old save merge once while different saves add up.
+        progress = {k: data.get(k) for k in ("gems", "xp", "completed_lessons", "inventory")}
+        digest = hashlib.sha1(json.dumps(progress, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        slot = f"{SEED_DEVICE}:{digest}"
+        r = cls(device=device)
+        r.add_gems(int(data.get("gems", 0)), slot)
+        r.add_xp(int(data.get("xp", 0)), slot)
+        for lid, comp in data.get("completed_lessons", {}).items():
+            r.state["done"].setdefault(lid, {})[slot] = int(comp.get("times", 0))
+            r.state["last"][lid] = int(comp.get("last_completed", 0))
+        for item_id, count in data.get("inventory", {}).items():
+            item = catalog.get(item_id) if catalog is not None else None
+            if item is not None and not item.get("consumable"):
+                r.state["adds"].setdefault(item_id, []).append(f"{slot}:{item_id}")
+            else:
+                r.add_stock(item_id, int(count), slot)
+        for key in SYNCED_SETTINGS:
+            if key in data.get("settings", {}):
+                r.state["settings"][key] = [0, slot, data["settings"][key]]
+        return r
+
+    # -- updates (device defaults to this replica's own) --
+    def add_gems(self, n, device=None):
+        slot = self.state["gems"].setdefault(device or self.device, [0, 0])
+        slot[0 if n >= 0 else 1] += abs(int(n))
+
+    def add_xp(self, n, device=None):
+        d = self.state["xp"]
+        device = device or self.device
+        d[device] = d.get(device, 0) + max(0, int(n))
+
+    def complete(self, lesson, ts, device=None):
+        counts = self.state["done"].setdefault(lesson, {})
+        device = device or self.device
+        counts[device] = counts.get(device, 0) + 1
+        self.state["last"][lesson] = max(self.state["last"].get(lesson, 0), int(ts))
+
+    def add_stock(self, item, n, device=None):
+        slot = self.state["stock"].setdefault(item, {}).setdefault(device or self.device, [0, 0])
+        slot[0 if n >= 0 else 1] += abs(int(n))
+
+    def add_item(self, item, device=None):
+        device = device or self.device
+        tags = self.state["tags"]
+        tags[device] = tags.get(device, 0) + 1
+        self.state["adds"].setdefault(item, []).append(f"{device}:{tags[device]}")
+
+    def remove_item(self, item):
+        # removes only the adds seen so far; a concurrent add elsewhere wins
+        seen = self.state["adds"].get(item, [])
+        _merge_tags(self.state["removes"], {item: seen})
+
+    def set_setting(self, key, value, ts=None, device=None):
+        ts = CLOCK.time() if ts is None else ts
+        reg = [ts, device or self.device, value]
+        cur = self.state["settings"].get(key)
+        if cur is None or reg[:2] > cur[:2]:
+            self.state["settings"][key] = reg
+
+    # -- reads --
+    def gems(self):
+        return sum(p - n for p, n in self.state["gems"].values())
+
+    def xp(self):
+        return sum(self.state["xp"].values())
+
+    def stock(self, item):
+        return sum(p - n for p, n in self.state["stock"].get(item, {}).values())
+
+    def owned(self):
+        removes = self.state["removes"]
+        return sorted(item for item, tags in self.state["adds"].items()
+                      if set(tags) - set(removes.get(item, ())))
+
+    @staticmethod
+    def validate(state):
+        # ValueError unless state has the shapes merge() relies on
+        def count(v):
+            return type(v) is int and v >= 0
+
+        def table(key, ok):
+            t = state.get(key, {})
+            if not isinstance(t, dict) or not all(isinstance(k, str) and ok(v) for k, v in t.items()):
+                raise ValueError(f"bad replica '{key}'")
+
+        def pn(v):
+            return type(v) is list and len(v) == 2 and count(v[0]) and count(v[1])
+
+        def counts(v):
+            return isinstance(v, dict) and all(isinstance(k, str) and count(n) for k, n in v.items())
+
+        def tags(v):
+            return type(v) is list and all(isinstance(t, str) for t in v)
+
+        def register(v):
+            return (type(v) is list and len(v) == 3 and type(v[0]) in (int, float)
+                    and isinstance(v[1], str))
+
+        if not isinstance(state, dict):
+            raise ValueError("'replica' must be an object")
+        table("gems", pn)
+        table("xp", count)
+        table("done", counts)
+        table("last", count)
+        table("stock", lambda v: isinstance(v, dict) and all(isinstance(k, str) and pn(x) for k, x in v.items()))
+        table("adds", tags)
+        table("removes", tags)
+        table("tags", count)
+        table("settings", register)
+        return state
+
+    # -- merge --
+    def merge(self, other):
+        other = other.state if isinstance(other, ProgressReplica) else other
+        mine = self.state
+        _merge_pn(mine["gems"], other.get("gems", {}))
+        _merge_max(mine["xp"], other.get("xp", {}))
+        for lid, counts in other.get("done", {}).items():
+            _merge_max(mine["done"].setdefault(lid, {}), counts)
+        _merge_max(mine["last"], other.get("last", {}))
+        for item, slots in other.get("stock", {}).items():
+            _merge_pn(mine["stock"].setdefault(item, {}), slots)
+        _merge_tags(mine["adds"], other.get("adds", {}))
+        _merge_tags(mine["removes"], other.get("removes", {}))
+        _merge_max(mine["tags"], other.get("tags", {}))
+        for key, reg in other.get("settings", {}).items():
+            cur = mine["settings"].get(key)
+            if cur is None or reg[:2] > cur[:2]:
+                mine["settings"][key] = list(reg)
+        return self
+
+    def materialize(self, data):
+        # write merged values back into the plain fields the app and plugins read
+        data["gems"] = self.gems()
+        data["xp"] = self.xp()
+        completed = data.setdefault("completed_lessons", {})
+        for lid, counts in self.state["done"].items():
+            comp = completed.setdefault(lid, {})
+            comp["times"] = sum(counts.values())
+            comp["last_completed"] = self.state["last"].get(lid, 0)
+        inventory = {}
+        for item in self.state["stock"]:
+            n = self.stock(item)
+            if n > 0:
+                inventory[item] = n
+        for item in self.owned():
+            inventory[item] = max(1, inventory.get(item, 0))
+        data["inventory"] = inventory
+        settings = data.setdefault("settings", {})
+        for key, (_ts, _device, value) in self.state["settings"].items():
+            settings[key] = value
+        return data
+
+
+def merge_progress_files(paths, catalog=None):
+    # merge saved user_data files into DATA_FILE (CLI and offline kiosks)
+    data = load_data()
+    if data.get("replica") is None:
+        base = ProgressReplica.seed(data, data["device_id"], catalog)
+    else:
+        base = ProgressReplica(data["replica"], data["device_id"])
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            other = json.load(f)
+        replica = other.get("replica")
+        if replica is None:
+            replica = ProgressReplica.seed(upgrade_data(other), "", catalog).state
+        base.merge(replica)
+    data["replica"] = base.state
+    base.materialize(data)
+    save_data(data)
+    return data
+
+
+# ---------------- Sync ----------------
+SYNC_PORT = 8765
+SYNC_BATCH_MAX = 256     # deltas per push request
+SYNC_PIPELINE = 4        # push requests written before reading replies
+SYNC_BATCH_MS = 250      # client round-trip interval when idle
+SYNC_PULL_LIMIT = 1000   # deltas per pull reply
+SYNC_POLL_MS = 200       # Tk side: how often incoming deltas are applied
+SYNC_REJECTED_MAX = 1000 # refused deltas kept in user_data for inspection
+_SYNC_USER_RE = re.compile(r"^[A-Za-z0-9_.@-]{1,64}$")
+
+
+class SyncStore:
+    # Per-user append-only delta logs; a cursor is an offset into a user's
+    # log. Deltas carry (device, seq), so a batch re-sent after a dropped
+    # connection is not applied twice. With data_dir, logs are journalled as
+    # NDJSON and reloaded lazily.
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir
+        self.logs = {}  # user -> [delta]
+        self.seen = {}  # user -> {device: last seq}
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+
+    def _journal(self, user):
+        return os.path.join(self.data_dir, f"{user}.ndjson")
+
+    def _log(self, user):
+        log = self.logs.get(user)
+        if log is not None:
+            return log
+        log = self.logs[user] = []
+        seen = self.seen[user] = {}
+        if self.data_dir and os.path.exists(self._journal(user)):
+            with open(self._journal(user), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        d = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line
+                    log.append(d)
+                    seen[d.get("device")] = max(seen.get(d.get("device"), 0), int(d.get("seq", 0)))
+        return log
+
+    def push(self, user, deltas):
+        log = self._log(user)
+        seen = self.seen[user]
+        fresh = []
+        for d in deltas:
+            if not isinstance(d, dict):
+                continue
+            device, seq = d.get("device"), int(d.get("seq", 0))
+            if seq and seq <= seen.get(device, 0):
+                continue
+            seen[device] = seq
+            fresh.append(d)
+        if fresh:
+            log.extend(fresh)
+            if self.data_dir:
+                with open(self._journal(user), "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(d, ensure_ascii=False, separators=(",", ":")) + "\n"
+                                    for d in fresh))
+        return len(log), len(fresh)
+
+    def pull(self, user, cursor, limit=SYNC_PULL_LIMIT):
+        log = self._log(user)
+        cursor = max(0, min(int(cursor), len(log)))
+        chunk = log[cursor:cursor + limit]
+        end = cursor + len(chunk)
+        return chunk, end, end < len(log)
+
+
+class SyncServer:
+    # Line-delimited JSON over TCP. Requests: {"id", "op": "push", "user",
+    # "deltas": [...]} and {"id", "op": "pull", "user", "cursor"}; replies
+    # carry the same id and are written in request order, so clients can
+    # pipeline several requests per round trip.
+    def __init__(self, host="127.0.0.1", port=SYNC_PORT, data_dir=None):
+        self.host = host
+        self.port = port
+        self.store = SyncStore(data_dir)
+        self.requests = 0
+        self._server = None
+        self._writers = set()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=1 << 22)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        # stop listening and end open connections; handlers then see EOF
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+
+    async def _handle(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(self.dispatch(line))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def dispatch(self, line):
+        self.requests += 1
+        rid = None
+        try:
+            req = json.loads(line)
+            rid = req.get("id")
+            user = str(req["user"])
+            if not _SYNC_USER_RE.match(user):
+                raise ValueError(f"bad user name {user!r}")
+            if req["op"] == "push":
+                deltas = req.get("deltas")
+                if not isinstance(deltas, list):
+                    raise ValueError("deltas must be a list")
+                size, accepted = self.store.push(user, deltas)
+                resp = {"id": rid, "ok": True, "size": size, "accepted": accepted}
+            elif req["op"] == "pull":
+                deltas, cursor, more = self.store.pull(user, req.get("cursor", 0))
+                resp = {"id": rid, "ok": True, "deltas": deltas, "cursor": cursor, "more": more}
+            else:
+                raise ValueError(f"unknown op {req['op']!r}")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            resp = {"id": rid, "ok": False, "error": str(e)}
+        return (json.dumps(resp, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class SyncServerThread:
+    # A SyncServer on its own event loop in a daemon thread: the in-process
+    # stand-in for tests, load tests and single-machine setups.
+    def __init__(self, host="127.0.0.1", port=0, data_dir=None):
+        self.server = SyncServer(host, port, data_dir)
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sync-server", daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.server.start())
+        self._ready.set()
+        self.loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    @property
+    def address(self):
+        return self.server.host, self.server.port
+
+    async def _shutdown(self):
+        self.server.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=2)
+        self.loop.stop()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self._thread.join(5)
+        self.loop.close()
+
+
+class SyncClient:
+    # push() only queues a delta; a background thread sends queued deltas in
+    # batches, pipelining pushes and a pull on one connection per round, and
+    # hands remote deltas back through `incoming` as (deltas, cursor) for the
+    # Tk loop to apply. Unacknowledged deltas are retried after reconnecting;
+    # acked_seq is the highest seq the server has answered for, and batches
+    # it refused go to `rejected` as (deltas, error) instead of being retried.
+    def __init__(self, host, port, user, device, cursor=0, seq=0, pending=(),
+                 batch_ms=SYNC_BATCH_MS):
+        self.host = host
+        self.port = int(port)
+        self.user = user
+        self.device = device
+        self.cursor = int(cursor)
+        self.seq = int(seq)
+        self.batch_ms = batch_ms
+        self.outgoing = queue.Queue()
+        self.incoming = queue.Queue()
+        self.connected = False
+        self.error = None
+        self.acked = 0
+        self.acked_seq = 0
+        self.rejected = queue.Queue()
+        self.rounds = 0
+        self._inflight = list(pending)
+        self._seq_lock = threading.Lock()
+        self._next_id = 0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sync-client", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def push(self, delta):
+        with self._seq_lock:
+            self.seq += 1
+            delta = dict(delta, device=self.device, seq=self.seq)
+        self.outgoing.put(delta)
+        if self.outgoing.qsize() >= SYNC_BATCH_MAX:
+            self._wake.set()
+        return delta
+
+    def sync_now(self):
+        self._wake.set()
+
+    def close(self, timeout=2.0):
+        # stop the worker and return deltas that were never acknowledged
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        pending = list(self._inflight)
+        while True:
+            try:
+                pending.append(self.outgoing.get_nowait())
+            except queue.Empty:
+                return pending
+
+    def _take(self):
+        out = []
+        while len(out) < SYNC_BATCH_MAX * SYNC_PIPELINE:
+            try:
+                out.append(self.outgoing.get_nowait())
+            except queue.Empty:
+                break
+        return out
+
+    def _request(self, op, **fields):
+        self._next_id += 1
+        return {"id": self._next_id, "op": op, "user": self.user, **fields}
+
+    def _round(self, f):
+        self._inflight.extend(self._take())
+        batches = [self._inflight[i:i + SYNC_BATCH_MAX]
+                   for i in range(0, len(self._inflight), SYNC_BATCH_MAX)]
+        reqs = [self._request("push", deltas=b) for b in batches]
+        reqs.append(self._request("pull", cursor=self.cursor))
+        f.write(b"".join((json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+                         for r in reqs))
+        f.flush()
+
+        for req in reqs:
+            line = f.readline()
+            if not line:
+                raise ConnectionError("sync server closed the connection")
+            resp = json.loads(line)
+            if req["op"] == "push":
+                self._inflight = self._inflight[len(req["deltas"]):]
+                self.acked_seq = max(self.acked_seq, int(req["deltas"][-1].get("seq", 0)))
+            if not resp.get("ok"):
+                self.error = resp.get("error")
+                if req["op"] == "push":
+                    # retrying would fail forever; hand the batch back instead
+                    self.rejected.put((req["deltas"], self.error))
+                continue
+            if req["op"] == "push":
+                self.acked += len(req["deltas"])
+            else:
+                if resp["cursor"] == self.cursor:
+                    continue
+                self.cursor = resp["cursor"]
+                remote = [d for d in resp["deltas"] if d.get("device") != self.device]
+                self.incoming.put((remote, self.cursor))
+                if resp.get("more"):
+                    self._wake.set()
+        self.rounds += 1
+
+    def _run(self):
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                with socket.create_connection((self.host, self.port), timeout=10) as sock:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    f = sock.makefile("rwb")
+                    self.connected = True
+                    self.error = None
+                    backoff = 0.5
+                    while not self._stop.is_set():
+                        self._round(f)
+                        self._wake.wait(self.batch_ms / 1000)
+                        self._wake.clear()
+            except (OSError, ValueError) as e:
+                self.error = str(e)
+            self.connected = False
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+def parse_host_port(spec, default_port=SYNC_PORT):
+    host, _, port = spec.rpartition(":")
+    if not host:
+        return spec, default_port
+    return host, int(port)
+
+
+# ---------------- Audio clips ----------------
+AUDIO_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class AudioClip:
+    def __init__(self, path, frames, channels, sample_width, rate):
+        self.path = path
+        self.frames = frames
+        self.channels = channels
+        self.sample_width = sample_width
+        self.rate = rate
+
+    @property
+    def nbytes(self):
+        return len(self.frames)
+
+    @property
+    def duration(self):
+        return len(self.frames) / float(self.channels * self.sample_width * self.rate or 1)
+
+
+def decode_clip(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".wav":
+        with wave.open(path, "rb") as w:
+            return AudioClip(path, w.readframes(w.getnframes()),
+                             w.getnchannels(), w.getsampwidth(), w.getframerate())
+    if ext == ".ogg":
+        try:
+            import soundfile  # optional dependency for OGG/Vorbis
+        except ImportError:
+            raise RuntimeError("OGG clips need the 'soundfile' package")
+        data, rate = soundfile.read(path, dtype="int16", always_2d=True)
+        return AudioClip(path, data.tobytes(), data.shape[1], 2, rate)
+    raise RuntimeError(f"Unsupported audio format: {ext}")
+
+
+class ClipCache:
+    # Decodes clips on a background thread into an LRU cache bounded by bytes.
+    # prefetch() returns a Future; the Tk side polls it instead of blocking.
+    def __init__(self, max_bytes=AUDIO_CACHE_BYTES, decoder=decode_clip):
+        self.max_bytes = max_bytes
+        self.decoder = decoder
+        self.bytes = 0
+        self._clips = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clip-decode")
+
+    def get(self, path):
+        with self._lock:
+            clip = self._clips.get(path)
+            if clip is not None:
+                self._clips.move_to_end(path)
+            return clip
+
+    def prefetch(self, path):
+        with self._lock:
+            clip = self._clips.get(path)
+            if clip is not None:
+                self._clips.move_to_end(path)
+                done = Future()
+                done.set_result(clip)
+                return done
+            fut = self._pending.get(path)
+            if fut is None:
+                fut = self._pending[path] = self._pool.submit(self._load, path)
+            return fut
+
+    def _load(self, path):
+        try:
+            clip = self.decoder(path)
+        except Exception:
+            with self._lock:
+                self._pending.pop(path, None)
+            raise
+        with self._lock:
+            self._pending.pop(path, None)
+            old = self._clips.pop(path, None)
+            if old is not None:
+                self.bytes -= old.nbytes
+            self._clips[path] = clip
+            self.bytes += clip.nbytes
+            # evict least recently used, but always keep the clip just decoded
+            while self.bytes > self.max_bytes and len(self._clips) > 1:
+                _, evicted = self._clips.popitem(last=False)
+                self.bytes -= evicted.nbytes
+        return clip
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+class NullAudioSink:
+    # No sound device needed; remembers what would have been played.
+    def __init__(self):
+        self.played = []
+
+    def play(self, clip):
+        self.played.append(clip.path)
+
+    def stop(self):
+        pass
+
+
+class FileAudioSink(NullAudioSink):
+    # Writes every played clip to a numbered WAV file (handy for CI checks).
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def play(self, clip):
+        super().play(clip)
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{len(self.played):04d}_{os.path.splitext(os.path.basename(clip.path))[0]}.wav"
+        with wave.open(os.path.join(self.directory, name), "wb") as w:
+            w.setnchannels(clip.channels)
+            w.setsampwidth(clip.sample_width)
+            w.setframerate(clip.rate)
+            w.writeframes(clip.frames)
+
+
+class SimpleAudioSink:
+    # Real playback through the optional 'simpleaudio' package (non-blocking).
+    def __init__(self, backend):
+        self.backend = backend
+        self._play = None
+
+    def play(self, clip):
+        self.stop()
+        self._play = self.backend.play_buffer(clip.frames, clip.channels, clip.sample_width, clip.rate)
+
+    def stop(self):
+        if self._play is not None:
+            self._play.stop()
+            self._play = None
+
+
+def make_audio_sink(spec="auto"):
+    spec = spec or "auto"
+    if spec == "null":
+        return NullAudioSink()
+    if spec.startswith("file:"):
+        return FileAudioSink(spec[len("file:"):] or "played_audio")
+    try:
+        import simpleaudio
+    except ImportError:
+        return NullAudioSink()
+    return SimpleAudioSink(simpleaudio)
+
+
+# ---------------- Story book (paginated, lazy) ----------------
+STORY_PAGE_CHARS = 1200
+STORY_CHUNK = 64 * 1024
+
+
+class StoryBook:
+    # Reads a story lazily in chunks and splits it into pages on demand.
+    # Paragraphs are separated by blank lines; a line
+    #   ?? Question | correct answer | wrong | wrong
+    # ends the current page and attaches a comprehension question to it. The
+    # question's id comes from its text, so answers stay with the question
+    # when pages move.
+    def __init__(self, path=None, text=None, page_chars=STORY_PAGE_CHARS, chunk_size=STORY_CHUNK):
+        self.path = path
+        self.page_chars = page_chars
+        self.chunk_size = chunk_size
+        self.pages = []  # [{"text": str, "question": dict | None}]
+        self._f = open(path, "r", encoding="utf-8") if path is not None else None
+        self._buf = text or ""
+        self._pos = 0  # read position in _buf; lines are never re-split
+        self._eof = path is None
+        self._para = []  # paragraphs of the page being assembled
+        self._chars = 0
+
+    @property
+    def finished(self):
+        return self._eof and self._pos >= len(self._buf) and not self._para
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def _read(self):
+        if self._eof:
+            return False
+        chunk = self._f.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            self.close()
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _next_line(self):
+        # find() from the read position: a chunk is scanned once, whatever its line count
+        while True:
+            end = self._buf.find("\n", self._pos)
+            if end >= 0:
+                line = self._buf[self._pos:end]
+                self._pos = end + 1
+                return line
+            if not self._read():
+                if self._pos >= len(self._buf):
+                    return None
+                line = self._buf[self._pos:]
+                self._buf, self._pos = "", 0
+                return line
+
+    def _emit(self, question=None):
+        text = "\n\n".join(" ".join(p) for p in self._para)
+        self._para = []
+        self._chars = 0
+        if text or question:
+            self.pages.append({"text": text, "question": question})
+
+    def _parse_next_page(self):
+        start = len(self.pages)
+        current = []
+        current_len = 0
+        while len(self.pages) == start:
+            line = self._next_line()
+            if line is None:
+                if current:
+                    self._para.append(current)
+                self._emit()
+                return len(self.pages) > start
+            line = line.strip()
+            if line.startswith("??"):
+                if current:
+                    self._para.append(current)
+                    current = []
+                parts = [p.strip() for p in line[2:].split("|")]
+                question = None
+                if len(parts) >= 3:
+                    question = {"id": normalize_answer(parts[0]).replace(" ", "_"),
+                                "q": parts[0], "a": parts[1], "choices": parts[1:]}
+                self._emit(question)
+            elif not line:
+                if current:
+                    self._para.append(current)
+                    self._chars += current_len
+                    current, current_len = [], 0
+                    if self._chars >= self.page_chars:
+                        self._emit()
+            else:
+                current.append(line)
+                current_len += len(line) + 1
+                if self._chars + current_len >= 2 * self.page_chars:
+                    # one huge paragraph: break it across pages at a line boundary
+                    self._para.append(current)
+                    self._emit()
+        return True
+
+    def page(self, n):
+        # page n, parsing (and reading) only as far as needed; None past the end
+        while n >= len(self.pages):
+            if self.finished:
+                return None
+            if not self._parse_next_page():
+                return None
+        return self.pages[n]
+
+
 # ---------------- UI Helpers ----------------
 def round_rect(canvas, x1, y1, x2, y2, r=16, **kwargs):
     points = [
@@ -108,6 +2674,235 @@ def clamp01(x):
     return 0 if x < 0 else 1 if x > 1 else x
 
 
+# ---------------- Coalesced resize handling ----------------
+class RedrawBatcher:
+    # Collects <Configure> work from the whole window and runs it at most once
+    # per frame. Requests are keyed (usually by widget), so a widget that gets
+    # fifty events during a drag is still laid out/redrawn once.
+    def __init__(self, root, interval=16):
+        self.root = root
+        self.interval = interval
+        self._pending = {}
+        self._after_id = None
+        self.flushes = 0
+
+    def request(self, key, fn):
+        self._pending[key] = fn
+        if self._after_id is None:
+            self._after_id = schedule(self.root, self.interval, self.flush)
+
+    def flush(self):
+        self._after_id = None
+        pending, self._pending = self._pending, {}
+        for fn in pending.values():
+            try:
+                fn()
+            except tk.TclError:
+                pass  # widget destroyed before the frame ran
+        self.flushes += 1
+
+
+def _batcher_for(widget):
+    return getattr(widget.winfo_toplevel(), "redraw_batcher", None)
+
+
+def bind_batched(widget, sequence, fn):
+    # run fn(event) for the latest event only, once per frame
+    def handler(e):
+        batcher = _batcher_for(widget)
+        if batcher is None:
+            fn(e)
+        else:
+            batcher.request((widget, sequence), lambda: fn(e))
+    widget.bind(sequence, handler)
+
+
+def bind_debounced(widget, sequence, ms, fn):
+    # run fn() once the events have stopped for ms; the timer belongs to widget
+    pending = [None]
+
+    def fire():
+        pending[0] = None
+        fn()
+
+    def handler(_e):
+        if pending[0] is not None:
+            unschedule(widget, pending[0])
+        pending[0] = schedule(widget, ms, fire)
+    widget.bind(sequence, handler)
+
+
+def bind_resize_redraw(widget):
+    # <Configure> -> one batched redraw per frame, only if the size changed
+    widget._drawn_size = None
+
+    def redraw(size):
+        if widget._drawn_size == size:
+            return
+        widget._drawn_size = size
+        widget.redraw()
+
+    def handler(e):
+        size = (e.width, e.height)
+        if widget._drawn_size == size:
+            return
+        batcher = _batcher_for(widget)
+        if batcher is None:
+            redraw(size)
+        else:
+            batcher.request(widget, lambda: redraw(size))
+    widget.bind("<Configure>", handler)
+
+
+# ---------------- Timers (owned after() callbacks) ----------------
+class TimerRegistry:
+    # Every after()/after_idle() callback belongs to an owner widget. A timer
+    # drops out of the registry when it fires or is cancelled, and destroying
+    # the owner cancels whatever it still has pending, so an animation never
+    # runs against a widget that has gone. Plugins use it as app.timers.
+    # While the clock is frozen (session replay) timed callbacks wait in a
+    # heap of virtual due times and only fire from advance().
+    def __init__(self, clock=CLOCK):
+        self.clock = clock
+        self._owner = {}  # after id -> owner widget
+        self._owned = {}  # owner widget -> set of after ids
+        self._watched = set()  # owners with a <Destroy> binding
+        self._due = []  # (virtual due time, seq, after id, callback)
+        self._seq = itertools.count()
+
+    @property
+    def live(self):
+        return len(self._owner)
+
+    def count(self, owner):
+        return len(self._owned.get(owner, ()))
+
+    def after(self, owner, ms, func, *args):
+        return self._add(owner, ms, func, args)
+
+    def after_idle(self, owner, func, *args):
+        return self._add(owner, None, func, args)
+
+    def _add(self, owner, ms, func, args):
+        after_id = None
+
+        def run():
+            self._forget(after_id)
+            func(*args)
+
+        if ms is None:
+            after_id = owner.after_idle(run)
+        elif self.clock.frozen:
+            n = next(self._seq)
+            after_id = f"virtual#{n}"
+            heapq.heappush(self._due, (self.clock.time() + ms / 1000, n, after_id, run))
+        else:
+            after_id = owner.after(ms, run)
+        self._owner[after_id] = owner
+        self._owned.setdefault(owner, set()).add(after_id)
+        self._watch(owner)
+        return after_id
+
+    def _watch(self, owner):
+        if owner in self._watched:
+            return
+        self._watched.add(owner)
+
+        def on_destroy(e):
+            # <Destroy> on a toplevel is also delivered for each child
+            if e.widget is owner:
+                self.cancel_owner(owner)
+                self._watched.discard(owner)
+        owner.bind("<Destroy>", on_destroy, add="+")
+
+    def _forget(self, after_id):
+        owner = self._owner.pop(after_id, None)
+        if owner is None:
+            return None
+        ids = self._owned.get(owner)
+        if ids is not None:
+            ids.discard(after_id)
+            if not ids:
+                del self._owned[owner]
+        return owner
+
+    def cancel(self, after_id):
+        owner = self._forget(after_id)
+        if owner is not None and not after_id.startswith("virtual#"):
+            try:
+                owner.after_cancel(after_id)
+            except tk.TclError:
+                pass
+
+    def cancel_owner(self, owner):
+        for after_id in list(self._owned.get(owner, ())):
+            self.cancel(after_id)
+
+    def advance(self, seconds):
+        # move the frozen clock forward, firing virtual timers in due order
+        end = self.clock.time() + seconds
+        while self._due and self._due[0][0] <= end:
+            due, _, after_id, run = heapq.heappop(self._due)
+            if after_id not in self._owner:
+                continue  # cancelled
+            self.clock.set(due)
+            run()
+        self.clock.set(end)
+
+
+def _timers_for(widget):
+    return getattr(widget.winfo_toplevel(), "timers", None)
+
+
+def schedule(widget, ms, func, *args):
+    # widget.after() owned by widget when the app keeps a TimerRegistry
+    timers = _timers_for(widget)
+    if timers is None:
+        return widget.after(ms, func, *args)
+    return timers.after(widget, ms, func, *args)
+
+
+def unschedule(widget, after_id):
+    timers = _timers_for(widget)
+    if timers is None:
+        widget.after_cancel(after_id)
+    else:
+        timers.cancel(after_id)
+
+
+@contextlib.contextmanager
+def frozen_widget_after():
+    # widget.after(ms, fn) outside app.timers would run on wall-clock time;
+    # inside this block it goes through the toplevel's registry whenever the
+    # clock is frozen, so plugins' raw timers replay on virtual time too
+    orig_after, orig_cancel = tk.Misc.after, tk.Misc.after_cancel
+
+    def after(widget, ms, func=None, *args):
+        timers = _timers_for(widget) if func is not None and CLOCK.frozen else None
+        if timers is None:
+            return orig_after(widget, ms, func, *args)
+        return timers.after(widget, ms, func, *args)
+
+    def after_cancel(widget, after_id):
+        if isinstance(after_id, str) and after_id.startswith("virtual#"):
+            timers = _timers_for(widget)
+            if timers is not None:
+                timers.cancel(after_id)
+            return None
+        return orig_cancel(widget, after_id)
+
+    tk.Misc.after, tk.Misc.after_cancel = after, after_cancel
+    try:
+        yield
+    finally:
+        tk.Misc.after, tk.Misc.after_cancel = orig_after, orig_cancel
+
+
+# frames the plugin profiler looks through to find who asked for a timer
+_SCHEDULER_CODES = {TimerRegistry.after.__code__, TimerRegistry.after_idle.__code__,
+                    TimerRegistry._add.__code__, schedule.__code__}
+
+
 # ---------------- Animated integer ----------------
 class AnimatedInt:
     def __init__(self, initial=0):
@@ -121,14 +2916,14 @@ class AnimatedInt:
     def animate_to(self, target, duration=0.45):
         self._start = self.value
         self._target = int(target)
-        self._t0 = time.time()
+        self._t0 = CLOCK.time()
         self._dur = max(0.01, float(duration))
         self.running = True
 
     def tick(self):
         if not self.running:
             return self.value
-        t = (time.time() - self._t0) / self._dur
+        t = (CLOCK.time() - self._t0) / self._dur
         if t >= 1:
             self.value = self._target
             self.running = False
@@ -138,11 +2933,73 @@ class AnimatedInt:
         return self.value
 
 
+# ---------------- Motion quality (adaptive animations) ----------------
+MOTION_FULL = "full"        # full slide + hover lift
+MOTION_SHORT = "short"      # shortened slide + hover lift
+MOTION_INSTANT = "instant"  # page swap without slide, hover lift kept
+MOTION_STATIC = "static"    # instant swap, no hover lift, toasts jump
+
+MOTION_LEVELS = [MOTION_FULL, MOTION_SHORT, MOTION_INSTANT, MOTION_STATIC]
+
+
+class MotionQuality:
+    # Smoothed frame interval (seconds) above which we drop to the next level.
+    THRESHOLDS = (0.024, 0.040, 0.070)
+
+    def __init__(self, reduced=False):
+        self.reduced = bool(reduced)
+        self.frame_time = 1 / 60
+        self._auto = 0
+        self._last = None
+
+    def sample(self, now=None):
+        # call once per UI tick; the tick is scheduled every 16 ms, so the
+        # measured interval is how long a frame really takes on this machine
+        now = CLOCK.perf_counter() if now is None else now
+        last, self._last = self._last, now
+        if last is None:
+            return
+        dt = now - last
+        if dt <= 0 or dt > 0.5:
+            # window was hidden/suspended; not a rendering cost
+            return
+        self.frame_time += (dt - self.frame_time) * 0.1
+
+        # degrade promptly, recover only once clearly below the threshold
+        while self._auto < len(self.THRESHOLDS) and self.frame_time > self.THRESHOLDS[self._auto]:
+            self._auto += 1
+        while self._auto > 0 and self.frame_time < self.THRESHOLDS[self._auto - 1] * 0.8:
+            self._auto -= 1
+
+    @property
+    def level(self):
+        if self.reduced:
+            return MOTION_STATIC
+        return MOTION_LEVELS[self._auto]
+
+    def slide_duration(self, full):
+        level = self.level
+        if level == MOTION_FULL:
+            return full
+        if level == MOTION_SHORT:
+            return full * 0.5
+        return 0.0
+
+    @property
+    def lift_enabled(self):
+        return self.level != MOTION_STATIC
+
+
 # ---------------- Toast bar (single-window notifications) ----------------
+TOAST_PRIORITY = {"error": 3, "warn": 2, "success": 1, "info": 0}
+TOAST_QUEUE_MAX = 4
+
+
 class ToastBar(tk.Frame):
-    def __init__(self, parent, get_theme):
+    def __init__(self, parent, get_theme, motion=None):
         super().__init__(parent)
         self.get_theme = get_theme
+        self.motion = motion
         self._visible = False
         self._target_y = 0
         self._y = -60
@@ -152,27 +3009,104 @@ class ToastBar(tk.Frame):
 
         self.msg = ""
         self.kind = "info"  # info/success/warn/error
+        self.count = 1
         self.after_id = None
 
-        self.bind("<Configure>", lambda e: self.redraw())
+        # pending toasts: dicts with msg/kind/count/duration, highest priority first on pop
+        self.queue = []
+
+        # single slide animation, retargeted instead of restarted
+        self._anim_id = None
+        self._anim_from = self._y
+        self._anim_t0 = 0.0
+
+        self._accent_id = None
+        self._text_id = None
+
+        bind_resize_redraw(self)
 
     def show(self, msg, kind="info", duration=2.2):
+        # coalesce with what is on screen
+        if self._visible and msg == self.msg and kind == self.kind:
+            self.count += 1
+            self._update_message()
+            self._schedule_hide(duration)
+            return
+
+        # coalesce with something already waiting
+        for pending in self.queue:
+            if pending["msg"] == msg and pending["kind"] == kind:
+                pending["count"] += 1
+                pending["duration"] = max(pending["duration"], duration)
+                return
+
+        if not self._visible or TOAST_PRIORITY.get(kind, 0) >= TOAST_PRIORITY.get(self.kind, 0):
+            # newer feedback of equal or higher priority replaces the current toast
+            self._display(msg, kind, 1, duration)
+            return
+
+        self.queue.append({"msg": msg, "kind": kind, "count": 1, "duration": duration})
+        if len(self.queue) > TOAST_QUEUE_MAX:
+            # drop the oldest of the lowest priority
+            lowest = min(range(len(self.queue)), key=lambda i: TOAST_PRIORITY.get(self.queue[i]["kind"], 0))
+            self.queue.pop(lowest)
+
+    def _display(self, msg, kind, count, duration):
         self.msg = msg
         self.kind = kind
+        self.count = count
+        was_visible = self._visible
         self._visible = True
-        self.redraw()
-        self._animate_to(0)
+        self._update_message()
+        if not was_visible:
+            self._animate_to(0)
+        self._schedule_hide(duration)
 
+    def _schedule_hide(self, duration):
         if self.after_id:
-            self.after_cancel(self.after_id)
-        self.after_id = self.after(int(duration * 1000), self.hide)
+            unschedule(self, self.after_id)
+        self.after_id = schedule(self, int(duration * 1000), self._next)
+
+    def _next(self):
+        self.after_id = None
+        if not self.queue:
+            self.hide()
+            return
+        best = max(range(len(self.queue)), key=lambda i: TOAST_PRIORITY.get(self.queue[i]["kind"], 0))
+        pending = self.queue.pop(best)
+        self._display(pending["msg"], pending["kind"], pending["count"], pending["duration"])
 
     def hide(self):
         if not self._visible:
             return
         self._visible = False
+        self.queue.clear()
+        if self.after_id:
+            unschedule(self, self.after_id)
+            self.after_id = None
         self._animate_to(-60)
 
+    def _accent(self, t):
+        if self.kind == "success":
+            return t["green"]
+        if self.kind == "warn":
+            return t["orange"]
+        if self.kind == "error":
+            return t["red"]
+        return t["blue"]
+
+    def _label(self):
+        return self.msg if self.count <= 1 else f"{self.msg} ×{self.count}"
+
+    def _update_message(self):
+        # only touch the two items that change between toasts
+        if self._text_id is None:
+            self.redraw()
+            return
+        t = self.get_theme()
+        self.canvas.itemconfigure(self._accent_id, fill=self._accent(t))
+        self.canvas.itemconfigure(self._text_id, text=self._label())
+
     def redraw(self):
         t = self.get_theme()
         self.configure(bg=t["bg"])
@@ -182,47 +3116,39 @@ class ToastBar(tk.Frame):
         w = max(300, self.winfo_width())
         h = 52
 
-        accent = t["blue"]
-        if self.kind == "success":
-            accent = t["green"]
-        elif self.kind == "warn":
-            accent = t["orange"]
-        elif self.kind == "error":
-            accent = t["red"]
-
         # shadow + pill
         round_rect(self.canvas, 10, 8, w-10, h-6, r=16, fill=t["shadow"], outline="")
         round_rect(self.canvas, 10, 4, w-10, h-10, r=16, fill=t["panel"], outline=t["border"], width=1)
-        self.canvas.create_oval(20, 16, 36, 32, fill=accent, outline="")
-        self.canvas.create_text(44, 24, text=self.msg, anchor="w",
-                                font=("Segoe UI", 11, "bold"), fill=t["text"])
+        self._accent_id = self.canvas.create_oval(20, 16, 36, 32, fill=self._accent(t), outline="")
+        self._text_id = self.canvas.create_text(44, 24, text=self._label(), anchor="w",
+                                                font=("Segoe UI", 11, "bold"), fill=t["text"])
 
     def _animate_to(self, target_y):
-        # Smooth slide using ease-out
-        start_y = self._y
-        end_y = target_y
-        t0 = time.time()
-        dur = 0.22
-
-        def step():
-            nonlocal start_y, end_y, t0, dur
-            t = (time.time() - t0) / dur
-            if t >= 1:
-                self._y = end_y
-                self.place_configure(y=int(self._y))
-                return
-            e = ease_out_quad(clamp01(t))
-            self._y = start_y + (end_y - start_y) * e
+        # Smooth slide using ease-out; a running slide is retargeted, never duplicated
+        self._anim_from = self._y
+        self._target_y = target_y
+        self._anim_t0 = CLOCK.time()
+        if self._anim_id is None:
+            self._anim_step()
+
+    def _anim_step(self):
+        dur = 0.22 if self.motion is None else self.motion.slide_duration(0.22)
+        t = (CLOCK.time() - self._anim_t0) / dur if dur > 0 else 1
+        if t >= 1:
+            self._anim_id = None
+            self._y = self._target_y
             self.place_configure(y=int(self._y))
-            self.after(16, step)
-
-        step()
+            return
+        e = ease_out_quad(clamp01(t))
+        self._y = self._anim_from + (self._target_y - self._anim_from) * e
+        self.place_configure(y=int(self._y))
+        self._anim_id = schedule(self, 16, self._anim_step)
 
 
 # ---------------- Sidebar button (no flicker) ----------------
 class SidebarButton(tk.Canvas):
-    def __init__(self, parent, get_theme, text, icon, command):
-        super().__init__(parent, height=46, highlightthickness=0)
+    def __init__(self, parent, get_theme, text, icon, command, name=None):
+        super().__init__(parent, name=name, height=46, highlightthickness=0)
         self.get_theme = get_theme
         self.text = text
         self.icon = icon
@@ -230,7 +3156,7 @@ class SidebarButton(tk.Canvas):
         self.selected = False
         self.hover = False
 
-        self.bind("<Configure>", lambda e: self.redraw())
+        bind_resize_redraw(self)
         self.bind("<Enter>", lambda e: self._set_hover(True))
         self.bind("<Leave>", lambda e: self._set_hover(False))
         self.bind("<Button-1>", lambda e: self.command())
@@ -268,16 +3194,19 @@ class SidebarButton(tk.Canvas):
 
 # ---------------- Animated “lift” card base ----------------
 class LiftCard(tk.Canvas):
-    def __init__(self, parent, get_theme, height=98):
-        super().__init__(parent, height=height, highlightthickness=0)
+    def __init__(self, parent, get_theme, height=98, motion=None, name=None):
+        super().__init__(parent, name=name, height=height, highlightthickness=0)
         self.get_theme = get_theme
+        self.motion = motion
         self.lift = 0.0  # 0..1
         self.hover = False
-        self._animating = False
+        self._lift_timer = None  # the one running step chain, retargeted on hover changes
+        self._lift_from = self._lift_to = 0.0
+        self._lift_t0 = 0.0
 
         self.bind("<Enter>", lambda e: self.set_hover(True))
         self.bind("<Leave>", lambda e: self.set_hover(False))
-        self.bind("<Configure>", lambda e: self.redraw())
+        bind_resize_redraw(self)
 
     def set_hover(self, v):
         if self.hover == v:
@@ -286,29 +3215,30 @@ class LiftCard(tk.Canvas):
         self._animate_lift(1.0 if v else 0.0)
 
     def _animate_lift(self, target):
-        if self._animating:
-            # let current animation continue; new target will be followed on next tick
-            pass
-        self._animating = True
-        start = self.lift
-        end = target
-        t0 = time.time()
-        dur = 0.12
-
-        def step():
-            nonlocal start, end, t0, dur
-            t = (time.time() - t0) / dur
-            if t >= 1:
-                self.lift = end
-                self._animating = False
-                self.redraw()
-                return
-            e = ease_out_quad(clamp01(t))
-            self.lift = start + (end - start) * e
+        if self.motion is not None and not self.motion.lift_enabled:
+            # no lift on slow machines / reduced motion; still show hover colors
+            if self._lift_timer is not None:
+                unschedule(self, self._lift_timer)
+                self._lift_timer = None
+            self.lift = 0.0
             self.redraw()
-            self.after(16, step)
-
-        step()
+            return
+        # a running animation just picks up the new target from where it is
+        self._lift_from, self._lift_to, self._lift_t0 = self.lift, target, CLOCK.time()
+        if self._lift_timer is None:
+            self._lift_step()
+
+    def _lift_step(self):
+        self._lift_timer = None
+        t = (CLOCK.time() - self._lift_t0) / 0.12
+        if t >= 1:
+            self.lift = self._lift_to
+            self.redraw()
+            return
+        e = ease_out_quad(clamp01(t))
+        self.lift = self._lift_from + (self._lift_to - self._lift_from) * e
+        self.redraw()
+        self._lift_timer = schedule(self, 16, self._lift_step)
 
     def redraw(self):
         # subclass should draw
@@ -317,11 +3247,20 @@ class LiftCard(tk.Canvas):
 
 class LessonCard(LiftCard):
     def __init__(self, parent, app, entry, get_theme):
-        super().__init__(parent, get_theme, height=98)
+        name = "lesson_" + re.sub(r"\W", "_", str(entry["meta"].get("id", "")))
+        super().__init__(parent, get_theme, height=98, motion=app.motion, name=name)
         self.app = app
         self.entry = entry
+        # profiler verdict, looked up per build (and by refresh_budget) rather than per frame
+        self.over = app.profiler.violations(entry["meta"].get("id"))
         self.bind("<Button-1>", lambda e: self.app.open_lesson(self.entry))
 
+    def refresh_budget(self):
+        over = self.app.profiler.violations(self.entry["meta"].get("id"))
+        if over != self.over:
+            self.over = over
+            self.redraw()
+
     def redraw(self):
         t = self.get_theme()
         self.configure(bg=t["bg"])
@@ -347,8 +3286,13 @@ class LessonCard(LiftCard):
         self.create_text(80, 56+y, text=meta.get("title", "Untitled"), anchor="w",
                          font=("Segoe UI", 12, "bold"), fill=t["text"])
         sub = meta.get("subtitle", "")
+        over = self.over
+        if over:
+            # flagged by the plugin profiler; replaces the subtitle line
+            sub = "⚠ Over budget: " + violation_text(over)
         if sub:
-            self.create_text(80, 76+y, text=sub, anchor="w", font=("Segoe UI", 9), fill=t["muted"])
+            self.create_text(80, 76+y, text=sub, anchor="w", font=("Segoe UI", 9),
+                             fill=t["orange"] if over else t["muted"])
 
         # start button (drawn, not a real Button => no flicker)
         bx2 = w - 18
@@ -362,12 +3306,19 @@ class LessonCard(LiftCard):
 
 
 class ShopItemCard(LiftCard):
-    def __init__(self, parent, app, item, get_theme):
-        super().__init__(parent, get_theme, height=114)
+    def __init__(self, parent, app, item, get_theme, name=None):
+        super().__init__(parent, get_theme, height=114, motion=app.motion, name=name)
         self.app = app
         self.item = item
         self.bind("<Button-1>", lambda e: self.app.try_buy_item(self.item["id"]))
 
+    def set_item(self, item):
+        if item is self.item:
+            return
+        self.item = item
+        if self._drawn_size is not None:
+            self.redraw()
+
     def redraw(self):
         t = self.get_theme()
         self.configure(bg=t["bg"])
@@ -382,7 +3333,10 @@ class ShopItemCard(LiftCard):
         round_rect(self, 8, 8+shadow_y+y, w-8, h-8+shadow_y+y, r=18, fill=t["shadow"], outline="")
         round_rect(self, 8, 8+y, w-8, h-8+y, r=18, fill=t["panel"], outline=t["border"], width=1)
 
-        owned = self.app.has_item(self.item["id"])
+        count = self.app.item_count(self.item["id"])
+        consumable = self.item.get("consumable", False)
+        owned = count > 0 and not consumable
+        left = self.app.effects.remaining(self.item["id"]) if self.item.get("effect") else 0
 
         self.create_oval(22, 32+y, 64, 74+y, fill=t["bubble"], outline="")
         self.create_text(43, 53+y, text=self.item["emoji"], font=("Segoe UI Emoji", 16), fill=t["text"])
@@ -396,6 +3350,12 @@ class ShopItemCard(LiftCard):
         price_color = t["green"] if owned else t["text"]
         self.create_text(w-180, 55+y, text=price_text, anchor="w",
                          font=("Segoe UI", 11, "bold"), fill=price_color)
+        if left:
+            self.create_text(w-180, 76+y, text=f"Active · {int(left // 60) + 1} min left", anchor="w",
+                             font=("Segoe UI", 9), fill=t["green"])
+        elif consumable and count:
+            self.create_text(w-180, 76+y, text=f"You have {count}", anchor="w",
+                             font=("Segoe UI", 9), fill=t["green"])
 
         bx2 = w - 18
         bx1 = bx2 - 88
@@ -413,28 +3373,246 @@ class ShopItemCard(LiftCard):
                              font=("Segoe UI", 10, "bold"), fill="white")
 
 
+# ---------------- Pooled choice buttons ----------------
+class ChoiceButtons:
+    # Keeps a pool of tk.Buttons inside `parent` and reconfigures them between
+    # questions. Buttons are only created/destroyed when the number of choices
+    # changes, and only options that actually differ are pushed to Tk.
+    def __init__(self, parent, get_theme, columns=1, pady=10):
+        self.parent = parent
+        self.get_theme = get_theme
+        self.columns = max(1, int(columns))
+        self.pady = pady
+        self.buttons = []
+        self._opts = []  # last options applied per button
+        self._command = None
+        self.texts = []
+
+    def _make(self, idx):
+        t = self.get_theme()
+        b = tk.Button(
+            self.parent,
+            font=("Segoe UI", 11, "bold"),
+            bg=t["panel"], fg=t["text"],
+            activebackground=t["nav_hover"], activeforeground=t["text"],
+            relief="flat", cursor="hand2",
+            highlightbackground=t["border"], highlightthickness=1,
+            padx=12, pady=self.pady,
+            command=lambda i=idx: self._click(i)
+        )
+        if self.columns == 1:
+            b.grid(row=idx, column=0, sticky="ew", pady=6)
+        else:
+            col = idx % self.columns
+            padx = (0 if col == 0 else 6, 0 if col == self.columns - 1 else 6)
+            b.grid(row=idx // self.columns, column=col, sticky="ew", padx=padx, pady=6)
+        return b
+
+    def _click(self, idx):
+        if self._command is not None and idx < len(self.texts):
+            self._command(idx, self.texts[idx])
+
+    def _apply(self, idx, **opts):
+        last = self._opts[idx]
+        changed = {k: v for k, v in opts.items() if last.get(k) != v}
+        if changed:
+            self.buttons[idx].configure(**changed)
+            last.update(changed)
+
+    def set_choices(self, texts, command):
+        # command(idx, text) is called when a choice is clicked
+        t = self.get_theme()
+        self.texts = list(texts)
+        self._command = command
+
+        while len(self.buttons) < len(self.texts):
+            self.buttons.append(self._make(len(self.buttons)))
+            self._opts.append({})
+        while len(self.buttons) > len(self.texts):
+            self.buttons.pop().destroy()
+            self._opts.pop()
+
+        for idx, text in enumerate(self.texts):
+            self._apply(idx, text=text, state="normal", bg=t["panel"], fg=t["text"])
+
+    def style(self, idx, **opts):
+        if 0 <= idx < len(self.buttons):
+            self._apply(idx, **opts)
+
+    def reset_styles(self):
+        t = self.get_theme()
+        for idx in range(len(self.buttons)):
+            self._apply(idx, bg=t["panel"], fg=t["text"])
+
+    def set_state(self, state):
+        for idx in range(len(self.buttons)):
+            self._apply(idx, state=state)
+
+
+# ---------------- Leaderboard view ----------------
+class LeaderboardView(tk.Canvas):
+    # Virtualised list: a pool of row items sized to the window is re-labelled
+    # on scroll, so drawing cost depends on the height, not the board size.
+    ROW_H = 46
+    TOP = 64
+    FOOTER = 52
+
+    def __init__(self, parent, get_theme):
+        super().__init__(parent, highlightthickness=0)
+        self.get_theme = get_theme
+        self.board = None
+        self.title = ""
+        self.first = 0
+        self.scrollbar = None
+        self._slots = []  # [(rank_id, name_id, xp_id)]
+        self._footer_id = None
+
+        self.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.bind("<Button-5>", lambda e: self.scroll(3))
+        bind_resize_redraw(self)
+
+    def set_board(self, board, title):
+        self.board = board
+        self.title = title
+        self.first = 0
+        self.redraw()
+
+    def _visible(self):
+        return max(1, (self.winfo_height() - self.TOP - self.FOOTER) // self.ROW_H)
+
+    def _scroll_to(self, first):
+        total = len(self.board) if self.board is not None else 0
+        first = max(0, min(int(first), total - self._visible()))
+        if first != self.first:
+            self.first = first
+            self.refresh()
+
+    def scroll(self, rows):
+        self._scroll_to(self.first + rows)
+
+    def yview(self, *args):
+        # scrollbar protocol, in rows rather than canvas pixels
+        if not args or self.board is None:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * len(self.board))
+        elif args[0] == "scroll":
+            n = int(args[1])
+            if args[2] == "pages":
+                n *= self._visible()
+            self.scroll(n)
+
+    def redraw(self):
+        t = self.get_theme()
+        self.delete("all")
+        self._slots = []
+        w = max(1, self.winfo_width())
+        h = max(1, self.winfo_height())
+        self.configure(bg=t["bg"])
+        round_rect(self, 0, 0, w - 1, h - 1, r=18, fill=t["panel"], outline=t["border"], width=1)
+        self.create_text(24, 28, text=self.title, anchor="w", font=("Segoe UI", 16, "bold"), fill=t["text"])
+        self.create_line(18, h - self.FOOTER, w - 18, h - self.FOOTER, fill=t["border"])
+        self._footer_id = self.create_text(24, h - self.FOOTER // 2, anchor="w",
+                                           font=("Segoe UI", 11, "bold"), fill=t["green"])
+        self.refresh()
+
+    def refresh(self):
+        t = self.get_theme()
+        n = self._visible()
+        w = max(1, self.winfo_width())
+        while len(self._slots) < n:
+            y = self.TOP + self.ROW_H * len(self._slots) + self.ROW_H // 2
+            self._slots.append((
+                self.create_text(34, y, anchor="w", font=("Segoe UI", 12, "bold"), fill=t["muted"]),
+                self.create_text(100, y, anchor="w", font=("Segoe UI", 12, "bold"), fill=t["text"]),
+                self.create_text(w - 34, y, anchor="e", font=("Segoe UI", 11), fill=t["muted"]),
+            ))
+
+        rows = self.board.rows(self.first, self.first + n) if self.board is not None else []
+        for i, (rank_id, name_id, xp_id) in enumerate(self._slots):
+            if i >= len(rows):
+                for item in (rank_id, name_id, xp_id):
+                    self.itemconfigure(item, state="hidden")
+                continue
+            rank, name, xp, pid = rows[i]
+            self.itemconfigure(rank_id, text=str(rank), state="normal")
+            self.itemconfigure(name_id, text=name, state="normal",
+                               fill=t["green"] if pid == SELF_PROFILE else t["text"])
+            self.itemconfigure(xp_id, text=f"{xp:,} XP", state="normal")
+
+        if self.board is not None:
+            total = len(self.board)
+            rank = self.board.rank(SELF_PROFILE)
+            footer = (f"Your rank: #{rank:,} of {total:,}  ·  {self.board.xp(SELF_PROFILE):,} XP"
+                      if rank is not None else "")
+            self.itemconfigure(self._footer_id, text=footer)
+            if self.scrollbar is not None:
+                total = max(1, total)
+                self.scrollbar.set(self.first / total, min(1.0, (self.first + n) / total))
+
+
 # ---------------- Main App ----------------
 class DuoPluginApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, seed=None, budgets=PLUGIN_BUDGETS_FILE, data_file=DATA_FILE,
+                 answer_log_dir=ANSWER_LOG_DIR, phrase_index_file=PHRASE_INDEX_FILE, profiles_dir=PROFILES_DIR):
         super().__init__()
         self.title(PROJECT_NAME)
         self.geometry("1100x720")
         self.minsize(980, 620)
 
         # Data & state
-        self.data = load_data()
-        self.lessons = load_lessons("lessons")
+        self.trace = TRACE
+        self._trace_path = os.environ.get("QUADROLINGO_TRACE")  # Chrome trace written on close
+        if self._trace_path and not self.trace.enabled:
+            self.trace.enable()
+        started = time.perf_counter()
+        self.clock = CLOCK
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)  # lessons shuffle with this, so sessions replay
+        self.redraw_batcher = RedrawBatcher(self)
+        self.timers = TimerRegistry(self.clock)
+
+        profile = os.environ.get("QUADROLINGO_PROFILE")
+        self.profiler = PluginProfiler.load(budgets, trace_memory=profile == "1")
+        if profile:  # the hook walks the stack on every after(), so profiling runs only
+            self.profiler.install_after_hooks()
+        self._open_lesson = None  # (lesson id, view) while a lesson is shown
+        self.lesson_cards = {}  # lesson id -> card on a list page
+        self.sync = None  # SyncClient once _start_sync connects
+
+        self.data_file = data_file
+        self.data = load_data(data_file)
+        self.ledger = XPLedger(self.data, take_freeze=self._take_streak_freeze)
+        self.lessons = load_lessons("lessons", profiler=self.profiler)
+        self.motion = MotionQuality(reduced=self.data["settings"].get("reduced_motion", False))
+        self.srs = ReviewScheduler(self.data["srs"])
+        self._index_review_items()
+        self.answer_log = AnswerLog(answer_log_dir)
+        self.phrase_index = PhraseIndex.load(phrase_index_file)
+        self.search_index = LessonSearch()
+        self.search_index.update_from_lessons(self.lessons)
+        self.clips = ClipCache()
+        self.leaderboards = LocalLeaderboards(self._leaderboard_self, profiles_dir)
+        self.audio_sink = make_audio_sink(self.data["settings"].get("audio_sink", "auto"))
+        self._update_phrase_index()
+        self._answer_flush_id = None
         self.active_page = "learn"
         self.current_view = None  # placed frame
 
         # Economy
-        self.shop_items = [
-            {"id": "streak_freeze", "name": "Streak Freeze", "desc": "Miss a day without losing streak.", "price": 80, "emoji": "🧊"},
-            {"id": "heart_refill", "name": "Heart Refill", "desc": "More tries in tough lessons.", "price": 50, "emoji": "❤️"},
-            {"id": "double_xp", "name": "Double XP (1h)", "desc": "Earn 2× XP for one hour.", "price": 120, "emoji": "⚡"},
-            {"id": "sticker_pack", "name": "Sticker Pack", "desc": "Cosmetic reward. Pure vibes.", "price": 60, "emoji": "🎨"},
-            {"id": "owl_hat", "name": "Owl Hat", "desc": "A silly cosmetic. Big flex.", "price": 200, "emoji": "🎩"},
-        ]
+        self.catalog = ShopCatalog.load()
+        self.effects = EffectsEngine(self.data["effects"], root=self, on_expire=self._on_effects_expired)
+        if self.data.get("replica") is None:
+            self.replica = ProgressReplica.seed(self.data, self.data["device_id"], self.catalog)
+            self.data["replica"] = self.replica.state
+        else:
+            self.replica = ProgressReplica(self.data["replica"], self.data["device_id"])
+        self.replica.materialize(self.data)
+        # after the replica: a missed day can spend a streak freeze, which is recorded
+        if self.ledger.settle():
+            save_data(self.data, self.data_file)
+        self.shop_cards = {}  # item id -> card currently showing it
 
         # Animated header counters
         self.gem_anim = AnimatedInt(self.data["gems"])
@@ -487,16 +3665,79 @@ class DuoPluginApp(tk.Tk):
         self.show_page("learn", animate=False)
 
         # Toast (top)
-        self.toast = ToastBar(self, self.theme)
+        self.toast = ToastBar(self, self.theme, motion=self.motion)
         self.toast.place(x=0, y=-60, relwidth=1)
 
         # Periodic ticks
         self._ui_tick()
+        self._schedule_day_rollover()
+        self._start_sync()
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        if self.trace.enabled:
+            self.trace.add("startup", "app", started, time.perf_counter())
+
+    def on_close(self):
+        if self.sync is not None:
+            self.data["sync"]["pending"] = self.sync.close()
+            self.data["sync"]["seq"] = self.sync.seq
+        save_data(self.data, self.data_file)  # replica included, so the next merge starts from here
+        self.answer_log.flush()
+        self.audio_sink.stop()
+        self.clips.close()
+        if self._trace_path:
+            self.trace.export(self._trace_path)
+        self.destroy()
 
     def theme(self):
         name = self.data.get("settings", {}).get("theme", "light")
         return self.THEMES.get(name, self.THEMES["light"])
 
+    # ---------- Plugin helpers ----------
+    def choice_buttons(self, parent, columns=1, pady=10):
+        return ChoiceButtons(parent, self.theme, columns=columns, pady=pady)
+
+    def prefetch_clip(self, path):
+        # start decoding in the background; False if there is no such file
+        if not path or not os.path.exists(path):
+            return False
+        self.clips.prefetch(path)
+        return True
+
+    def play_clip(self, path):
+        # plays as soon as the clip is decoded (immediately if prefetched);
+        # returns False when the file does not exist so callers can fall back
+        if not path or not os.path.exists(path):
+            return False
+        fut = self.clips.prefetch(path)
+
+        def poll():
+            if not fut.done():
+                self.timers.after(self, 10, poll)
+                return
+            try:
+                clip = fut.result()
+            except Exception as e:
+                self.toast.show(f"Audio error: {e}", kind="error", duration=2.4)
+                return
+            self.audio_sink.play(clip)
+
+        poll()
+        return True
+
+    def story_book(self, path=None, text=None, page_chars=STORY_PAGE_CHARS):
+        return StoryBook(path=path, text=text, page_chars=page_chars)
+
+    def match_board(self, pairs, page_size=None, time_limit=None):
+        return MatchBoard(pairs, page_size=page_size, time_limit=time_limit,
+                          clock=self.clock.perf_counter, rng=self.rng)
+
+    def answer_checker(self, variants, max_typos=None):
+        # cached per variant list, so rebuilding a lesson reuses the precomputed forms
+        if isinstance(variants, str):
+            variants = [variants]
+        return _cached_checker(tuple(variants), max_typos)
+
     # ---------- Layout ----------
     def _build_layout(self):
         t = self.theme()
@@ -505,19 +3746,21 @@ class DuoPluginApp(tk.Tk):
         self.grid_rowconfigure(0, weight=1)
 
         # Sidebar
-        self.sidebar = tk.Frame(self, bg=t["panel"], highlightbackground=t["border"], highlightthickness=1)
+        # named widgets keep the paths a session recording refers to stable
+        self.sidebar = tk.Frame(self, name="sidebar", bg=t["panel"], highlightbackground=t["border"],
+                                highlightthickness=1)
         self.sidebar.grid(row=0, column=0, sticky="nsw")
         self.sidebar.grid_columnconfigure(0, weight=1)
         self.sidebar.grid_rowconfigure(98, weight=1)
 
         # Content
-        self.content = tk.Frame(self, bg=t["bg"])
+        self.content = tk.Frame(self, name="content", bg=t["bg"])
         self.content.grid(row=0, column=1, sticky="nsew")
         self.content.grid_columnconfigure(0, weight=1)
         self.content.grid_rowconfigure(0, weight=1)
 
         # Container for slide transitions
-        self.view_container = tk.Frame(self.content, bg=t["bg"])
+        self.view_container = tk.Frame(self.content, name="views", bg=t["bg"])
         self.view_container.grid(row=0, column=0, sticky="nsew")
         self.view_container.grid_columnconfigure(0, weight=1)
         self.view_container.grid_rowconfigure(0, weight=1)
@@ -543,12 +3786,12 @@ class DuoPluginApp(tk.Tk):
         nav.grid_columnconfigure(0, weight=1)
 
         self.nav = {}
-        self.nav["learn"] = SidebarButton(nav, self.theme, "Learn", "📚", lambda: self.show_page("learn"))
-        self.nav["practice"] = SidebarButton(nav, self.theme, "Practice", "🎯", lambda: self.show_page("practice"))
-        self.nav["stories"] = SidebarButton(nav, self.theme, "Stories", "📖", lambda: self.show_page("stories"))
-        self.nav["leaderboard"] = SidebarButton(nav, self.theme, "Leaderboard", "🏆", lambda: self.show_page("leaderboard"))
-        self.nav["shop"] = SidebarButton(nav, self.theme, "Shop", "🛍️", lambda: self.show_page("shop"))
-        self.nav["settings"] = SidebarButton(nav, self.theme, "Settings", "⚙️", lambda: self.show_page("settings"))
+        self.nav["learn"] = SidebarButton(nav, self.theme, "Learn", "📚", lambda: self.show_page("learn"), name="nav_learn")
+        self.nav["practice"] = SidebarButton(nav, self.theme, "Practice", "🎯", lambda: self.show_page("practice"), name="nav_practice")
+        self.nav["stories"] = SidebarButton(nav, self.theme, "Stories", "📖", lambda: self.show_page("stories"), name="nav_stories")
+        self.nav["leaderboard"] = SidebarButton(nav, self.theme, "Leaderboard", "🏆", lambda: self.show_page("leaderboard"), name="nav_leaderboard")
+        self.nav["shop"] = SidebarButton(nav, self.theme, "Shop", "🛍️", lambda: self.show_page("shop"), name="nav_shop")
+        self.nav["settings"] = SidebarButton(nav, self.theme, "Settings", "⚙️", lambda: self.show_page("settings"), name="nav_settings")
 
         order = ["learn", "practice", "stories", "leaderboard", "shop", "settings"]
         for i, key in enumerate(order):
@@ -566,8 +3809,8 @@ class DuoPluginApp(tk.Tk):
 
         tk.Label(bottom, text="Guest", bg=t["panel"], fg=t["text"],
                  font=("Segoe UI", 11, "bold")).grid(row=0, column=1, sticky="w")
-        self.profile_sub = tk.Label(bottom, text="Local profile", bg=t["panel"], fg=t["muted"],
-                                    font=("Segoe UI", 9))
+        self.profile_sub = tk.Label(bottom, text=self._streak_text(), bg=t["panel"], fg=t["muted"],
+                                    font=("Segoe UI", 9), justify="left")
         self.profile_sub.grid(row=1, column=1, sticky="w")
 
         self._set_nav_selected("learn")
@@ -580,12 +3823,15 @@ class DuoPluginApp(tk.Tk):
     def _build_pages(self):
         # Keep a dict of pages; rebuild when theme changes or plugins reload
         self.pages = {}
-        self.pages["learn"] = self._build_list_page(kind="learn", title="Learn", subtitle="Install more lessons in ./lessons")
-        self.pages["practice"] = self._build_list_page(kind="practice", title="Practice", subtitle="Drills & review (plugins too)")
-        self.pages["stories"] = self._build_list_page(kind="stories", title="Stories", subtitle="Reading & mini-stories (plugins too)")
-        self.pages["leaderboard"] = self._build_leaderboard_page()
-        self.pages["shop"] = self._build_shop_page()
-        self.pages["settings"] = self._build_settings_page()
+        self.pages["learn"] = self._build_list_page(kind="learn", title="Learn", subtitle="Install more lessons in ./lessons",
+                                                    name="page_learn")
+        self.pages["practice"] = self._build_list_page(kind="practice", title="Practice", subtitle="Drills & review (plugins too)",
+                                                       name="page_practice")
+        self.pages["stories"] = self._build_list_page(kind="stories", title="Stories", subtitle="Reading & mini-stories (plugins too)",
+                                                      name="page_stories")
+        self.pages["leaderboard"] = self._build_leaderboard_page(name="page_leaderboard")
+        self.pages["shop"] = self._build_shop_page(name="page_shop")
+        self.pages["settings"] = self._build_settings_page(name="page_settings")
 
     def _header(self, parent, title, subtitle):
         t = self.theme()
@@ -620,9 +3866,10 @@ class DuoPluginApp(tk.Tk):
         c._big_id = big_id
         return c
 
-    def _build_list_page(self, kind, title, subtitle):
+    @TRACE.span("_build_list_page")
+    def _build_list_page(self, kind, title, subtitle, name=None):
         t = self.theme()
-        page = tk.Frame(self.view_container, bg=t["bg"])
+        page = tk.Frame(self.view_container, name=name, bg=t["bg"])
         page.grid_rowconfigure(1, weight=1)
         page.grid_columnconfigure(0, weight=1)
 
@@ -640,6 +3887,11 @@ class DuoPluginApp(tk.Tk):
         tk.Label(top, text=f"{kind.capitalize()} content", bg=t["bg"], fg=t["text"],
                  font=("Segoe UI", 12, "bold")).grid(row=0, column=0, sticky="w")
 
+        search = tk.Entry(top, name="search", font=("Segoe UI", 11), bg=t["panel"], fg=t["text"],
+                          insertbackground=t["text"], relief="flat",
+                          highlightthickness=1, highlightbackground=t["border"], highlightcolor=t["blue"])
+        search.grid(row=1, column=0, columnspan=3, sticky="ew", pady=(8, 0), ipady=6)
+
         reload_btn = tk.Button(
             top, text="Reload plugins",
             command=self.reload_lessons,
@@ -650,7 +3902,19 @@ class DuoPluginApp(tk.Tk):
             highlightbackground=t["border"], highlightthickness=1,
             padx=12, pady=8
         )
-        reload_btn.grid(row=0, column=1, sticky="e")
+        reload_btn.grid(row=0, column=2, sticky="e")
+
+        if kind == "practice":
+            review_btn = tk.Button(
+                top, text="Review due items",
+                command=self.open_review_session,
+                font=("Segoe UI", 10, "bold"),
+                bg=t["green"], fg="white",
+                activebackground=t["green_dark"], activeforeground="white",
+                relief="flat", cursor="hand2",
+                padx=12, pady=8
+            )
+            review_btn.grid(row=0, column=1, sticky="e", padx=(0, 8))
 
         # Scroll
         canvas = tk.Canvas(body, bg=t["bg"], highlightthickness=0)
@@ -663,63 +3927,158 @@ class DuoPluginApp(tk.Tk):
         inner = tk.Frame(canvas, bg=t["bg"])
         win = canvas.create_window((0, 0), window=inner, anchor="nw")
 
-        inner.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.bind("<Configure>", lambda e: canvas.itemconfig(win, width=e.width))
+        bind_batched(inner, "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        bind_batched(canvas, "<Configure>", lambda e: canvas.itemconfig(win, width=e.width))
 
         entries = [l for l in self.lessons if l["meta"].get("kind", "learn") == kind]
+        for lid in [lid for lid, c in self.lesson_cards.items() if c.entry["meta"].get("kind", "learn") == kind]:
+            del self.lesson_cards[lid]  # this kind's previous page is being replaced
+        cards = []
         if not entries:
             tk.Label(inner,
                      text=f"No '{kind}' plugins found.\nAdd .py files to ./lessons with kind='{kind}'.",
                      bg=t["bg"], fg=t["muted"], font=("Segoe UI", 11)
-                     ).pack(anchor="w", pady=10)
+                     ).grid(row=0, column=0, sticky="w", pady=10)
         else:
+            inner.grid_columnconfigure(0, weight=1)
             for i, entry in enumerate(entries):
                 card = LessonCard(inner, self, entry, self.theme)
                 card.grid(row=i, column=0, sticky="ew", pady=8)
-                inner.grid_columnconfigure(0, weight=1)
+                cards.append((entry["meta"]["id"], card))
+                self.lesson_cards[entry["meta"]["id"]] = card
+
+        no_match = tk.Label(inner, text="No lessons match your search.",
+                            bg=t["bg"], fg=t["muted"], font=("Segoe UI", 11))
+        hidden = set()
+        last_query = [""]
+
+        def apply_filter():
+            query = search.get()
+            if query == last_query[0]:
+                return  # arrows, shift, ...
+            last_query[0] = query
+            ids = self.search_index.search(query)
+            shown = 0
+            # only touch cards whose visibility actually changes
+            for lid, card in cards:
+                visible = ids is None or lid in ids
+                if visible and card in hidden:
+                    hidden.discard(card)
+                    card.grid()
+                elif not visible and card not in hidden:
+                    hidden.add(card)
+                    card.grid_remove()
+                shown += visible
+            if cards and not shown:
+                no_match.grid(row=len(cards), column=0, sticky="w", pady=10)
+            else:
+                no_match.grid_remove()
+            canvas.yview_moveto(0)
+
+        bind_debounced(search, "<KeyRelease>", SEARCH_DEBOUNCE_MS, apply_filter)
 
         return page
 
-    def _build_leaderboard_page(self):
+    @TRACE.span("_build_leaderboard_page")
+    def _build_leaderboard_page(self, name=None):
         t = self.theme()
-        page = tk.Frame(self.view_container, bg=t["bg"])
-        page.grid_rowconfigure(1, weight=1)
+        page = tk.Frame(self.view_container, name=name, bg=t["bg"])
+        page.grid_rowconfigure(2, weight=1)
         page.grid_columnconfigure(0, weight=1)
 
-        self._header(page, "Leaderboard", "Weekly XP (local mock)")
+        self._header(page, "Leaderboard", "XP across local profiles and imported rosters")
+
+        tabs = tk.Frame(page, bg=t["bg"])
+        tabs.grid(row=1, column=0, sticky="ew", padx=18, pady=(0, 10))
+        self.leaderboard_tabs = {}
+        for col, (window, label) in enumerate(LEADERBOARD_WINDOWS):
+            b = tk.Button(
+                tabs, text=label,
+                command=lambda w=window: self.set_leaderboard_window(w),
+                font=("Segoe UI", 10, "bold"),
+                relief="flat", cursor="hand2",
+                highlightthickness=1, highlightbackground=t["border"],
+                padx=12, pady=6
+            )
+            b.grid(row=0, column=col, padx=(0, 8))
+            self.leaderboard_tabs[window] = b
+        tabs.grid_columnconfigure(len(LEADERBOARD_WINDOWS), weight=1)
+        tk.Button(
+            tabs, text="Import roster…",
+            command=self.import_roster,
+            font=("Segoe UI", 10, "bold"),
+            bg=t["panel"], fg=t["text"],
+            activebackground=t["nav_hover"], activeforeground=t["text"],
+            relief="flat", cursor="hand2",
+            highlightbackground=t["border"], highlightthickness=1,
+            padx=12, pady=6
+        ).grid(row=0, column=len(LEADERBOARD_WINDOWS) + 1, sticky="e")
 
         body = tk.Frame(page, bg=t["bg"])
-        body.grid(row=1, column=0, sticky="nsew", padx=18, pady=(0, 16))
+        body.grid(row=2, column=0, sticky="nsew", padx=18, pady=(0, 16))
         body.grid_columnconfigure(0, weight=1)
         body.grid_rowconfigure(0, weight=1)
 
-        card = tk.Canvas(body, bg=t["bg"], highlightthickness=0)
-        card.grid(row=0, column=0, sticky="nsew")
-        round_rect(card, 0, 0, 9999, 9999, r=18, fill=t["panel"], outline=t["border"], width=1)
-
-        your_xp = int(self.data["xp"])
-        rows = [
-            ("1", "Nova", max(1200, your_xp + 420)),
-            ("2", "Rin", max(980, your_xp + 210)),
-            ("3", "You", your_xp),
-            ("4", "Kai", max(420, your_xp - 180)),
-            ("5", "Mila", max(250, your_xp - 320)),
-        ]
-
-        card.create_text(24, 28, text="This week", anchor="w", font=("Segoe UI", 16, "bold"), fill=t["text"])
-        y = 78
-        for rank, name, xp in rows:
-            color = t["text"] if name != "You" else t["green"]
-            card.create_text(34, y, text=rank, anchor="w", font=("Segoe UI", 12, "bold"), fill=t["muted"])
-            card.create_text(70, y, text=name, anchor="w", font=("Segoe UI", 12, "bold"), fill=color)
-            card.create_text(300, y, text=f"{xp} XP", anchor="w", font=("Segoe UI", 11), fill=t["muted"])
-            y += 46
+        view = LeaderboardView(body, self.theme)
+        view.grid(row=0, column=0, sticky="nsew")
+        sb = ttk.Scrollbar(body, orient="vertical", command=view.yview)
+        sb.grid(row=0, column=1, sticky="ns")
+        view.scrollbar = sb
+        self.leaderboard_view = view
 
+        # the board itself is built when the page is first shown
+        self._style_leaderboard_tabs()
         return page
 
-    def _build_shop_page(self):
+    def _leaderboard_self(self, window):
+        if window == "week":
+            xp = self.ledger.week_xp()
+        elif window == "month":
+            xp = self.ledger.month_xp()
+        else:
+            xp = int(self.data["xp"])
+        return self.data["settings"].get("profile_name", "You"), xp
+
+    def _style_leaderboard_tabs(self):
         t = self.theme()
-        page = tk.Frame(self.view_container, bg=t["bg"])
+        current = self.data["settings"].get("leaderboard_window", "week")
+        for window, b in self.leaderboard_tabs.items():
+            on = window == current
+            b.configure(bg=t["green"] if on else t["panel"], fg="white" if on else t["text"],
+                        activebackground=t["green_dark"] if on else t["nav_hover"],
+                        activeforeground="white" if on else t["text"])
+
+    def _show_leaderboard(self):
+        window = self.data["settings"].get("leaderboard_window", "week")
+        title = dict(LEADERBOARD_WINDOWS).get(window, "This week")
+        self.leaderboard_view.set_board(self.leaderboards.board(window), title)
+
+    def set_leaderboard_window(self, window):
+        if window == self.data["settings"].get("leaderboard_window"):
+            return
+        self._set_setting("leaderboard_window", window)
+        save_data(self.data, self.data_file)
+        self._style_leaderboard_tabs()
+        self._show_leaderboard()
+
+    def import_roster(self):
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(parent=self, title="Import class roster",
+                                          filetypes=[("JSON", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.leaderboards.import_roster(path)
+        except (OSError, ValueError) as e:
+            self.toast.show(f"Roster import failed: {e}", kind="error", duration=3.0)
+            return
+        self._show_leaderboard()
+        self.toast.show("Roster imported.", kind="success", duration=1.8)
+
+    @TRACE.span("_build_shop_page")
+    def _build_shop_page(self, name=None):
+        t = self.theme()
+        page = tk.Frame(self.view_container, name=name, bg=t["bg"])
         page.grid_rowconfigure(1, weight=1)
         page.grid_columnconfigure(0, weight=1)
 
@@ -763,19 +4122,77 @@ class DuoPluginApp(tk.Tk):
 
         inner = tk.Frame(canvas, bg=t["bg"])
         win = canvas.create_window((0, 0), window=inner, anchor="nw")
-        inner.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.bind("<Configure>", lambda e: canvas.itemconfig(win, width=e.width))
+        bind_batched(inner, "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        bind_batched(canvas, "<Configure>", lambda e: canvas.itemconfig(win, width=e.width))
+
+        inner.grid_columnconfigure(0, weight=1)
+
+        # Filter + pooled cards: only the first `limit` matches get a card, and
+        # cards are re-pointed at other items instead of being recreated.
+        search = tk.Entry(inv, name="search", font=("Segoe UI", 11), bg=t["panel"], fg=t["text"],
+                          insertbackground=t["text"], relief="flat", width=28,
+                          highlightthickness=1, highlightbackground=t["border"], highlightcolor=t["blue"])
+        search.grid(row=0, column=1, rowspan=2, sticky="e", ipady=6)
+        count_lbl = tk.Label(inv, bg=t["bg"], fg=t["muted"], font=("Segoe UI", 9))
+        count_lbl.grid(row=2, column=1, sticky="e", pady=(4, 0))
+
+        cards = []
+        state = {"matches": self.catalog.items, "limit": SHOP_PAGE_SIZE}
+
+        def show_more():
+            state["limit"] += SHOP_PAGE_SIZE
+            render()
+
+        more_btn = tk.Button(
+            inner, text="Show more",
+            command=show_more,
+            font=("Segoe UI", 10, "bold"),
+            bg=t["panel"], fg=t["text"],
+            activebackground=t["nav_hover"], activeforeground=t["text"],
+            relief="flat", cursor="hand2",
+            highlightbackground=t["border"], highlightthickness=1,
+            padx=12, pady=8
+        )
 
-        for i, item in enumerate(self.shop_items):
-            card = ShopItemCard(inner, self, item, self.theme)
-            card.grid(row=i, column=0, sticky="ew", pady=8)
-            inner.grid_columnconfigure(0, weight=1)
+        def render():
+            shown = state["matches"][:state["limit"]]
+            self.shop_cards = {}
+            for i, item in enumerate(shown):
+                if i == len(cards):
+                    card = ShopItemCard(inner, self, item, self.theme, name=f"item_{i}")
+                    card.grid(row=i, column=0, sticky="ew", pady=8)
+                    cards.append(card)
+                else:
+                    card = cards[i]
+                    card.set_item(item)
+                    card.grid()
+                self.shop_cards[item["id"]] = card
+            for card in cards[len(shown):]:
+                card.grid_remove()
+            if len(state["matches"]) > len(shown):
+                more_btn.grid(row=len(cards), column=0, pady=8)
+            else:
+                more_btn.grid_remove()
+            count_lbl.configure(text=f"{len(shown)} of {len(state['matches'])} items")
+
+        def apply_filter():
+            matches = self.catalog.filter(search.get())
+            if matches is state["matches"]:
+                return
+            state["matches"] = matches
+            state["limit"] = SHOP_PAGE_SIZE
+            render()
+            canvas.yview_moveto(0)
+
+        bind_debounced(search, "<KeyRelease>", SEARCH_DEBOUNCE_MS, apply_filter)
+        render()
 
         return page
 
-    def _build_settings_page(self):
+    @TRACE.span("_build_settings_page")
+    def _build_settings_page(self, name=None):
         t = self.theme()
-        page = tk.Frame(self.view_container, bg=t["bg"])
+        page = tk.Frame(self.view_container, name=name, bg=t["bg"])
         page.grid_rowconfigure(1, weight=1)
         page.grid_columnconfigure(0, weight=1)
 
@@ -793,6 +4210,8 @@ class DuoPluginApp(tk.Tk):
                          font=("Segoe UI", 14, "bold"), fill=t["text"])
         card.create_text(24, 64, text="Theme", anchor="w",
                          font=("Segoe UI", 11), fill=t["muted"])
+        card.create_text(24, 92, text="Motion (animations adapt to this machine unless reduced)", anchor="w",
+                         font=("Segoe UI", 11), fill=t["muted"])
 
         # A simple toggle button (no ttk theme complexity)
         toggle = tk.Button(
@@ -809,9 +4228,37 @@ class DuoPluginApp(tk.Tk):
         toggle.grid(row=1, column=0, sticky="w", pady=(12, 0))
         self.settings_toggle_btn = toggle
 
-        hint = tk.Label(body, text="Theme is saved to user_data.json",
+        motion_btn = tk.Button(
+            body,
+            text=self._motion_toggle_text(),
+            command=self.toggle_reduced_motion,
+            font=("Segoe UI", 11, "bold"),
+            bg=t["panel"], fg=t["text"],
+            activebackground=t["nav_hover"], activeforeground=t["text"],
+            relief="flat", cursor="hand2",
+            highlightbackground=t["border"], highlightthickness=1,
+            padx=14, pady=10
+        )
+        motion_btn.grid(row=2, column=0, sticky="w", pady=(10, 0))
+        self.settings_motion_btn = motion_btn
+
+        goal_btn = tk.Button(
+            body,
+            text=self._goal_text(),
+            command=self.cycle_daily_goal,
+            font=("Segoe UI", 11, "bold"),
+            bg=t["panel"], fg=t["text"],
+            activebackground=t["nav_hover"], activeforeground=t["text"],
+            relief="flat", cursor="hand2",
+            highlightbackground=t["border"], highlightthickness=1,
+            padx=14, pady=10
+        )
+        goal_btn.grid(row=3, column=0, sticky="w", pady=(10, 0))
+        self.settings_goal_btn = goal_btn
+
+        hint = tk.Label(body, text="Theme, motion and daily goal are saved to user_data.json",
                         bg=t["bg"], fg=t["muted"], font=("Segoe UI", 10))
-        hint.grid(row=2, column=0, sticky="w", pady=(10, 0))
+        hint.grid(row=4, column=0, sticky="w", pady=(10, 0))
 
         return page
 
@@ -821,20 +4268,127 @@ class DuoPluginApp(tk.Tk):
             return
         self.active_page = page
         self._set_nav_selected(page)
+        if page == "leaderboard":
+            self._show_leaderboard()
         self._transition_to(self.pages[page], animate=animate)
 
+    @TRACE.span("open_lesson")
     def open_lesson(self, entry):
         # Build lesson frame
+        lid = entry["meta"]["id"]
         try:
-            frame = entry["build"](self.view_container, self, entry["meta"])
+            with self.profiler.measure(lid, "build"), self.trace.span("build", cat="plugin", lesson=lid):
+                frame = entry["build"](self.view_container, self, entry["meta"])
         except Exception as e:
             self.toast.show(f"Lesson error: {e}", kind="error", duration=3.2)
             return
+        if isinstance(frame, tk.Misc):
+            self.profiler.count_view(lid, frame)
+        self._open_lesson = (lid, frame)
+        self._transition_to(frame, animate=True)
+
+    def open_review_session(self):
+        session = self.srs.session(REVIEW_SESSION_SIZE)
+        if not session:
+            self.toast.show("Nothing due — come back later!", kind="info", duration=1.8)
+            return
+        try:
+            frame = self._build_review_session(session)
+        except Exception as e:
+            self.toast.show(f"Review error: {e}", kind="error", duration=3.2)
+            return
         self._transition_to(frame, animate=True)
 
+    def _build_review_session(self, session):
+        t = self.theme()
+        meta = {"id": "review_due", "title": "Review due items", "kind": "practice"}
+
+        frame = tk.Frame(self.view_container, bg=t["bg"])
+        frame.grid_columnconfigure(0, weight=1)
+
+        header = tk.Frame(frame, bg=t["bg"])
+        header.grid(row=0, column=0, sticky="ew", padx=18, pady=(16, 10))
+        header.grid_columnconfigure(1, weight=1)
+
+        tk.Button(
+            header, text="← Back", command=self.go_back,
+            font=("Segoe UI", 10, "bold"),
+            bg=t["panel"], fg=t["text"],
+            activebackground=t["nav_hover"], activeforeground=t["text"],
+            relief="flat", cursor="hand2",
+            highlightbackground=t["border"], highlightthickness=1,
+            padx=12, pady=8
+        ).grid(row=0, column=0, sticky="w")
+
+        tk.Label(header, text=meta["title"], bg=t["bg"], fg=t["text"],
+                 font=("Segoe UI", 18, "bold")).grid(row=0, column=1, sticky="w", padx=10)
+
+        card = tk.Frame(frame, bg=t["panel"], highlightbackground=t["border"], highlightthickness=1)
+        card.grid(row=1, column=0, sticky="ew", padx=18)
+        card.grid_columnconfigure(0, weight=1)
+
+        prompt = tk.Label(card, text="", bg=t["panel"], fg=t["muted"], font=("Segoe UI", 10))
+        prompt.grid(row=0, column=0, sticky="w", padx=16, pady=(14, 0))
+
+        question = tk.Label(card, text="", bg=t["panel"], fg=t["text"], font=("Segoe UI", 16, "bold"))
+        question.grid(row=1, column=0, sticky="w", padx=16, pady=(4, 12))
+
+        choices_frame = tk.Frame(card, bg=t["panel"])
+        choices_frame.grid(row=2, column=0, sticky="ew", padx=16, pady=(0, 14))
+        choices_frame.grid_columnconfigure(0, weight=1)
+
+        feedback = tk.Label(frame, text="", bg=t["bg"], fg=t["muted"], font=("Segoe UI", 11, "bold"))
+        feedback.grid(row=2, column=0, sticky="w", padx=18, pady=(12, 0))
+
+        choices = self.choice_buttons(choices_frame)
+        state = {"i": 0, "score": 0}
+
+        def render():
+            key, item = session[state["i"]]
+            prompt.config(text=item.get("prompt", "Pick the right answer:"))
+            question.config(text=item.get("q", ""))
+            options = list(item.get("choices") or [item["a"]] + self.distractors(item["a"], k=2))
+            self.rng.shuffle(options)
+            choices.set_choices(options, choose)
+            state["shown"] = self.clock.perf_counter()
+
+        def choose(idx, text):
+            key, item = session[state["i"]]
+            correct = text == item["a"]
+            lesson_id, item_id = key.split(":", 1)
+            self.record_answer({"id": lesson_id}, item_id, correct,
+                               latency=self.clock.perf_counter() - state["shown"])
+            if correct:
+                state["score"] += 1
+                feedback.config(text="✅ Correct!", fg=t["green"])
+                self.toast.show("Correct!", kind="success", duration=0.9)
+            else:
+                feedback.config(text=f"❌ Correct answer: {item['a']}", fg=t["red"])
+                self.toast.show("It will come back soon.", kind="warn", duration=0.9)
+
+            state["i"] += 1
+            if state["i"] >= len(session):
+                gems = 8 + 2 * state["score"]
+                xp = 8 + 3 * state["score"]
+                self.complete_lesson(meta, gems=gems, xp=xp,
+                                     message=f"Review done! {state['score']}/{len(session)}")
+            else:
+                render()
+
+        render()
+        return frame
+
     def go_back(self):
+        if self._open_lesson is not None:
+            lid, view = self._open_lesson
+            self._open_lesson = None
+            self.profiler.lesson_left(lid, view if isinstance(view, tk.Misc) else None)
+            card = self.lesson_cards.get(lid)
+            if card is not None and card.winfo_exists():
+                card.refresh_budget()
         self.show_page(self.active_page, animate=True)
 
+    @TRACE.span("_transition_to")
     def _transition_to(self, new_view, animate=True):
         # Place-based slide transition, eased
         self.view_container.update_idletasks()
@@ -850,21 +4404,22 @@ class DuoPluginApp(tk.Tk):
         new_view.place(in_=self.view_container, x=w, y=0, relwidth=1, relheight=1)
         self.current_view = new_view
 
-        if not animate:
+        dur = self.motion.slide_duration(0.24)
+        if not animate or dur <= 0:
             if old is not None:
-                old.place_forget()
+                self._retire_view(old)
             new_view.place_configure(x=0)
             return
 
-        t0 = time.time()
-        dur = 0.24
+        t0 = self.clock.time()
 
+        @self.trace.span("transition_frame")
         def step():
             nonlocal t0, dur, w, old, new_view
-            t = (time.time() - t0) / dur
+            t = (self.clock.time() - t0) / dur
             if t >= 1:
                 if old is not None:
-                    old.place_forget()
+                    self._retire_view(old)
                 new_view.place_configure(x=0)
                 return
             e = ease_out_quad(clamp01(t))
@@ -876,85 +4431,354 @@ class DuoPluginApp(tk.Tk):
                     old.place_configure(x=x_old)
                 except Exception:
                     pass
-            self.after(16, step)
+            self.timers.after(new_view, 16, step)
 
         step()
 
+    def _retire_view(self, view):
+        # pages are kept and reused; a lesson view is finished once it has slid
+        # out, and destroying it cancels any timers it still had pending
+        try:
+            view.place_forget()
+            if view not in self.pages.values():
+                view.destroy()
+        except tk.TclError:
+            pass  # already destroyed by a theme rebuild
+
     # ---------- Economy (no popups) ----------
+    @TRACE.span("complete_lesson")
     def complete_lesson(self, lesson_meta, gems=15, xp=10, message="Lesson completed!"):
         lid = lesson_meta.get("id", "unknown")
-        now = int(time.time())
-
-        comp = self.data["completed_lessons"].get(lid, {"times": 0, "last_completed": 0})
-        comp["times"] = int(comp.get("times", 0)) + 1
-        comp["last_completed"] = now
-        self.data["completed_lessons"][lid] = comp
-
-        self.data["gems"] = int(self.data["gems"]) + int(gems)
-        self.data["xp"] = int(self.data["xp"]) + int(xp)
-        save_data(self.data)
+        now = int(self.clock.time())
+
+        mult = self.effects.multiplier("xp_mult")
+        if mult != 1.0:
+            xp = int(round(int(xp) * mult))
+        self.ledger.record(xp, now)
+        self.leaderboards.record(int(xp), now)
+        self._record_progress("complete", lesson=lid)
+        self._record_progress("gems", n=int(gems))
+        self._record_progress("xp", n=int(xp))
+        save_data(self.data, self.data_file)
+        self._refresh_streak()
+        self._flush_answers()
 
         self.gem_anim.animate_to(self.data["gems"], duration=0.55)
         self.xp_anim.animate_to(self.data["xp"], duration=0.55)
 
-        self.toast.show(f"{message}  +{gems}💎  +{xp}⭐", kind="success", duration=2.6)
+        boost = f" ({mult:g}×)" if mult != 1.0 else ""
+        self.toast.show(f"{message}  +{gems}💎  +{xp}⭐{boost}", kind="success", duration=2.6)
 
         # Return to page
         self.go_back()
 
+    def record_answer(self, lesson_meta, item_id, correct, latency=None):
+        # called by lessons for every answer; buffered, flushed in batches
+        lid = lesson_meta.get("id", "unknown")
+        key = f"{lid}:{item_id}"
+        if key in self.srs.items:
+            self.srs.grade(key, correct)
+        pending = self.answer_log.record(lid, item_id, correct, latency=latency)
+        if pending >= ANSWER_LOG_FLUSH_ROWS:
+            self._schedule_answer_flush(0)
+        elif self._answer_flush_id is None:
+            self._schedule_answer_flush(ANSWER_LOG_FLUSH_MS)
+
+    def _schedule_answer_flush(self, delay_ms):
+        if self._answer_flush_id is not None:
+            self.timers.cancel(self._answer_flush_id)
+        if delay_ms:
+            self._answer_flush_id = self.timers.after(self, delay_ms, self._flush_answers)
+        else:
+            self._answer_flush_id = self.timers.after_idle(self, self._flush_answers)
+
+    def _flush_answers(self):
+        if self._answer_flush_id is not None:
+            self.timers.cancel(self._answer_flush_id)
+            self._answer_flush_id = None
+        self.answer_log.flush()
+
+    def distractors(self, answer, k=2, exclude=()):
+        return self.phrase_index.distractors(answer, k=k, exclude=exclude)
+
+    def _update_phrase_index(self):
+        if self.phrase_index.update_from_lessons(self.lessons):
+            self.phrase_index.save()
+
+    def _index_review_items(self):
+        self.srs.set_items(
+            (f"{entry['meta']['id']}:{item['id']}", item)
+            for entry in self.lessons
+            for item in entry.get("review_items", [])
+        )
+
+    def item_count(self, item_id):
+        return self.data["inventory"].get(item_id, 0)
+
     def has_item(self, item_id):
-        return item_id in set(self.data.get("owned_items", []))
+        return self.item_count(item_id) > 0
+
+    def consume_item(self, item_id):
+        # use up one owned consumable (streak freeze, heart refill, ...)
+        if self.item_count(item_id) <= 0:
+            return False
+        self._record_progress("use", item=item_id)
+        self._refresh_shop_ui(item_id)
+        return True
 
     def try_buy_item(self, item_id):
-        item = next((x for x in self.shop_items if x["id"] == item_id), None)
+        item = self.catalog.get(item_id)
         if item is None:
             self.toast.show("Item not found.", kind="error", duration=2.2)
             return
 
-        if self.has_item(item_id):
+        if not item.get("consumable") and self.has_item(item_id):
             self.toast.show("Already owned.", kind="info", duration=1.8)
             return
 
+        effect = item.get("effect")
+        if effect and self.has_item(item_id):
+            # bought before effects existed: use the stored one first
+            self.consume_item(item_id)
+            self._activate_effect(item)
+            return
+
         price = int(item["price"])
         if int(self.data["gems"]) < price:
             self.toast.show(f"Not enough gems. Need {price}💎.", kind="warn", duration=2.4)
             return
 
         # Buy
-        self.data["gems"] -= price
-        self.data["owned_items"].append(item_id)
-        save_data(self.data)
-
+        self._record_progress("gems", n=-price)
         self.gem_anim.animate_to(self.data["gems"], duration=0.35)
+        if effect:
+            self._activate_effect(item)
+            return
+        self._record_progress("buy", item=item_id)
+        save_data(self.data, self.data_file)
+
         self.toast.show(f"Purchased {item['name']} {item['emoji']}", kind="success", duration=2.2)
-        self._refresh_shop_ui()
+        self._refresh_shop_ui(item_id)
+
+    def _activate_effect(self, item):
+        effect = item["effect"]
+        mods = {k: v for k, v in effect.items() if k != "duration"}
+        duration = int(effect.get("duration", 3600))
+        e = self.effects.activate(item["id"], mods, duration)
+        self._record_progress("effect", item=item["id"], duration=duration)
+        save_data(self.data, self.data_file)
+        left = int(round((e["expires"] - self.effects.clock()) / 60))
+        self.toast.show(f"{item['name']} {item['emoji']} active — {left} min left", kind="success", duration=2.4)
+        self._refresh_shop_ui(item["id"])
+
+    def _on_effects_expired(self, expired):
+        # also called from EffectsEngine.__init__, before the UI exists
+        if not hasattr(self, "toast"):
+            return
+        save_data(self.data, self.data_file)
+        for e in expired:
+            item = self.catalog.get(e["id"])
+            self.toast.show(f"{item['name'] if item else e['id']} has worn off.", kind="info", duration=2.2)
+            self._refresh_shop_ui(e["id"])
+
+    # ---------- Sync ----------
+    def _start_sync(self):
+        spec = self.data["settings"].get("sync_server", "")
+        user = self.data["settings"].get("sync_user", "") or self.data["device_id"]
+        if not spec:
+            return
+        try:
+            host, port = parse_host_port(spec)
+        except ValueError:
+            self.toast.show(f"Bad sync server address: {spec}", kind="error", duration=3.0)
+            return
+        st = self.data["sync"]
+        # st["pending"] keeps every delta until the server answers for it, so
+        # a crash re-sends them (the server drops repeats by seq)
+        self.sync = SyncClient(host, port, user, self.data["device_id"], cursor=st["cursor"],
+                               seq=st["seq"], pending=list(st["pending"])).start()
+        self.timers.after(self, SYNC_POLL_MS, self._sync_poll)
+
+    def _record_progress(self, kind, **fields):
+        # every progress change goes to the mergeable replica and, if on, to
+        # sync; data's gems/xp/inventory/completed_lessons are read back from it
+        delta = {"type": kind, "ts": int(self.clock.time()), **fields}
+        self._apply_to_replica(delta, self.replica.device)
+        self.replica.materialize(self.data)
+        if self.sync is not None:
+            st = self.data["sync"]
+            st["pending"].append(self.sync.push(delta))
+            st["seq"] = self.sync.seq
+
+    def _apply_to_replica(self, d, device):
+        kind = d["type"]
+        if kind == "complete":
+            self.replica.complete(str(d["lesson"]), int(d["ts"]), device)
+        elif kind == "gems":
+            self.replica.add_gems(int(d["n"]), device)
+        elif kind == "xp":
+            self.replica.add_xp(int(d["n"]), device)
+        elif kind in ("buy", "use"):
+            item = self.catalog.get(d["item"])
+            if item is not None and not item.get("consumable"):
+                if kind == "buy":
+                    self.replica.add_item(d["item"], device)
+                else:
+                    self.replica.remove_item(d["item"])
+            else:
+                self.replica.add_stock(d["item"], 1 if kind == "buy" else -1, device)
+
+    def _set_setting(self, key, value):
+        self.data["settings"][key] = value
+        if key in SYNCED_SETTINGS:
+            self.replica.set_setting(key, value)
+
+    def _sync_poll(self):
+        changed = False
+        while True:
+            try:
+                deltas, cursor = self.sync.incoming.get_nowait()
+            except queue.Empty:
+                break
+            for d in deltas:
+                self._apply_remote(d)
+            changed = changed or bool(deltas)
+            self.data["sync"]["cursor"] = cursor
+        if changed:
+            self.replica.materialize(self.data)
+            self.ledger.settle()
+        st = self.data["sync"]
+        acked = self.sync.acked_seq
+        if st["pending"] and int(st["pending"][0].get("seq", 0)) <= acked:
+            st["pending"] = [d for d in st["pending"] if int(d.get("seq", 0)) > acked]
+        while True:
+            try:
+                deltas, error = self.sync.rejected.get_nowait()
+            except queue.Empty:
+                break
+            print(f"[sync] server rejected {len(deltas)} changes: {error}")
+            st["rejected"].extend(deltas)
+            del st["rejected"][:-SYNC_REJECTED_MAX]
+            changed = True
+            self.toast.show(f"Sync server rejected {len(deltas)} changes: {error}", kind="error", duration=3.0)
+        if changed:
+            save_data(self.data, self.data_file)
+            self.gem_anim.animate_to(self.data["gems"], duration=0.35)
+            self.xp_anim.animate_to(self.data["xp"], duration=0.35)
+            self._refresh_streak()
+            self._refresh_shop_ui()
+        self.timers.after(self, SYNC_POLL_MS, self._sync_poll)
+
+    def _apply_remote(self, d):
+        # progress made on another device
+        kind = d.get("type")
+        try:
+            if kind == "xp":
+                self.ledger.record(int(d["n"]), int(d["ts"]), settle=False)
+                self.leaderboards.record(int(d["n"]), int(d["ts"]))
+            elif kind == "effect":
+                # timed, so not part of the replica; skip ones already over
+                item = self.catalog.get(d["item"])
+                start, duration = int(d["ts"]), int(d["duration"])
+                if item is not None and item.get("effect") and start + duration > self.effects.clock():
+                    mods = {k: v for k, v in item["effect"].items() if k != "duration"}
+                    self.effects.activate(d["item"], mods, duration, now=start)
+                return
+            elif kind not in ("complete", "gems", "buy", "use"):
+                return
+            self._apply_to_replica(d, str(d.get("device") or "remote"))
+        except (KeyError, TypeError, ValueError) as e:
+            print("[sync] bad delta", d, e)
+
+    def _take_streak_freeze(self):
+        return self.consume_item("streak_freeze")
+
+    def _streak_text(self):
+        goal = int(self.data["settings"].get("daily_goal", 20))
+        today = self.ledger.day_xp()
+        mark = " ✓" if today >= goal else ""
+        return f"🔥 {self.ledger.streak()}-day streak\n{today}/{goal} XP today{mark}"
+
+    def _refresh_streak(self):
+        if hasattr(self, "profile_sub"):
+            try:
+                self.profile_sub.configure(text=self._streak_text())
+            except tk.TclError:
+                pass
+
+    def _schedule_day_rollover(self):
+        # wake just after local midnight to settle freezes and reset "today"
+        now = datetime.datetime.fromtimestamp(self.clock.time())
+        midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+        delay = int((midnight - now).total_seconds() * 1000) + 1000
+        self.timers.after(self, min(delay, 3600 * 1000), self._on_day_rollover)
+
+    def _on_day_rollover(self):
+        if self.ledger.settle():
+            save_data(self.data, self.data_file)
+        self._refresh_streak()
+        self._schedule_day_rollover()
 
     def _inventory_text(self):
-        if not self.data.get("owned_items"):
+        inv = self.data["inventory"]
+        if not inv:
             return "Empty — buy something fun!"
         names = []
-        for oid in self.data["owned_items"]:
-            it = next((x for x in self.shop_items if x["id"] == oid), None)
-            names.append(it["name"] if it else oid)
+        for oid, count in inv.items():
+            it = self.catalog.get(oid)
+            name = it["name"] if it else oid
+            names.append(f"{name} ×{count}" if count > 1 else name)
         return "• " + "\n• ".join(names)
 
-    def _refresh_shop_ui(self):
+    def _refresh_shop_ui(self, item_id=None):
         if hasattr(self, "inventory_lbl"):
             self.inventory_lbl.configure(text=self._inventory_text())
         if hasattr(self, "shop_balance_lbl"):
             self.shop_balance_lbl.configure(text=str(self.data["gems"]))
+        card = getattr(self, "shop_cards", {}).get(item_id)
+        if card is not None:
+            card.redraw()
 
     # ---------- Settings ----------
     def toggle_theme(self):
         cur = self.data["settings"]["theme"]
-        self.data["settings"]["theme"] = "dark" if cur == "light" else "light"
-        save_data(self.data)
+        self._set_setting("theme", "dark" if cur == "light" else "light")
+        save_data(self.data, self.data_file)
 
         # rebuild UI with new theme
         self.apply_theme_rebuild()
 
         self.toast.show(f"Theme set to {self.data['settings']['theme']}.", kind="info", duration=1.8)
 
+    def _goal_text(self):
+        return f"Daily goal: {self.data['settings'].get('daily_goal', 20)} XP"
+
+    def cycle_daily_goal(self):
+        goal = int(self.data["settings"].get("daily_goal", 20))
+        later = [g for g in DAILY_GOALS if g > goal]
+        self._set_setting("daily_goal", later[0] if later else DAILY_GOALS[0])
+        save_data(self.data, self.data_file)
+        if hasattr(self, "settings_goal_btn"):
+            self.settings_goal_btn.configure(text=self._goal_text())
+        self._refresh_streak()
+
+    def _motion_toggle_text(self):
+        if self.data["settings"].get("reduced_motion"):
+            return "Reduced motion: On"
+        return "Reduced motion: Off"
+
+    def toggle_reduced_motion(self):
+        reduced = not self.data["settings"].get("reduced_motion", False)
+        self._set_setting("reduced_motion", reduced)
+        self.motion.reduced = reduced
+        save_data(self.data, self.data_file)
+
+        if hasattr(self, "settings_motion_btn"):
+            self.settings_motion_btn.configure(text=self._motion_toggle_text())
+        self.toast.show("Reduced motion on." if reduced else f"Motion: auto ({self.motion.level}).",
+                        kind="info", duration=1.8)
+
+    @TRACE.span("apply_theme_rebuild")
     def apply_theme_rebuild(self):
         # Update root bg
         t = self.theme()
@@ -964,6 +4788,7 @@ class DuoPluginApp(tk.Tk):
         self.sidebar.configure(bg=t["panel"], highlightbackground=t["border"])
 
         # Destroy and rebuild pages (simplest reliable approach)
+        self.lesson_cards.clear()
         if hasattr(self, "pages"):
             for p in self.pages.values():
                 try:
@@ -991,12 +4816,20 @@ class DuoPluginApp(tk.Tk):
 
     # ---------- Plugins reload ----------
     def reload_lessons(self):
-        self.lessons = load_lessons("lessons")
+        self.lessons = load_lessons("lessons", profiler=self.profiler)
+        self._index_review_items()
+        self._update_phrase_index()
+        self.search_index.update_from_lessons(self.lessons)
+        self.leaderboards.reload()
         self.apply_theme_rebuild()
         self.toast.show("Plugins reloaded.", kind="info", duration=1.6)
 
     # ---------- UI Tick ----------
     def _ui_tick(self):
+        # traced only when a counter animates or the tick is slow, not ~60 idle spans a second
+        t0 = time.perf_counter() if self.trace.enabled else None
+        busy = self.gem_anim.running or self.xp_anim.running
+        self.motion.sample()
         gems_val = self.gem_anim.tick()
         xp_val = self.xp_anim.tick()
 
@@ -1016,10 +4849,302 @@ class DuoPluginApp(tk.Tk):
             except Exception:
                 pass
 
-        self.after(16, self._ui_tick)  # ~60fps
+        if t0 is not None:
+            t1 = time.perf_counter()
+            if busy or (t1 - t0) * 1000 >= TRACE_TICK_MIN_MS:
+                self.trace.add("ui_tick", "app", t0, t1)
+        self.timers.after(self, 16, self._ui_tick)  # ~60fps
 
 
-if __name__ == "__main__":
+# ---------------- Session recording ----------------
+SESSION_FORMAT = "quadrolingo-session"
+SESSION_EVENTS = ("<ButtonPress>", "<ButtonRelease>", "<KeyPress>", "<KeyRelease>",
+                  "<Enter>", "<Leave>", "<MouseWheel>")
+REPLAY_FRAME = 1 / 60  # virtual seconds per replayed frame
+REPLAY_TAIL = 1.0  # virtual seconds run after the last event so animations finish
+
+
+def session_summary(data):
+    # what a replay has to reproduce; timestamp free
+    return {
+        "gems": int(data.get("gems", 0)),
+        "xp": int(data.get("xp", 0)),
+        "completed": {lid: c.get("times", 0) for lid, c in sorted(data.get("completed_lessons", {}).items())},
+        "inventory": dict(sorted(data.get("inventory", {}).items())),
+    }
+
+
+class SessionRecorder:
+    # Logs every input event (widget path, position, button/key) against the
+    # app clock, plus the seed and the starting save, to a gzip'd JSON-lines
+    # file: header, one compact list per event, then a summary trailer.
+    def __init__(self, app):
+        self.app = app
+        app.update_idletasks()
+        self.start = app.clock.time()
+        self.header = {
+            "format": SESSION_FORMAT,
+            "version": 1,
+            "seed": app.seed,
+            "start": self.start,
+            "geometry": app.geometry().split("+")[0],
+            "lessons": [entry["meta"]["id"] for entry in app.lessons],
+            "data": json.loads(json.dumps(app.data)),
+        }
+        self.events = []  # [t, type, widget path, x, y, detail]
+        self._size = self.header["geometry"]
+        for sequence in SESSION_EVENTS:
+            app.bind_all(sequence, self._on_input, add="+")
+        app.bind("<Configure>", self._on_configure, add="+")
+
+    @property
+    def duration(self):
+        return self.app.clock.time() - self.start
+
+    def _on_input(self, e):
+        kind = str(e.type)
+        if kind in ("ButtonPress", "ButtonRelease"):
+            detail = e.num
+        elif kind in ("KeyPress", "KeyRelease"):
+            detail = e.keysym
+        elif kind == "MouseWheel":
+            detail = e.delta
+        else:
+            detail = None
+        x = e.x if isinstance(e.x, int) else 0
+        y = e.y if isinstance(e.y, int) else 0
+        self.events.append([round(self.duration, 4), kind, str(e.widget), x, y, detail])
+
+    def _on_configure(self, e):
+        # <Configure> on a toplevel also arrives for every child
+        if e.widget is not self.app:
+            return
+        size = f"{e.width}x{e.height}"
+        if size != self._size:
+            self._size = size
+            self.events.append([round(self.duration, 4), "Configure", ".", 0, 0, size])
+
+    def save(self, path):
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(self.header, ensure_ascii=False) + "\n")
+            for ev in self.events:
+                f.write(json.dumps(ev, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.write(json.dumps({"end": round(self.duration, 4),
+                                "summary": session_summary(self.app.data)}) + "\n")
+
+
+class SessionReplay:
+    # Re-runs a recording on a frozen clock: the app is built from the recorded
+    # save and seed, time only moves in fixed frames (timers fire on virtual
+    # time, including plugins' raw widget.after() calls), and each event is
+    # injected with event_generate at its recorded time into the widget at the
+    # recorded path. Every file the app writes (save, answer log, phrase
+    # index, rosters, audio) goes to a scratch directory passed to the app.
+    def __init__(self, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or not isinstance(lines[0], dict) or lines[0].get("format") != SESSION_FORMAT:
+            raise ValueError(f"{path} is not a QuadroLingo session recording")
+        self.header = lines[0]
+        self.trailer = lines[-1] if len(lines) > 1 and isinstance(lines[-1], dict) else {}
+        self.events = [ev for ev in lines[1:] if isinstance(ev, list)]
+
+    def run(self, headless=False, speed=0.0):
+        # speed 0 = as fast as possible, 1 = the recorded pace
+        scratch = tempfile.mkdtemp(prefix="ql_replay_")
+        data = json.loads(json.dumps(self.header["data"]))
+        data["settings"]["sync_server"] = ""  # never talk to a server from a replay
+        if data["settings"].get("audio_sink", "").startswith("file:"):
+            data["settings"]["audio_sink"] = "file:" + os.path.join(scratch, "played_audio")
+        if os.path.isdir(PROFILES_DIR):
+            # same leaderboard as the recording; roster imports stay in scratch
+            shutil.copytree(PROFILES_DIR, os.path.join(scratch, "profiles"))
+        paths = {"data_file": os.path.join(scratch, "user_data.json"),
+                 "answer_log_dir": os.path.join(scratch, "answer_log"),
+                 "phrase_index_file": os.path.join(scratch, "phrase_index.jsonl"),
+                 "profiles_dir": os.path.join(scratch, "profiles")}
+        save_data(data, paths["data_file"])
+        CLOCK.freeze(self.header["start"])
+        random.seed(self.header["seed"])  # plugins that still use the module-level random
+        app = None
+        with frozen_widget_after():
+            try:
+                app = DuoPluginApp(seed=self.header["seed"], **paths)
+                if headless:
+                    app.withdraw()
+                app.geometry(self.header["geometry"])
+                app.update()
+                missing = [lid for lid in self.header.get("lessons", ())
+                           if lid not in {e["meta"]["id"] for e in app.lessons}]
+
+                t0 = time.perf_counter()
+                missed = 0
+                for ev in self.events:
+                    self._run_until(app, self.header["start"] + ev[0], speed)
+                    if not self._inject(app, ev):
+                        missed += 1
+                    app.update()
+                self._run_until(app, CLOCK.time() + REPLAY_TAIL, speed)
+                summary = session_summary(app.data)
+                return {
+                    "events": len(self.events),
+                    "missed": missed,
+                    "missing_lessons": missing,
+                    "virtual_s": round(CLOCK.time() - self.header["start"], 3),
+                    "wall_s": round(time.perf_counter() - t0, 3),
+                    "summary": summary,
+                    "matches": summary == self.trailer.get("summary", summary),
+                }
+            finally:
+                if app is not None:
+                    app.on_close()
+                CLOCK.thaw()
+                shutil.rmtree(scratch, ignore_errors=True)
+
+    def _run_until(self, app, due, speed):
+        while due - CLOCK.time() > 1e-6:
+            step = min(REPLAY_FRAME, due - CLOCK.time())
+            app.timers.advance(step)
+            app.update()
+            if speed > 0:
+                time.sleep(step / speed)
+
+    def _inject(self, app, ev):
+        _, kind, path, x, y, detail = ev
+        if kind == "Configure":
+            app.geometry(detail)
+            return True
+        try:
+            w = app.nametowidget(path)
+        except KeyError:
+            return False  # the UI diverged from the recording
+        if not w.winfo_exists():
+            return False
+        opts = {"x": x, "y": y}
+        if kind in ("ButtonPress", "ButtonRelease"):
+            opts["button"] = detail
+        elif kind in ("KeyPress", "KeyRelease"):
+            opts["keysym"] = detail
+            if app.focus_get() is not w:
+                w.focus_set()
+        elif kind == "MouseWheel":
+            opts["delta"] = detail
+        w.event_generate(f"<{kind}>", **opts)
+        return True
+
+
+def run_sync_server(argv):
+    parser = argparse.ArgumentParser(prog="Main.py sync-server",
+                                     description="Serve progress sync for QuadroLingo clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SYNC_PORT)
+    parser.add_argument("--data", default="sync_data", help="journal directory")
+    args = parser.parse_args(argv)
+
+    server = SyncServer(args.host, args.port, args.data)
+    print(f"[sync] serving on {args.host}:{args.port}, journal in {args.data}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+def run_merge(argv):
+    parser = argparse.ArgumentParser(prog="Main.py merge",
+                                     description=f"Merge other saved progress files into {DATA_FILE}.")
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+
+    data = merge_progress_files(args.files, catalog=ShopCatalog.load())
+    print(f"[merge] {len(args.files)} file(s) merged: {data['xp']} XP, {data['gems']} gems, "
+          f"{len(data['completed_lessons'])} lessons")
+
+
+def run_export(argv):
+    parser = argparse.ArgumentParser(prog="Main.py export",
+                                     description="Stream learner profiles as NDJSON.")
+    parser.add_argument("-o", "--output", default="-", help="file to write (default: stdout)")
+    parser.add_argument("--profiles", default=PROFILES_DIR)
+    parser.add_argument("--no-self", action="store_true", help="skip this install's own learner")
+    args = parser.parse_args(argv)
+
+    data = None if args.no_self else load_data()
+    if args.output == "-":
+        n = export_profiles(sys.stdout, args.profiles, data)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="\n") as out:
+            n = export_profiles(out, args.profiles, data)
+    print(f"[export] {n} profiles", file=sys.stderr)
+
+
+def run_import(argv):
+    parser = argparse.ArgumentParser(prog="Main.py import",
+                                     description="Import NDJSON learner profiles into ./profiles.")
+    parser.add_argument("file")
+    parser.add_argument("--profiles", default=PROFILES_DIR)
+    parser.add_argument("--batch", type=int, default=IMPORT_BATCH)
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    last = [0.0]
+
+    def report(state):
+        now = time.perf_counter()
+        if now - last[0] < 0.25 and state["offset"] < state["size"]:
+            return
+        last[0] = now
+        pct = 100.0 * state["offset"] / max(1, state["size"])
+        rate = state["offset"] / max(1e-9, now - t0) / 1e6
+        print(f"\r[import] {pct:5.1f}%  {state['imported']:,} profiles  "
+              f"{state['invalid']:,} invalid  {rate:.1f} MB/s", end="", file=sys.stderr, flush=True)
+
+    state = import_profiles(args.file, args.profiles, max(1, args.batch), resume=not args.restart, report=report)
+    print(file=sys.stderr)
+    for err in state["errors"]:
+        print(f"[import] {err}", file=sys.stderr)
+    print(f"[import] done: {state['imported']:,} profiles in {state['files']} files, "
+          f"{state['duplicates']:,} repeated ids merged, "
+          f"{state['invalid']:,} invalid lines, {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+
+
+def run_profile_plugins(argv):
+    parser = argparse.ArgumentParser(prog="Main.py profile-plugins",
+                                     description="Measure every lesson plugin against its performance budget.")
+    parser.add_argument("--json", help="write the full report here")
+    parser.add_argument("--build", action="store_true",
+                        help="also open each lesson in a real window (needs a display)")
+    parser.add_argument("--budgets", default=PLUGIN_BUDGETS_FILE)
+    args = parser.parse_args(argv)
+
+    if args.build:
+        os.environ["QUADROLINGO_PROFILE"] = "1"
+        app = DuoPluginApp(budgets=args.budgets)
+        app.withdraw()
+        for entry in app.lessons:
+            app.open_lesson(entry)
+            app.update()
+            app.go_back()
+            app.update()
+        profiler = app.profiler
+        app.destroy()
+    else:
+        profiler = PluginProfiler.load(args.budgets, trace_memory=True)
+        load_lessons("lessons", profiler=profiler)
+
+    report = profiler.report()
+    failed = 0
+    for lid, r in report["plugins"].items():
+        flag = "FAIL" if r["violations"] else "ok"
+        failed += bool(r["violations"])
+        metrics = "  ".join(f"{m}={r[m]:g}" for m in PLUGIN_BUDGETS if m in r)
+        print(f"{flag:<4}  {lid:<28} {metrics}")
+    if args.json:
+        profiler.write_report(args.json)
+    return 1 if failed else 0
+
+
+def _use_clam_style():
     # ttk just for scrollbar; keep it minimal
     style = ttk.Style()
     try:
@@ -1027,5 +5152,72 @@ if __name__ == "__main__":
     except tk.TclError:
         pass
 
+
+def run_record(argv):
+    parser = argparse.ArgumentParser(prog="Main.py record",
+                                     description="Run the app and record the session for replay.")
+    parser.add_argument("file", help="recording to write (gzip'd JSON lines, e.g. bug.qlrec)")
+    parser.add_argument("--seed", type=int, help="seed for lesson shuffles (default: random)")
+    args = parser.parse_args(argv)
+
+    _use_clam_style()
+    app = DuoPluginApp(seed=args.seed)
+    recorder = SessionRecorder(app)
+    app.mainloop()
+    recorder.save(args.file)
+    print(f"[record] {len(recorder.events)} events over {recorder.duration:.0f} s, seed {app.seed} -> {args.file}")
+
+
+def run_replay(argv):
+    parser = argparse.ArgumentParser(prog="Main.py replay",
+                                     description="Replay a recorded session deterministically.")
+    parser.add_argument("file")
+    parser.add_argument("--headless", action="store_true",
+                        help="keep the window unmapped (Tk still needs a display, e.g. xvfb-run)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="1 = recorded pace, 2 = twice as fast, 0 = as fast as possible (default)")
+    parser.add_argument("--json", help="write the replay report here")
+    parser.add_argument("--trace", help="write a Chrome trace of the replay here")
+    args = parser.parse_args(argv)
+
+    _use_clam_style()
+    if args.trace:
+        TRACE.enable()
+    r = SessionReplay(args.file).run(headless=args.headless, speed=args.speed)
+    if args.trace:
+        TRACE.export(args.trace)
+    print(f"[replay] {r['events']} events ({r['missed']} missed), {r['virtual_s']:.1f} s of session "
+          f"in {r['wall_s']:.2f} s")
+    if r["missing_lessons"]:
+        print(f"[replay] lessons missing from this install: {', '.join(r['missing_lessons'])}")
+    print(f"[replay] {r['summary']['xp']} XP, {r['summary']['gems']} gems, "
+          f"{'matches' if r['matches'] else 'DIFFERS FROM'} the recording")
+    if args.json:
+        _write_json_atomic(args.json, r)
+    return 0 if r["matches"] else 1
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "profile-plugins":
+        return run_profile_plugins(argv[1:])
+    if argv and argv[0] == "sync-server":
+        return run_sync_server(argv[1:])
+    if argv and argv[0] == "merge":
+        return run_merge(argv[1:])
+    if argv and argv[0] == "export":
+        return run_export(argv[1:])
+    if argv and argv[0] == "import":
+        return run_import(argv[1:])
+    if argv and argv[0] == "record":
+        return run_record(argv[1:])
+    if argv and argv[0] == "replay":
+        return run_replay(argv[1:])
+
+    _use_clam_style()
     app = DuoPluginApp()
     app.mainloop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import ChoiceButtons  # noqa: E402
+
+
+# Per-question render cost: old destroy/recreate approach vs pooled buttons.
+# Run under a real or virtual display (e.g. `xvfb-run python benchmarks/bench_choice_buttons.py`).
+
+THEME = {
+    "panel": "#FFFFFF", "text": "#1F2A37", "nav_hover": "#F3F4F6", "border": "#E5E7EB",
+}
+
+QUESTIONS = [
+    ["Hello!", "Goodbye!"],
+    ["I would like…", "No way.", "Thanks!"],
+    ["The bill, please.", "The table, please."],
+    ["Good morning!", "Good night!", "Thanks!", "Please."],
+]
+
+
+def render_recreate(frame, texts):
+    for w in frame.winfo_children():
+        w.destroy()
+    for idx, text in enumerate(texts):
+        b = tk.Button(
+            frame, text=text,
+            font=("Segoe UI", 11, "bold"),
+            bg=THEME["panel"], fg=THEME["text"],
+            activebackground=THEME["nav_hover"], activeforeground=THEME["text"],
+            relief="flat", cursor="hand2",
+            highlightbackground=THEME["border"], highlightthickness=1,
+            padx=12, pady=10
+        )
+        b.grid(row=idx, column=0, sticky="ew", pady=6)
+        b.configure(command=lambda: None)
+
+
+def bench(root, label, render, n):
+    frame = tk.Frame(root)
+    frame.pack(fill="both", expand=True)
+    root.update()
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        render(frame, QUESTIONS[i % len(QUESTIONS)])
+        root.update_idletasks()
+    dt = time.perf_counter() - t0
+
+    frame.destroy()
+    print(f"{label:<12} {n} questions  {dt * 1000 / n:8.3f} ms/question")
+    return dt / n
+
+
+def main(n=2000):
+    root = tk.Tk()
+    root.geometry("600x400")
+
+    pool_holder = {}
+
+    def render_pooled(frame, texts):
+        pool = pool_holder.get(frame)
+        if pool is None:
+            pool = pool_holder[frame] = ChoiceButtons(frame, lambda: THEME)
+        pool.set_choices(texts, lambda idx, text: None)
+
+    old = bench(root, "recreate", render_recreate, n)
+    new = bench(root, "pooled", render_pooled, n)
+    print(f"speedup      {old / new:8.2f}x")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Main  # noqa: E402
+
+
+# Frame time while the window edge is dragged continuously, with N lesson cards
+# on the Learn page. Run under a real or virtual display
+# (e.g. `xvfb-run python benchmarks/bench_resize.py 1000`).
+
+PLUGIN_TEMPLATE = '''import tkinter as tk
+
+LESSON_META = {{
+    "id": "bench_{i:05d}",
+    "title": "Bench lesson {i}",
+    "subtitle": "Synthetic card for resize benchmarks",
+    "emoji": "📘",
+    "kind": "learn",
+    "order": {i}
+}}
+
+def build(parent, app, meta):
+    return tk.Frame(parent)
+'''
+
+
+def make_install(n):
+    tmp = tempfile.mkdtemp(prefix="ql_resize_")
+    lessons = os.path.join(tmp, "lessons")
+    os.makedirs(lessons)
+    for i in range(n):
+        with open(os.path.join(lessons, f"bench_{i:05d}.py"), "w", encoding="utf-8") as f:
+            f.write(PLUGIN_TEMPLATE.format(i=i))
+    return tmp
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def main(n=1000, steps=240):
+    os.chdir(make_install(n))
+
+    redraws = {"n": 0}
+    orig = Main.LessonCard.redraw
+
+    def counting_redraw(self):
+        redraws["n"] += 1
+        orig(self)
+
+    Main.LessonCard.redraw = counting_redraw
+
+    app = Main.DuoPluginApp()
+    app.geometry("1100x720")
+    app.update()
+    redraws["n"] = 0
+
+    frames = []
+    t_start = time.perf_counter()
+    for i in range(steps):
+        # drag the right edge back and forth by a few pixels per frame
+        w = 1100 + (i % 60) * 4 if (i // 60) % 2 == 0 else 1340 - (i % 60) * 4
+        app.geometry(f"{w}x720")
+        t0 = time.perf_counter()
+        app.update()
+        frames.append(time.perf_counter() - t0)
+        # keep to a ~60 Hz drag so batching behaves as it would for a user
+        remaining = 0.016 - (time.perf_counter() - t0)
+        if remaining > 0:
+            time.sleep(remaining)
+    total = time.perf_counter() - t_start
+
+    print(f"cards            {n}")
+    print(f"resize steps     {steps}  ({total:.2f} s)")
+    print(f"frame p50        {percentile(frames, 50) * 1000:8.2f} ms")
+    print(f"frame p95        {percentile(frames, 95) * 1000:8.2f} ms")
+    print(f"frame max        {max(frames) * 1000:8.2f} ms")
+    print(f"card redraws     {redraws['n']}  ({redraws['n'] / steps:.1f} per step)")
+    print(f"batched flushes  {app.redraw_batcher.flushes}")
+    app.destroy()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
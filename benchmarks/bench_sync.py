@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Main  # noqa: E402
+
+
+# Load test for the sync service: many simulated clients (each its own
+# background thread and connection) push progress deltas to one in-process
+# server and pull each other's changes until every device has converged.
+#
+#   python benchmarks/bench_sync.py [clients] [deltas_per_client] [devices_per_user]
+
+
+class TimedClient(Main.SyncClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_times = []
+        self.received = 0
+
+    def _round(self, f):
+        t0 = time.perf_counter()
+        super()._round(f)
+        self.round_times.append(time.perf_counter() - t0)
+
+    def drain(self):
+        while True:
+            try:
+                deltas, _cursor = self.incoming.get_nowait()
+            except queue.Empty:
+                return
+            self.received += len(deltas)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def idle_round_trips(host, port, user, cursor, n=200):
+    # sequential pulls on a quiet server: the latency floor for one round
+    times = []
+    with socket.create_connection((host, port)) as sock:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        f = sock.makefile("rwb")
+        for i in range(n):
+            t0 = time.perf_counter()
+            f.write((json.dumps({"id": i, "op": "pull", "user": user, "cursor": cursor}) + "\n").encode())
+            f.flush()
+            f.readline()
+            times.append(time.perf_counter() - t0)
+    return times
+
+
+def main(clients=300, per_client=200, devices_per_user=5, journal=True):
+    data_dir = tempfile.mkdtemp(prefix="ql_sync_") if journal else None
+    server = Main.SyncServerThread(data_dir=data_dir).start()
+    host, port = server.address
+
+    fleet = []
+    for i in range(clients):
+        user = f"learner{i // devices_per_user:04d}"
+        c = TimedClient(host, port, user, f"dev{i:05d}", batch_ms=50).start()
+        fleet.append(c)
+
+    t0 = time.perf_counter()
+    for n in range(per_client):
+        for i, c in enumerate(fleet):
+            c.push({"type": "xp", "ts": int(time.time()), "n": 10})
+        if n % 20 == 19:
+            time.sleep(0.01)  # deltas trickle in rather than arriving as one burst
+    pushed = time.perf_counter() - t0
+
+    expected_remote = per_client * (devices_per_user - 1)
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        for c in fleet:
+            c.drain()
+        if all(c.acked == per_client and c.received >= expected_remote for c in fleet):
+            break
+        time.sleep(0.05)
+    total = time.perf_counter() - t0
+
+    converged = sum(c.acked == per_client and c.received >= expected_remote for c in fleet)
+    rounds = [t for c in fleet for t in c.round_times]
+    for c in fleet:
+        c.close()
+    idle = idle_round_trips(host, port, fleet[0].user, fleet[0].cursor)
+    server.stop()
+
+    deltas = clients * per_client
+    print(f"clients          {clients}  ({clients // devices_per_user} users x {devices_per_user} devices)")
+    print(f"deltas pushed    {deltas}  (queued in {pushed:.2f} s)")
+    print(f"converged        {converged}/{clients} clients in {total:.2f} s")
+    print(f"throughput       {deltas / total:,.0f} deltas/s")
+    print(f"server requests  {server.server.requests}")
+    print(f"round trip p50   {percentile(rounds, 50) * 1000:8.2f} ms")
+    print(f"round trip p95   {percentile(rounds, 95) * 1000:8.2f} ms")
+    print(f"round trip p99   {percentile(rounds, 99) * 1000:8.2f} ms  (under load, GIL shared with clients)")
+    print(f"idle round trip  {percentile(idle, 50) * 1000:8.2f} ms p50")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    main(*args)
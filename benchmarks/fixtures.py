@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Main  # noqa: E402
+
+
+# Synthetic installs at scale: N lesson plugins of every kind, a learner with a
+# long history and a roster of classmates for the leaderboard.
+#
+#   python benchmarks/fixtures.py OUT_DIR [--per-kind 2000] [--events 200000] [--profiles 5000]
+#
+# The plugins name their widgets (back, question, choices) so the scripted
+# load test in ui_load.py can find and drive them.
+
+KINDS = ("learn", "practice", "stories")
+
+WORDS = ("apple", "bread", "coffee", "station", "ticket", "window", "river", "market",
+         "garden", "letter", "morning", "evening", "friend", "teacher", "bridge", "doctor")
+
+PLUGIN_TEMPLATE = '''import tkinter as tk
+
+LESSON_META = {meta}
+
+REVIEW_ITEMS = {items}
+
+STORY = {story}
+
+
+def build(parent, app, meta):
+    t = app.theme()
+    frame = tk.Frame(parent, bg=t["bg"])
+    frame.grid_columnconfigure(0, weight=1)
+
+    header = tk.Frame(frame, bg=t["bg"])
+    header.grid(row=0, column=0, sticky="ew", padx=18, pady=(16, 10))
+    tk.Button(header, name="back", text="← Back", command=app.go_back,
+              bg=t["panel"], fg=t["text"], relief="flat", padx=12, pady=8).grid(row=0, column=0)
+    tk.Label(header, text=meta["title"], bg=t["bg"], fg=t["text"],
+             font=("Segoe UI", 18, "bold")).grid(row=0, column=1, padx=10)
+
+    if STORY:
+        tk.Label(frame, text=STORY, bg=t["bg"], fg=t["text"], wraplength=560, justify="left",
+                 font=("Segoe UI", 12)).grid(row=1, column=0, sticky="w", padx=18)
+    question = tk.Label(frame, name="question", text="", bg=t["bg"], fg=t["text"],
+                        font=("Segoe UI", 16, "bold"))
+    question.grid(row=2, column=0, sticky="w", padx=18, pady=8)
+    choices_frame = tk.Frame(frame, name="choices", bg=t["bg"])
+    choices_frame.grid(row=3, column=0, sticky="ew", padx=18)
+    choices_frame.grid_columnconfigure(0, weight=1)
+
+    choices = app.choice_buttons(choices_frame)
+    state = {{"i": 0, "score": 0}}
+
+    def render():
+        item = REVIEW_ITEMS[state["i"]]
+        question.config(text=item["q"])
+        choices.set_choices(item["choices"], choose)
+        state["shown"] = app.clock.perf_counter()
+
+    def choose(idx, text):
+        if state["i"] >= len(REVIEW_ITEMS):
+            return
+        item = REVIEW_ITEMS[state["i"]]
+        correct = text == item["a"]
+        app.record_answer(meta, item["id"], correct, latency=app.clock.perf_counter() - state["shown"])
+        state["score"] += correct
+        state["i"] += 1
+        if state["i"] >= len(REVIEW_ITEMS):
+            app.complete_lesson(meta, gems=10 + 2 * state["score"], xp=10 + 2 * state["score"])
+            return
+        render()
+
+    render()
+    return frame
+'''
+
+
+def plugin_source(kind, i, rng):
+    meta = {
+        "id": f"fx_{kind}_{i:05d}",
+        "title": f"{kind.title()} {i}: {rng.choice(WORDS)} and {rng.choice(WORDS)}",
+        "subtitle": "Synthetic lesson for load tests",
+        "emoji": {"learn": "📘", "practice": "🎯", "stories": "📖"}[kind],
+        "kind": kind,
+        "order": i,
+    }
+    items = []
+    for q in range(rng.randint(3, 6)):
+        words = rng.sample(WORDS, 3)
+        items.append({"id": f"q{q}", "q": f"Which one is '{words[0]}'?", "a": words[0],
+                      "choices": rng.sample(words, 3)})
+    story = " ".join(rng.choice(WORDS) for _ in range(60)) if kind == "stories" else ""
+    return PLUGIN_TEMPLATE.format(meta=json.dumps(meta, ensure_ascii=False, indent=4),
+                                  items=json.dumps(items, indent=4), story=repr(story))
+
+
+def xp_history(rng, n, end):
+    # n events spread over the last n/20 days, a few sessions a day
+    events = []
+    ts = end - n * 4320
+    for _ in range(n):
+        ts += rng.randint(60, 8580)
+        ts = min(ts, end)
+        events.append([ts, rng.choice((5, 10, 15, 20, 30)), Main.local_day(ts)])
+    return events
+
+
+def make_user_data(rng, lesson_ids, events, end):
+    data = Main.upgrade_data({})
+    data["xp_events"] = xp_history(rng, events, end)
+    data["xp"] = sum(e[1] for e in data["xp_events"])
+    data["gems"] = 10 ** 7  # enough to keep buying during a load test
+    for lid in rng.sample(lesson_ids, min(len(lesson_ids), events // 20)):
+        data["completed_lessons"][lid] = {"times": rng.randint(1, 9),
+                                          "last_completed": end - rng.randint(0, 90 * 86400)}
+        for q in range(3):
+            data["srs"][f"{lid}:q{q}"] = [2.5, rng.randint(1, 40), rng.randint(0, 8),
+                                          end + rng.randint(-86400 * 10, 86400 * 30)]
+    data["settings"]["profile_name"] = "Load test"
+    return data
+
+
+def make_install(out, per_kind=2000, events=200_000, profiles=5000, seed=1):
+    rng = random.Random(seed)
+    end = int(time.time())
+    lessons = os.path.join(out, "lessons")
+    os.makedirs(lessons, exist_ok=True)
+    lesson_ids = []
+    for kind in KINDS:
+        for i in range(per_kind):
+            with open(os.path.join(lessons, f"fx_{kind}_{i:05d}.py"), "w", encoding="utf-8") as f:
+                f.write(plugin_source(kind, i, rng))
+            lesson_ids.append(f"fx_{kind}_{i:05d}")
+
+    with open(os.path.join(out, Main.DATA_FILE), "w", encoding="utf-8") as f:
+        json.dump(make_user_data(rng, lesson_ids, events, end), f)
+
+    roster_dir = os.path.join(out, Main.PROFILES_DIR)
+    os.makedirs(roster_dir, exist_ok=True)
+    for start in range(0, profiles, 1000):
+        roster = []
+        for n in range(start, min(profiles, start + 1000)):
+            history = xp_history(rng, rng.randint(50, 400), end)
+            roster.append({"id": f"fx_learner_{n:06d}", "name": f"Learner {n}",
+                           "xp": sum(e[1] for e in history), "xp_events": history})
+        with open(os.path.join(roster_dir, f"fx_roster_{start // 1000:03d}.json"), "w", encoding="utf-8") as f:
+            json.dump({"profiles": roster}, f)
+
+    shutil.copy(os.path.join(ROOT, Main.SHOP_CATALOG_FILE), out)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks/fixtures.py",
+                                     description="Generate a large synthetic QuadroLingo install.")
+    parser.add_argument("out", help="directory to create the install in")
+    parser.add_argument("--per-kind", type=int, default=2000, help="lesson plugins of each kind")
+    parser.add_argument("--events", type=int, default=200_000, help="xp events in the learner's history")
+    parser.add_argument("--profiles", type=int, default=5000, help="classmates on the leaderboard")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    make_install(args.out, args.per_kind, args.events, args.profiles, args.seed)
+    print(f"{args.out}: {args.per_kind * len(KINDS)} lessons, {args.events} xp events, "
+          f"{args.profiles} profiles ({time.perf_counter() - t0:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
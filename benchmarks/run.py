@@ -0,0 +1,289 @@
+import os
+import sys
+import json
+import time
+import shutil
+import atexit
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Main  # noqa: E402
+
+
+# Microbenchmark suite for the hot paths in Main.py. Every metric is a time in
+# milliseconds (lower is better) and the results are written as JSON so two
+# runs can be compared:
+#
+#   python benchmarks/run.py -o base.json
+#   python benchmarks/run.py -o new.json --compare base.json --threshold 0.15
+#   python benchmarks/run.py --current new.json --compare base.json
+#
+# The UI benchmarks need a display; without $DISPLAY an Xvfb server is
+# started when one is installed, otherwise they are reported as skipped.
+
+PLUGIN_TEMPLATE = '''import tkinter as tk
+
+LESSON_META = {{
+    "id": "bench_{i:05d}",
+    "title": "Bench lesson {i}",
+    "subtitle": "Synthetic plugin for the benchmark suite",
+    "emoji": "📘",
+    "kind": "learn",
+    "order": {i}
+}}
+
+def build(parent, app, meta):
+    return tk.Frame(parent)
+'''
+
+HISTORY_SIZES = (100, 10_000, 100_000)
+PLUGIN_COUNTS = (10, 1_000, 10_000)
+CARD_COUNTS = (100, 1_000)
+
+
+def make_install(n):
+    tmp = tempfile.mkdtemp(prefix="ql_bench_")
+    atexit.register(shutil.rmtree, tmp, True)
+    lessons = os.path.join(tmp, "lessons")
+    os.makedirs(lessons)
+    for i in range(n):
+        with open(os.path.join(lessons, f"bench_{i:05d}.py"), "w", encoding="utf-8") as f:
+            f.write(PLUGIN_TEMPLATE.format(i=i))
+    shutil.copy(os.path.join(ROOT, Main.SHOP_CATALOG_FILE), tmp)
+    return tmp
+
+
+def make_history(n):
+    # a learner with n xp events and a proportional SRS deck
+    data = Main.upgrade_data({})
+    start = int(time.time()) - n * 600
+    for i in range(n):
+        ts = start + i * 600
+        data["xp_events"].append([ts, 10 + i % 7, Main.local_day(ts)])
+    for i in range(n // 10):
+        data["srs"][f"bench_{i % 500:05d}:item{i}"] = [2.5, 1 + i % 30, i % 9, start + i * 3600]
+    for i in range(min(n // 20, 10_000)):
+        data["completed_lessons"][f"bench_{i:05d}"] = {"times": 1 + i % 4, "last_completed": start + i}
+    data["gems"] = n
+    data["xp"] = sum(e[1] for e in data["xp_events"])
+    return data
+
+
+def timed(fn, repeat=5, number=1):
+    # median wall time of one call in ms
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - t0) / number)
+    return statistics.median(times) * 1000
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+# ---------------- Benchmarks ----------------
+def bench_data(results, quick):
+    for n in HISTORY_SIZES[:2] if quick else HISTORY_SIZES:
+        tmp = tempfile.mkdtemp(prefix="ql_bench_data_")
+        atexit.register(shutil.rmtree, tmp, True)
+        os.chdir(tmp)
+        data = make_history(n)
+        results[f"save_data.events_{n}"] = timed(lambda: Main.save_data(data), repeat=5)
+        results[f"load_data.events_{n}"] = timed(Main.load_data, repeat=5)
+
+
+def bench_load_lessons(results, quick):
+    for n in PLUGIN_COUNTS[:2] if quick else PLUGIN_COUNTS:
+        os.chdir(make_install(n))
+        results[f"load_lessons.plugins_{n}"] = timed(lambda: Main.load_lessons("lessons"),
+                                                     repeat=1 if n >= 10_000 else 3)
+
+
+def bench_ui(results, quick):
+    for n in CARD_COUNTS[:1] if quick else CARD_COUNTS:
+        os.chdir(make_install(n))
+        app = Main.DuoPluginApp()
+        app.geometry("1100x720")
+        app.update()
+        try:
+            ui_suite(app, n, results)
+        finally:
+            app.destroy()
+
+
+def ui_suite(app, n, results):
+    def build_list_page():
+        page = app._build_list_page(kind="learn", title="Learn", subtitle="")
+        page.update_idletasks()
+        page.destroy()
+    results[f"build_list_page.cards_{n}"] = timed(build_list_page, repeat=3)
+
+    def rebuild():
+        app.apply_theme_rebuild()
+        app.update_idletasks()
+    results[f"apply_theme_rebuild.cards_{n}"] = timed(rebuild, repeat=3)
+
+    app.show_page("learn", animate=False)
+    app.update()
+    cards = [c for c in app.lesson_cards.values() if c.winfo_exists()]
+
+    def redraw_all():
+        for card in cards:
+            card.redraw()
+    results[f"lesson_card.redraw.cards_{n}"] = timed(redraw_all, repeat=3) / max(1, len(cards))
+
+    frames = []
+    for page in ("practice", "learn") * 5:
+        view = app.pages[page]
+        app._transition_to(view, animate=True)
+        while app.timers.count(view):
+            t0 = time.perf_counter()
+            app.update()
+            frames.append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.004)
+    results[f"transition_to.frame_p50.cards_{n}"] = percentile(frames, 50)
+    results[f"transition_to.frame_p95.cards_{n}"] = percentile(frames, 95)
+
+    meta = app.lessons[0]["meta"] if app.lessons else {"id": "bench"}
+
+    def complete():
+        app.complete_lesson(meta)
+        app.update_idletasks()
+    results[f"complete_lesson.cards_{n}"] = timed(complete, repeat=5, number=4)
+
+
+BENCHMARKS = {
+    "data": (bench_data, False),
+    "load_lessons": (bench_load_lessons, False),
+    "ui": (bench_ui, True),
+}
+
+
+# ---------------- Display ----------------
+def ensure_display():
+    # True when Tk can open a window, starting Xvfb if we have to
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return True
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return False
+    r, w = os.pipe()
+    proc = subprocess.Popen([xvfb, "-displayfd", str(w), "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+                            pass_fds=(w,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(w)
+    with os.fdopen(r) as f:
+        number = f.readline().strip()
+    if not number:
+        proc.kill()
+        return False
+    atexit.register(proc.terminate)
+    os.environ["DISPLAY"] = f":{number}"
+    return True
+
+
+# ---------------- Runner ----------------
+def run_suite(only=None, quick=False):
+    results, skipped = {}, {}
+    cwd = os.getcwd()
+    display = None
+    for name, (fn, needs_display) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        if needs_display:
+            if display is None:
+                display = ensure_display()
+            if not display:
+                skipped[name] = "no display (install Xvfb or set DISPLAY)"
+                continue
+        print(f"[bench] {name} ...", file=sys.stderr)
+        try:
+            fn(results, quick)
+        finally:
+            os.chdir(cwd)
+    return {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tk": str(Main.tk.TkVersion),
+            "quick": quick,
+        },
+        "metrics": {k: round(v, 4) for k, v in results.items()},
+        "skipped": skipped,
+    }
+
+
+def compare(base, current, threshold, min_delta=0.25):
+    # metrics slower than base by more than threshold (a fraction) and by more
+    # than min_delta ms, so jitter on sub-millisecond metrics is not a failure
+    regressions = []
+    print(f"{'metric':<40} {'base ms':>10} {'now ms':>10} {'change':>8}")
+    for name in sorted(set(base["metrics"]) | set(current["metrics"])):
+        old = base["metrics"].get(name)
+        new = current["metrics"].get(name)
+        if old is None or new is None:
+            print(f"{name:<40} {'-' if old is None else f'{old:.3f}':>10} {'-' if new is None else f'{new:.3f}':>10}")
+            continue
+        change = (new - old) / old if old > 0 else 0.0
+        flag = ""
+        if change > threshold and new - old > min_delta:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {old:10.3f} {new:10.3f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks/run.py",
+                                     description="Run the Main.py microbenchmarks and compare against a baseline.")
+    parser.add_argument("-o", "--out", help="write results JSON here")
+    parser.add_argument("--only", help="comma separated: " + ",".join(BENCHMARKS))
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    parser.add_argument("--compare", metavar="BASE", help="baseline results JSON")
+    parser.add_argument("--current", help="compare this results JSON instead of running the suite")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="fail when a metric is slower than base by more than this fraction")
+    parser.add_argument("--min-delta", type=float, default=0.25,
+                        help="ignore slowdowns smaller than this many ms")
+    args = parser.parse_args(argv)
+
+    if args.current:
+        with open(args.current, "r", encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        out = os.path.abspath(args.out) if args.out else None
+        current = run_suite(set(args.only.split(",")) if args.only else None, args.quick)
+        for name, reason in current["skipped"].items():
+            print(f"[bench] skipped {name}: {reason}", file=sys.stderr)
+        if out:
+            with open(out, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+        if not args.compare:
+            for name, value in current["metrics"].items():
+                print(f"{name:<40} {value:10.3f} ms")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        regressions = compare(base, current, args.threshold, args.min_delta)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import atexit
+import argparse
+import tempfile
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Main  # noqa: E402
+from fixtures import make_install  # noqa: E402
+from run import ensure_display, percentile  # noqa: E402
+
+
+# Scripted learner sessions against a large install. Every interaction is sent
+# as Tk events (Enter/ButtonPress/ButtonRelease on the real widgets) and timed
+# from the input until Tk is idle again; the report has p50/p95/p99 per
+# interaction type.
+#
+#   python benchmarks/ui_load.py [--install DIR] [--sessions 30] [--seed 1] [--json out.json]
+#
+# Without --install a fixture install is generated first (see fixtures.py).
+# Needs a display; without $DISPLAY Xvfb is started when installed.
+
+LESSON_PAGES = ("learn", "practice", "stories")
+
+
+class Driver:
+    def __init__(self, app, rng, think_ms=40):
+        self.app = app
+        self.rng = rng
+        self.think_ms = think_ms
+        self.latency = {}  # interaction -> [ms]
+
+    # ---------- Input ----------
+    def _at(self, widget):
+        return {"x": max(1, widget.winfo_width() // 2), "y": max(1, widget.winfo_height() // 2)}
+
+    def click(self, widget):
+        pos = self._at(widget)
+        widget.event_generate("<Enter>", **pos)
+        widget.event_generate("<ButtonPress-1>", **pos)
+        widget.event_generate("<ButtonRelease-1>", **pos)
+
+    def timed(self, kind, fn):
+        # input -> next idle; returns the sample, filed under kind unless None
+        t0 = time.perf_counter()
+        fn()
+        self.app.update()
+        ms = (time.perf_counter() - t0) * 1000
+        if kind is not None:
+            self.latency.setdefault(kind, []).append(ms)
+        return ms
+
+    def think(self, ms=None):
+        # the learner reads for a moment; animations keep running meanwhile
+        end = time.perf_counter() + (self.think_ms if ms is None else ms) / 1000
+        while time.perf_counter() < end:
+            self.app.update()
+            time.sleep(0.004)
+
+    def settle(self):
+        # wait for the page transition to finish
+        view = self.app.current_view
+        while view is not None and self.app.timers.count(view):
+            self.app.update()
+            time.sleep(0.004)
+
+    # ---------- Widgets ----------
+    def find(self, parent, name):
+        for w in parent.winfo_children():
+            if w.winfo_name() == name:
+                return w
+            found = self.find(w, name)
+            if found is not None:
+                return found
+        return None
+
+    def visible_cards(self, page):
+        return [c for c in self.app.lesson_cards.values()
+                if c.winfo_exists() and c.winfo_ismapped() and c.entry["meta"]["kind"] == page]
+
+    # ---------- Interactions ----------
+    def navigate(self, page):
+        self.timed("navigate", lambda: self.click(self.app.nav[page]))
+        self.settle()
+
+    def hover(self, card):
+        pos = self._at(card)
+        self.timed("hover", lambda: card.event_generate("<Enter>", **pos))
+        self.think(60)
+        card.event_generate("<Leave>", **pos)
+
+    def play_lesson(self, card):
+        self.timed("open_lesson", lambda: self.click(card))
+        self.settle()
+        view = self.app.current_view
+        while self.app.current_view is view:
+            choices = self.find(view, "choices")
+            buttons = [b for b in choices.winfo_children() if b.winfo_ismapped()] if choices else []
+            if not buttons:
+                break
+            self.think(self.rng.randint(20, 80))  # quick learner
+            ms = self.timed(None, lambda: self.click(self.rng.choice(buttons)))
+            # the last answer runs complete_lesson and slides back to the list
+            kind = "answer" if self.app.current_view is view else "complete_lesson"
+            self.latency.setdefault(kind, []).append(ms)
+        if self.app.current_view is view:
+            back = self.find(view, "back")
+            if back is not None:
+                self.timed("back", lambda: self.click(back))
+        self.settle()
+
+    def buy_item(self):
+        self.navigate("shop")
+        cards = [c for c in self.app.shop_cards.values() if c.winfo_ismapped()]
+        if cards:
+            self.timed("buy_item", lambda: self.click(self.rng.choice(cards)))
+            self.think()
+
+    def toggle_theme(self):
+        self.navigate("settings")
+        page = self.app.pages["settings"]
+        toggle = next((w for w in self._walk(page)
+                       if isinstance(w, tk.Button) and str(w.cget("text")).startswith("Switch to")), None)
+        if toggle is not None:
+            self.timed("toggle_theme", lambda: self.click(toggle))
+            self.settle()
+
+    def _walk(self, parent):
+        for w in parent.winfo_children():
+            yield w
+            yield from self._walk(w)
+
+    def session(self):
+        page = self.rng.choice(LESSON_PAGES)
+        self.navigate(page)
+        cards = self.visible_cards(page)
+        for card in self.rng.sample(cards, min(len(cards), self.rng.randint(1, 3))):
+            self.hover(card)
+        cards = self.visible_cards(page)
+        if cards:
+            self.play_lesson(self.rng.choice(cards))
+        roll = self.rng.random()
+        if roll < 0.3:
+            self.buy_item()
+        elif roll < 0.4:
+            self.toggle_theme()
+        elif roll < 0.55:
+            self.navigate("leaderboard")
+            self.think()
+
+    def report(self):
+        return {kind: {"n": len(v), "p50": percentile(v, 50), "p95": percentile(v, 95),
+                       "p99": percentile(v, 99), "max": max(v)}
+                for kind, v in sorted(self.latency.items()) if v}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks/ui_load.py",
+                                     description="Scripted UI sessions with per-interaction latency percentiles.")
+    parser.add_argument("--install", help="existing install (default: generate one)")
+    parser.add_argument("--per-kind", type=int, default=1000, help="lessons per kind when generating")
+    parser.add_argument("--events", type=int, default=100_000, help="xp events when generating")
+    parser.add_argument("--profiles", type=int, default=2000, help="profiles when generating")
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--think-ms", type=int, default=40)
+    parser.add_argument("--json", help="write the report here")
+    args = parser.parse_args(argv)
+
+    if not ensure_display():
+        print("no display: set DISPLAY or install Xvfb")
+        return 2
+    out = os.path.abspath(args.json) if args.json else None
+    install = args.install
+    if install is None:
+        install = tempfile.mkdtemp(prefix="ql_load_")
+        atexit.register(shutil.rmtree, install, True)
+        print(f"[load] generating fixture install in {install} ...", file=sys.stderr)
+        make_install(install, args.per_kind, args.events, args.profiles, args.seed)
+    else:
+        # sessions write progress; keep the given install untouched
+        copy = tempfile.mkdtemp(prefix="ql_load_")
+        atexit.register(shutil.rmtree, copy, True)
+        shutil.copytree(install, copy, dirs_exist_ok=True)
+        install = copy
+    os.chdir(install)
+
+    t0 = time.perf_counter()
+    app = Main.DuoPluginApp()
+    app.geometry("1100x720")
+    app.update()
+    startup = (time.perf_counter() - t0) * 1000
+
+    driver = Driver(app, random.Random(args.seed), think_ms=args.think_ms)
+    for _ in range(args.sessions):
+        driver.session()
+    report = driver.report()
+    app.destroy()
+
+    print(f"startup {startup:.0f} ms, {args.sessions} sessions")
+    print(f"{'interaction':<16} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for kind, r in report.items():
+        print(f"{kind:<16} {r['n']:5d} {r['p50']:9.2f} {r['p95']:9.2f} {r['p99']:9.2f} {r['max']:9.2f}")
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump({"startup_ms": startup, "sessions": args.sessions, "seed": args.seed,
+                       "interactions": report}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
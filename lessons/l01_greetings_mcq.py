@@ -9,6 +9,15 @@ LESSON_META = {
     "order": 1
 }
 
+# wrong choices come from the phrase index (app.distractors)
+REVIEW_ITEMS = [
+    {"id": "hello", "q": "Hello!", "prompt": "Pick the best English greeting:", "a": "Hello!"},
+    {"id": "good_morning", "q": "Good morning!", "prompt": "Pick the best greeting:", "a": "Good morning!"},
+    {"id": "how_are_you", "q": "How are you?", "prompt": "Pick the best phrase:", "a": "How are you?"},
+]
+
+PHRASES = ["Goodbye!", "Please.", "Good night!", "Thanks!", "Where are you?", "Who are you?"]
+
 def build(parent, app, meta):
     t = app.theme()
     frame = tk.Frame(parent, bg=t["bg"])
@@ -67,17 +76,11 @@ def build(parent, app, meta):
     )
     next_btn.grid(row=0, column=1, sticky="ew")
 
-    items = [
-        {"q": "Hello!", "prompt": "Pick the best English greeting:", "choices": ["Goodbye!", "Hello!", "Please."], "a": "Hello!"},
-        {"q": "Good morning!", "prompt": "Pick the best greeting:", "choices": ["Good morning!", "Good night!", "Thanks!"], "a": "Good morning!"},
-        {"q": "How are you?", "prompt": "Pick the best phrase:", "choices": ["How are you?", "Where are you?", "Who are you?"], "a": "How are you?"},
-    ]
+    items = REVIEW_ITEMS
 
     state = {"i": 0, "selected": None, "locked": False, "score": 0}
 
-    def clear_choices():
-        for wdg in choices_frame.winfo_children():
-            wdg.destroy()
+    choices = app.choice_buttons(choices_frame)
 
     def render():
         state["selected"] = None
@@ -89,31 +92,20 @@ def build(parent, app, meta):
         prompt.config(text=item["prompt"])
         question.config(text=item["q"])
 
-        clear_choices()
-        for idx, text in enumerate(item["choices"]):
-            btn = tk.Button(
-                choices_frame,
-                text=text,
-                font=("Segoe UI", 11, "bold"),
-                bg=t["panel"], fg=t["text"],
-                activebackground=t["nav_hover"], activeforeground=t["text"],
-                relief="flat", cursor="hand2",
-                highlightbackground=t["border"], highlightthickness=1,
-                padx=12, pady=10
-            )
-            btn.grid(row=idx, column=0, sticky="ew", pady=6)
-            btn.configure(command=lambda tx=text, b=btn: choose(tx, b))
-
-    def choose(choice_text, btn_widget):
+        options = list(item.get("choices") or [item["a"]] + app.distractors(item["a"], k=2))
+        app.rng.shuffle(options)
+        choices.set_choices(options, choose)
+        state["shown"] = app.clock.perf_counter()
+
+    def choose(idx, choice_text):
         if state["locked"]:
             return
         state["selected"] = choice_text
         next_btn.config(state="normal", text="Check")
 
-        # visually mark selection by updating all buttons
-        for b in choices_frame.winfo_children():
-            b.configure(bg=t["panel"])
-        btn_widget.configure(bg=t["nav_hover"])
+        # visually mark selection
+        choices.reset_styles()
+        choices.style(idx, bg=t["nav_hover"])
 
     def check_or_next():
         if state["locked"]:
@@ -133,6 +125,8 @@ def build(parent, app, meta):
 
         item = items[state["i"]]
         state["locked"] = True
+        app.record_answer(meta, item["id"], state["selected"] == item["a"],
+                          latency=app.clock.perf_counter() - state["shown"])
         if state["selected"] == item["a"]:
             state["score"] += 1
             feedback.config(text="✅ Correct!", fg=t["green"])
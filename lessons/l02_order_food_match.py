@@ -1,5 +1,4 @@
 import tkinter as tk
-import random
 
 LESSON_META = {
     "id": "l02_order_food_match",
@@ -10,6 +9,18 @@ LESSON_META = {
     "order": 2
 }
 
+PAIRS = [
+    {"id": "order", "left": "I would like…", "right": "A polite way to order"},
+    {"id": "pay", "left": "The bill, please.", "right": "Ask to pay"},
+    {"id": "drink", "left": "Can I have water?", "right": "Request a drink"},
+    {"id": "no_onions", "left": "No onions, please.", "right": "Ask to remove something"},
+]
+
+PHRASES = [p["left"] for p in PAIRS]
+
+PAGE_SIZE = 6      # pairs shown at once; bigger boards are paged
+TIME_LIMIT = None  # seconds for a timed round, or None
+
 def build(parent, app, meta):
     t = app.theme()
     frame = tk.Frame(parent, bg=t["bg"])
@@ -41,18 +52,6 @@ def build(parent, app, meta):
              bg=t["panel"], fg=t["muted"], font=("Segoe UI", 10)
              ).grid(row=0, column=0, columnspan=2, sticky="w", padx=16, pady=(14, 10))
 
-    pairs = [
-        ("I would like…", "A polite way to order"),
-        ("The bill, please.", "Ask to pay"),
-        ("Can I have water?", "Request a drink"),
-        ("No onions, please.", "Ask to remove something"),
-    ]
-
-    left_items = [p[0] for p in pairs]
-    right_items = [p[1] for p in pairs]
-    random.shuffle(left_items)
-    random.shuffle(right_items)
-
     left_frame = tk.Frame(card, bg=t["panel"])
     right_frame = tk.Frame(card, bg=t["panel"])
     left_frame.grid(row=1, column=0, sticky="nsew", padx=(16, 8), pady=(0, 14))
@@ -60,95 +59,96 @@ def build(parent, app, meta):
     left_frame.grid_columnconfigure(0, weight=1)
     right_frame.grid_columnconfigure(0, weight=1)
 
+    status = tk.Label(card, text="", bg=t["panel"], fg=t["muted"], font=("Segoe UI", 10))
+    status.grid(row=2, column=0, columnspan=2, sticky="w", padx=16, pady=(0, 12))
+
     feedback = tk.Label(frame, text="", bg=t["bg"], fg=t["muted"], font=("Segoe UI", 11, "bold"))
     feedback.grid(row=2, column=0, sticky="w", padx=18, pady=(12, 0))
 
-    selected = {"side": None, "text": None}
-    matched = set()
-    score = {"ok": 0}
-
-    def make_btn(parent, text):
-        b = tk.Button(
-            parent, text=text,
-            font=("Segoe UI", 11, "bold"),
-            bg=t["panel"], fg=t["text"],
-            activebackground=t["nav_hover"], activeforeground=t["text"],
-            relief="flat", cursor="hand2",
-            highlightbackground=t["border"], highlightthickness=1,
-            padx=12, pady=12
-        )
-        return b
-
-    def reset_styles():
-        for b in left_frame.winfo_children():
-            b.configure(bg=t["panel"])
-        for b in right_frame.winfo_children():
-            b.configure(bg=t["panel"])
-
-    def click(side, text, btn):
-        if text in matched:
+    board = app.match_board(PAIRS, page_size=PAGE_SIZE, time_limit=TIME_LIMIT)
+    pools = {"L": app.choice_buttons(left_frame, pady=12), "R": app.choice_buttons(right_frame, pady=12)}
+    slots = {}  # (side, pair_id) -> button index in its pool
+    order = {"L": [], "R": []}
+    state = {"since": app.clock.perf_counter(), "finished": False}
+
+    def style(key):
+        side, pid = key
+        idx = slots[key]
+        if pid in board.matched:
+            pools[side].style(idx, state="disabled", bg=t["disabled"], fg=t["muted"])
+        elif board.selected == key:
+            pools[side].style(idx, bg=t["nav_hover"])
+        else:
+            pools[side].style(idx, bg=t["panel"])
+
+    def show_page():
+        order["L"], order["R"] = board.layout()
+        slots.clear()
+        for side in ("L", "R"):
+            texts = [board.pairs[pid]["left" if side == "L" else "right"] for pid in order[side]]
+            pools[side].set_choices(texts, lambda idx, text, sd=side: click(sd, order[sd][idx]))
+            for idx, pid in enumerate(order[side]):
+                slots[(side, pid)] = idx
+        update_status()
+
+    def update_status():
+        parts = [f"{board.score}/{board.total} matched"]
+        if len(board.pages) > 1:
+            parts.append(f"page {board.page + 1}/{len(board.pages)}")
+        left = board.time_left()
+        if left is not None:
+            parts.append(f"{int(left)} s left")
+        status.config(text="  ·  ".join(parts))
+
+    def finish(message):
+        if state["finished"]:
             return
-
-        # pick first
-        if selected["text"] is None:
-            selected["side"] = side
-            selected["text"] = text
-            reset_styles()
-            btn.configure(bg=t["nav_hover"])
+        state["finished"] = True
+        ok = board.score
+        gems = 10 + 5 * ok
+        xp = 5 + 5 * ok
+        app.complete_lesson(meta, gems=gems, xp=xp, message=message)
+
+    def click(side, pid):
+        result, changed = board.click(side, pid)
+        for key in changed:
+            style(key)
+
+        if result == board.SELECT:
             feedback.config(text="Pick the match.", fg=t["muted"])
             return
-
-        # if clicked same side, switch selection
-        if selected["side"] == side:
-            selected["text"] = text
-            reset_styles()
-            btn.configure(bg=t["nav_hover"])
+        if result not in (board.OK, board.MISS):
             return
 
-        # check match
-        a = selected["text"]
-        btext = text
-        selected["side"] = None
-        selected["text"] = None
-        reset_styles()
-
-        # Determine correct pair
-        correct = False
-        for left, right in pairs:
-            if (a == left and btext == right) or (a == right and btext == left):
-                correct = True
-                # mark both as matched
-                matched.add(left)
-                matched.add(right)
-                score["ok"] += 1
-                break
-
-        if correct:
+        # changed = [first pick, second pick]; report against the left-hand pair
+        left_pid = changed[0][1] if changed[0][0] == "L" else changed[1][1]
+        app.record_answer(meta, left_pid, result == board.OK,
+                          latency=app.clock.perf_counter() - state["since"])
+        state["since"] = app.clock.perf_counter()
+
+        if result == board.OK:
             feedback.config(text="✅ Match!", fg=t["green"])
             app.toast.show("Match!", kind="success", duration=1.1)
-            # disable matched buttons
-            for btn2 in left_frame.winfo_children():
-                if btn2.cget("text") in matched:
-                    btn2.configure(state="disabled", bg=t["disabled"], fg=t["muted"])
-            for btn2 in right_frame.winfo_children():
-                if btn2.cget("text") in matched:
-                    btn2.configure(state="disabled", bg=t["disabled"], fg=t["muted"])
-
-            if score["ok"] == len(pairs):
-                app.complete_lesson(meta, gems=30, xp=25, message="All matched!")
+            update_status()
+            if board.score == board.total:
+                finish("All matched!")
+            elif board.page_done and board.next_page():
+                show_page()
         else:
             feedback.config(text="❌ Not a match.", fg=t["red"])
             app.toast.show("Not a match.", kind="warn", duration=1.1)
 
-    # build buttons
-    for i, text in enumerate(left_items):
-        b = make_btn(left_frame, text)
-        b.grid(row=i, column=0, sticky="ew", pady=6)
-        b.configure(command=lambda tx=text, btn=b: click("L", tx, btn))
+    def tick():
+        if state["finished"]:
+            return
+        update_status()
+        if board.expired:
+            finish(f"Time's up! {board.score}/{board.total} matched")
+            return
+        app.timers.after(frame, 250, tick)  # cancelled if the lesson is closed
 
-    for i, text in enumerate(right_items):
-        b = make_btn(right_frame, text)
-        b.grid(row=i, column=0, sticky="ew", pady=6)
-        b.configure(command=lambda tx=text, btn=b: click("R", tx, btn))
+    show_page()
+    if board.time_limit is not None:
+        tick()
 
     return frame
\ No newline at end of file
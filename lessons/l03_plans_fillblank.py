@@ -42,7 +42,8 @@ def build(parent, app, meta):
     sentence = tk.Label(card, text="", bg=t["panel"], fg=t["text"], font=("Segoe UI", 16, "bold"))
     sentence.grid(row=1, column=0, sticky="w", padx=16, pady=(6, 6))
 
-    entry = tk.Entry(card, font=("Segoe UI", 13))
+    entry = tk.Entry(card, font=("Segoe UI", 13),
+                     highlightthickness=2, highlightbackground=t["border"], highlightcolor=t["border"])
     entry.grid(row=2, column=0, sticky="ew", padx=16, pady=(0, 14), ipady=8)
 
     feedback = tk.Label(frame, text="", bg=t["bg"], fg=t["muted"], font=("Segoe UI", 11, "bold"))
@@ -57,28 +58,44 @@ def build(parent, app, meta):
     )
     btn.grid(row=3, column=0, sticky="ew", padx=18, pady=16)
 
+    # (item id, sentence, accepted answers); the first variant is the one shown as correct
     items = [
-        ("I ___ going to the park.", "am"),
-        ("We ___ pizza tonight.", "are"),
-        ("She ___ to watch a movie.", "wants"),
+        ("going_to_park", "I ___ going to the park.", ["am", "'m"]),
+        ("pizza_tonight", "We ___ pizza tonight.", ["are", "are having", "are eating"]),
+        ("watch_movie", "She ___ to watch a movie.", ["wants", "would like", "is going"]),
     ]
+    # normalized variants are precomputed once per lesson load
+    checkers = [app.answer_checker(variants) for _, _, variants in items]
     state = {"i": 0, "score": 0}
 
+    def live_check(_event=None):
+        verdict, _ = checkers[state["i"]].check(entry.get())
+        color = t["green"] if verdict == "exact" else t["orange"] if verdict == "typo" else t["border"]
+        entry.configure(highlightbackground=color, highlightcolor=color)
+
     def render():
         feedback.config(text="", fg=t["muted"])
         entry.delete(0, tk.END)
-        a, _ = items[state["i"]]
+        _, a, _ = items[state["i"]]
         sentence.config(text=a)
+        live_check()
+        state["shown"] = app.clock.perf_counter()
 
     def check():
-        correct = items[state["i"]][1].strip().lower()
-        ans = entry.get().strip().lower()
-        if ans == correct:
+        checker = checkers[state["i"]]
+        verdict, matched = checker.check(entry.get())
+        app.record_answer(meta, items[state["i"]][0], verdict != "wrong",
+                          latency=app.clock.perf_counter() - state["shown"])
+        if verdict == "exact":
             state["score"] += 1
             feedback.config(text="✅ Correct!", fg=t["green"])
             app.toast.show("Correct!", kind="success", duration=1.0)
+        elif verdict == "typo":
+            state["score"] += 1
+            feedback.config(text=f"✅ Correct! Watch the spelling: {matched}", fg=t["green"])
+            app.toast.show("Correct!", kind="success", duration=1.0)
         else:
-            feedback.config(text=f"❌ Correct answer: {correct}", fg=t["red"])
+            feedback.config(text=f"❌ Correct answer: {checker.primary}", fg=t["red"])
             app.toast.show("Close — keep going!", kind="warn", duration=1.2)
 
         state["i"] += 1
@@ -90,5 +107,7 @@ def build(parent, app, meta):
             render()
 
     btn.configure(command=check)
+    entry.bind("<KeyRelease>", live_check)
+    entry.bind("<Return>", lambda e: check())
     render()
     return frame
\ No newline at end of file
@@ -9,6 +9,15 @@ LESSON_META = {
     "order": 1
 }
 
+REVIEW_ITEMS = [
+    {"id": "greeting", "prompt": "Tap the greeting:", "q": "___", "a": "Hello!", "choices": ["Hello!", "Goodbye!"]},
+    {"id": "polite_order", "prompt": "Tap the polite order:", "q": "___", "a": "I would like…", "choices": ["I would like…", "No way."]},
+    {"id": "plan_phrase", "prompt": "Tap the plan phrase:", "q": "___", "a": "I am going to…", "choices": ["I am going to…", "I was yesterday…"]},
+    {"id": "payment_phrase", "prompt": "Tap the payment phrase:", "q": "___", "a": "The bill, please.", "choices": ["The bill, please.", "The table, please."]},
+    # no hand-typed wrong option: the app picks a distractor from installed content
+    {"id": "water_request", "prompt": "Tap the drink request:", "q": "___", "a": "Can I have water?"},
+]
+
 def build(parent, app, meta):
     t = app.theme()
     frame = tk.Frame(parent, bg=t["bg"])
@@ -49,43 +58,24 @@ def build(parent, app, meta):
     feedback = tk.Label(frame, text="", bg=t["bg"], fg=t["muted"], font=("Segoe UI", 11, "bold"))
     feedback.grid(row=2, column=0, sticky="w", padx=18, pady=(12, 0))
 
-    items = [
-        {"prompt": "Tap the greeting:", "q": "___", "a": "Hello!", "b": "Goodbye!"},
-        {"prompt": "Tap the polite order:", "q": "___", "a": "I would like…", "b": "No way."},
-        {"prompt": "Tap the plan phrase:", "q": "___", "a": "I am going to…", "b": "I was yesterday…"},
-        {"prompt": "Tap the payment phrase:", "q": "___", "a": "The bill, please.", "b": "The table, please."},
-    ]
+    items = REVIEW_ITEMS
 
     state = {"i": 0, "score": 0}
 
-    def clear_answers():
-        for w in answers.winfo_children():
-            w.destroy()
+    choices = app.choice_buttons(answers, columns=2, pady=12)
 
     def render():
         feedback.config(text="", fg=t["muted"])
         item = items[state["i"]]
         prompt.config(text=item["prompt"])
         question.config(text=item["q"])
-        clear_answers()
-
-        def make_btn(text, correct):
-            return tk.Button(
-                answers, text=text, command=lambda: choose(correct),
-                font=("Segoe UI", 11, "bold"),
-                bg=t["panel"], fg=t["text"],
-                activebackground=t["nav_hover"], activeforeground=t["text"],
-                relief="flat", cursor="hand2",
-                highlightbackground=t["border"], highlightthickness=1,
-                padx=12, pady=12
-            )
-
-        b1 = make_btn(item["a"], True)
-        b2 = make_btn(item["b"], False)
-        b1.grid(row=0, column=0, sticky="ew", padx=(0, 6), pady=6)
-        b2.grid(row=0, column=1, sticky="ew", padx=(6, 0), pady=6)
+        options = item.get("choices") or [item["a"]] + app.distractors(item["a"], k=1)
+        choices.set_choices(options, lambda idx, text: choose(text == item["a"]))
+        state["shown"] = app.clock.perf_counter()
 
     def choose(correct):
+        app.record_answer(meta, items[state["i"]]["id"], correct,
+                          latency=app.clock.perf_counter() - state["shown"])
         if correct:
             state["score"] += 1
             feedback.config(text="✅ Nice!", fg=t["green"])
@@ -1,14 +1,20 @@
+import os
 import tkinter as tk
 
 LESSON_META = {
     "id": "p02_listening_choice",
     "title": "Listening drill",
-    "subtitle": "Tap what you hear (simulated)",
+    "subtitle": "Tap what you hear",
     "emoji": "🎧",
     "kind": "practice",
     "order": 2
 }
 
+# clips live in lessons/audio/; items without a clip file fall back to showing the text
+AUDIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio")
+
+PHRASES = ["Hello!", "Goodbye!", "The bill, please.", "The table, please.", "Can I have water?", "Can I have sugar?"]
+
 def build(parent, app, meta):
     t = app.theme()
     frame = tk.Frame(parent, bg=t["bg"])
@@ -59,33 +65,48 @@ def build(parent, app, meta):
     feedback = tk.Label(frame, text="", bg=t["bg"], fg=t["muted"], font=("Segoe UI", 11, "bold"))
     feedback.grid(row=2, column=0, sticky="w", padx=18, pady=(12, 0))
 
+    # the other option is the closest phrase in the index (see PHRASES)
     items = [
-        {"audio": "Hello!", "options": ["Hello!", "Goodbye!"], "a": "Hello!"},
-        {"audio": "The bill, please.", "options": ["The bill, please.", "The table, please."], "a": "The bill, please."},
-        {"audio": "Can I have water?", "options": ["Can I have water?", "Can I have sugar?"], "a": "Can I have water?"},
+        {"id": "hello", "audio": "Hello!", "clip": "hello.wav", "a": "Hello!"},
+        {"id": "bill", "audio": "The bill, please.", "clip": "bill.wav", "a": "The bill, please."},
+        {"id": "water", "audio": "Can I have water?", "clip": "water.wav", "a": "Can I have water?"},
     ]
 
     state = {"i": 0, "score": 0, "played": False}
+    option_btns = app.choice_buttons(choices, columns=2, pady=12)
+
+    def clip_path(item):
+        return os.path.join(AUDIO_DIR, item["clip"]) if item.get("clip") else None
 
     def do_play():
         item = items[state["i"]]
         state["played"] = True
-        heard_lbl.config(text=f"“{item['audio']}”")
+        state["shown"] = app.clock.perf_counter()
+        if app.play_clip(clip_path(item)):
+            heard_lbl.config(text="🔊 …")
+        else:
+            # no clip installed: simulate by showing the text
+            heard_lbl.config(text=f"“{item['audio']}”")
         app.toast.show("Now choose the matching text.", kind="info", duration=1.2)
 
     def render():
         state["played"] = False
         heard_lbl.config(text="")
         feedback.config(text="", fg=t["muted"])
-        for w in choices.winfo_children():
-            w.destroy()
 
         item = items[state["i"]]
 
-        def choose(opt):
+        # decode this clip and the next one while the learner is answering
+        app.prefetch_clip(clip_path(item))
+        if state["i"] + 1 < len(items):
+            app.prefetch_clip(clip_path(items[state["i"] + 1]))
+
+        def choose(idx, opt):
             if not state["played"]:
                 app.toast.show("Press ▶ first.", kind="warn", duration=1.2)
                 return
+            app.record_answer(meta, item["id"], opt == item["a"],
+                              latency=app.clock.perf_counter() - state["shown"])
             if opt == item["a"]:
                 state["score"] += 1
                 feedback.config(text="✅ Correct!", fg=t["green"])
@@ -102,26 +123,9 @@ def build(parent, app, meta):
             else:
                 render()
 
-        b1 = tk.Button(
-            choices, text=item["options"][0], command=lambda: choose(item["options"][0]),
-            font=("Segoe UI", 11, "bold"),
-            bg=t["panel"], fg=t["text"],
-            activebackground=t["nav_hover"], activeforeground=t["text"],
-            relief="flat", cursor="hand2",
-            highlightbackground=t["border"], highlightthickness=1,
-            padx=12, pady=12
-        )
-        b2 = tk.Button(
-            choices, text=item["options"][1], command=lambda: choose(item["options"][1]),
-            font=("Segoe UI", 11, "bold"),
-            bg=t["panel"], fg=t["text"],
-            activebackground=t["nav_hover"], activeforeground=t["text"],
-            relief="flat", cursor="hand2",
-            highlightbackground=t["border"], highlightthickness=1,
-            padx=12, pady=12
-        )
-        b1.grid(row=0, column=0, sticky="ew", padx=(0, 6), pady=6)
-        b2.grid(row=0, column=1, sticky="ew", padx=(6, 0), pady=6)
+        options = [item["a"]] + app.distractors(item["a"], k=1)
+        app.rng.shuffle(options)
+        option_btns.set_choices(options, choose)
 
     render()
     return frame
\ No newline at end of file
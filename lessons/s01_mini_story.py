@@ -1,3 +1,4 @@
+import os
 import tkinter as tk
 
 LESSON_META = {
@@ -9,6 +10,9 @@ LESSON_META = {
     "order": 1
 }
 
+# paragraphs separated by blank lines; "?? question | answer | wrong | wrong" lines add questions
+STORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stories", "s01_mini_story.txt")
+
 def build(parent, app, meta):
     t = app.theme()
     frame = tk.Frame(parent, bg=t["bg"])
@@ -35,47 +39,103 @@ def build(parent, app, meta):
     card.grid(row=1, column=0, sticky="ew", padx=18)
     card.grid_columnconfigure(0, weight=1)
 
-    story = (
-        "Alex walks into a café.\n"
-        "They smile and say: “Hello!”\n"
-        "Alex wants to drink something cold."
-    )
+    book = app.story_book(STORY_FILE)
+    frame.bind("<Destroy>", lambda e: book.close() if e.widget is frame else None)
 
-    tk.Label(card, text="Story", bg=t["panel"], fg=t["muted"], font=("Segoe UI", 10)).grid(
-        row=0, column=0, sticky="w", padx=16, pady=(14, 6)
-    )
-    tk.Label(card, text=story, bg=t["panel"], fg=t["text"], font=("Segoe UI", 12), justify="left").grid(
-        row=1, column=0, sticky="w", padx=16, pady=(0, 12)
-    )
+    top = tk.Frame(card, bg=t["panel"])
+    top.grid(row=0, column=0, sticky="ew", padx=16, pady=(14, 6))
+    top.grid_columnconfigure(0, weight=1)
+    tk.Label(top, text="Story", bg=t["panel"], fg=t["muted"], font=("Segoe UI", 10)).grid(row=0, column=0, sticky="w")
+    page_lbl = tk.Label(top, text="", bg=t["panel"], fg=t["muted"], font=("Segoe UI", 10))
+    page_lbl.grid(row=0, column=1, sticky="e")
 
-    tk.Label(card, text="Question: What does Alex want?", bg=t["panel"], fg=t["text"],
-             font=("Segoe UI", 12, "bold")).grid(row=2, column=0, sticky="w", padx=16)
+    text = tk.Text(card, height=8, wrap="word", bg=t["panel"], fg=t["text"], font=("Segoe UI", 12),
+                   relief="flat", highlightthickness=0, padx=0, pady=0, cursor="arrow")
+    text.grid(row=1, column=0, sticky="ew", padx=16, pady=(0, 12))
+
+    question = tk.Label(card, text="", bg=t["panel"], fg=t["text"], font=("Segoe UI", 12, "bold"))
+    question.grid(row=2, column=0, sticky="w", padx=16)
 
     answers = tk.Frame(card, bg=t["panel"])
     answers.grid(row=3, column=0, sticky="ew", padx=16, pady=(10, 14))
     answers.grid_columnconfigure(0, weight=1)
+    choices = app.choice_buttons(answers, pady=12)
 
     feedback = tk.Label(frame, text="", bg=t["bg"], fg=t["muted"], font=("Segoe UI", 11, "bold"))
     feedback.grid(row=2, column=0, sticky="w", padx=18, pady=(12, 0))
 
-    def choose(ans):
-        if ans == "A cold drink":
+    next_btn = tk.Button(
+        frame, text="Continue ▶",
+        font=("Segoe UI", 11, "bold"),
+        bg=t["green"], fg="white",
+        activebackground=t["green_dark"], activeforeground="white",
+        relief="flat", cursor="hand2", padx=14, pady=10
+    )
+    next_btn.grid(row=3, column=0, sticky="ew", padx=18, pady=16)
+
+    state = {"page": 0, "score": 0, "shown": app.clock.perf_counter()}
+
+    def show_page(n):
+        page = book.page(n)
+        state["page"] = n
+        feedback.config(text="", fg=t["muted"])
+        page_lbl.config(text=f"Page {n + 1}")
+
+        text.configure(state="normal")
+        text.delete("1.0", tk.END)
+        text.insert("1.0", page["text"])
+        text.configure(state="disabled")
+
+        q = page["question"]
+        if q:
+            question.config(text=f"Question: {q['q']}")
+            question.grid()
+            answers.grid()
+            options = list(q["choices"])  # the parsed list has the answer first
+            app.rng.shuffle(options)
+            choices.set_choices(options, choose)
+            next_btn.grid_remove()
+            state["shown"] = app.clock.perf_counter()
+        else:
+            question.grid_remove()
+            answers.grid_remove()
+            next_btn.grid()
+
+        # read and parse the following page in idle time; it is put into the Text
+        # widget only on page turn (Tk lays out a Text when it is shown anyway)
+        app.timers.after_idle(frame, lambda: book.page(n + 1))
+
+    def advance():
+        if book.page(state["page"] + 1) is None:
+            gems = 12 + 6 * state["score"]
+            xp = 12 + 6 * state["score"]
+            app.complete_lesson(meta, gems=gems, xp=xp, message="Story completed!")
+        else:
+            show_page(state["page"] + 1)
+
+    def choose(idx, ans):
+        q = book.page(state["page"])["question"]
+        correct = ans == q["a"]
+        app.record_answer(meta, q["id"], correct,
+                          latency=app.clock.perf_counter() - state["shown"])
+        if correct:
+            state["score"] += 1
             feedback.config(text="✅ Correct!", fg=t["green"])
             app.toast.show("Nice reading!", kind="success", duration=1.2)
-            app.complete_lesson(meta, gems=18, xp=18, message="Story completed!")
+            advance()
         else:
             feedback.config(text="❌ Try again.", fg=t["red"])
             app.toast.show("Try again.", kind="warn", duration=1.1)
 
-    for i, opt in enumerate(["A cold drink", "A pizza", "A map"]):
-        tk.Button(
-            answers, text=opt, command=lambda o=opt: choose(o),
-            font=("Segoe UI", 11, "bold"),
-            bg=t["panel"], fg=t["text"],
-            activebackground=t["nav_hover"], activeforeground=t["text"],
-            relief="flat", cursor="hand2",
-            highlightbackground=t["border"], highlightthickness=1,
-            padx=12, pady=12
-        ).grid(row=i, column=0, sticky="ew", pady=6)
+    next_btn.configure(command=advance)
+
+    if book.page(0) is None:
+        text.insert("1.0", "This story is empty.")
+        text.configure(state="disabled")
+        question.grid_remove()
+        answers.grid_remove()
+        next_btn.configure(text="Back", command=app.go_back)
+    else:
+        show_page(0)
 
     return frame
\ No newline at end of file
@@ -0,0 +1,73 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import AnswerLog  # noqa: E402
+
+
+class AnswerLogTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp(prefix="ql_test_answers_")
+        self.addCleanup(shutil.rmtree, tmp, True)
+        self.path = os.path.join(tmp, "answer_log")
+
+    def rows(self, log):
+        columns, strings = log.scan()
+        return [(columns["ts"][i], strings[columns["lesson"][i]], strings[columns["item"][i]],
+                 columns["correct"][i], columns["latency_ms"][i]) for i in range(len(columns["ts"]))]
+
+    def test_round_trip(self):
+        log = AnswerLog(self.path)
+        self.assertEqual(log.record("l01", "hello", True, latency=1.25, ts=100.0), 1)
+        log.record("l01", "good_morning", False, ts=101.0)
+        log.record("p02", "hello", True, latency=0.5, ts=102.0)
+        self.assertEqual(self.rows(log), [])  # nothing on disk before flush
+        log.flush()
+        self.assertEqual(log.pending, 0)
+        self.assertEqual(self.rows(log), [
+            (100.0, "l01", "hello", 1, 1250),
+            (101.0, "l01", "good_morning", 0, 0),
+            (102.0, "p02", "hello", 1, 500),
+        ])
+
+    def test_strings_are_interned_once_across_sessions(self):
+        log = AnswerLog(self.path)
+        log.record("l01", "hello", True, ts=1.0)
+        log.flush()
+        log = AnswerLog(self.path)  # next app start
+        log.record("l01", "hello", False, ts=2.0)
+        log.record("l01", "new_item", True, ts=3.0)
+        log.flush()
+        self.assertEqual(log.strings, ["l01", "hello", "new_item"])
+        self.assertEqual([r[2] for r in self.rows(log)], ["hello", "hello", "new_item"])
+
+    def test_torn_last_flush_is_cut_off(self):
+        log = AnswerLog(self.path)
+        for i in range(3):
+            log.record("l01", "hello", True, ts=float(i))
+        log.flush()
+        # a crash mid-flush: one column got a row the others did not
+        with open(os.path.join(self.path, "ts.col"), "ab") as f:
+            f.write(b"\0" * 8)
+        self.assertEqual(len(self.rows(log)), 3)
+
+    def test_latency_is_clamped(self):
+        log = AnswerLog(self.path)
+        log.record("l01", "a", True, latency=-1, ts=0.0)
+        log.record("l01", "b", True, latency=10 ** 9, ts=0.0)
+        log.flush()
+        self.assertEqual([r[4] for r in self.rows(log)], [0, 0xFFFFFFFF])
+
+    def test_empty_log(self):
+        log = AnswerLog(self.path)
+        log.flush()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.rows(log), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import random
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import AnswerChecker, _pattern_bits, bounded_edit_distance, normalize_answer  # noqa: E402
+
+
+def levenshtein(a, b):
+    # textbook DP, the reference for the bit-parallel version
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def mutate(rng, s, alphabet, edits):
+    s = list(s)
+    for _ in range(edits):
+        op = rng.randrange(3)
+        i = rng.randrange(len(s) + 1)
+        if op == 0:
+            s.insert(i, rng.choice(alphabet))
+        elif s and op == 1:
+            del s[min(i, len(s) - 1)]
+        elif s:
+            s[min(i, len(s) - 1)] = rng.choice(alphabet)
+    return "".join(s)
+
+
+class BoundedEditDistanceTest(unittest.TestCase):
+    def check(self, a, b, limits):
+        want = levenshtein(a, b)
+        peq = _pattern_bits(a)
+        for limit in limits:
+            got = bounded_edit_distance(a, peq, b, limit)
+            self.assertEqual(got, min(want, limit + 1), (a, b, limit))
+
+    def test_small_cases(self):
+        for a, b in [("", ""), ("", "abc"), ("abc", ""), ("kitten", "sitting"),
+                     ("flaw", "lawn"), ("abc", "abc"), ("a", "b")]:
+            self.check(a, b, range(5))
+
+    def test_random_against_dp(self):
+        rng = random.Random(7)
+        alphabet = "abcde "
+        for _ in range(3000):
+            a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            b = mutate(rng, a, alphabet, rng.randint(0, 4)) if rng.random() < 0.7 else \
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            self.check(a, b, (rng.randint(0, 4),))
+
+    def test_long_phrases_against_dp(self):
+        # several words, well past one machine word of pattern bits
+        rng = random.Random(11)
+        words = ["the", "station", "is", "near", "my", "house", "please", "ticket", "coffee", "à"]
+        for _ in range(150):
+            a = " ".join(rng.choice(words) for _ in range(rng.randint(8, 20)))
+            b = mutate(rng, a, "abcdeéà ", rng.randint(0, 6))
+            self.check(a, b, (0, 1, 2, 3, 8))
+
+    def test_cutoff_on_length_difference(self):
+        self.assertEqual(bounded_edit_distance("abc", _pattern_bits("abc"), "abcdefgh", 2), 3)
+
+
+class AnswerCheckerTest(unittest.TestCase):
+    def test_normalization(self):
+        self.assertEqual(normalize_answer("  Café, s'il vous plaît! "), "cafe s il vous plait")
+
+    def test_verdicts(self):
+        checker = AnswerChecker(["I am going", "I'm going"])
+        self.assertEqual(checker.check("i am GOING!"), ("exact", "I am going"))
+        self.assertEqual(checker.check("I am goign"), ("typo", "I am going"))
+        self.assertEqual(checker.check("you are going"), ("wrong", None))
+
+    def test_short_answers_need_exact_match(self):
+        checker = AnswerChecker("am")
+        self.assertEqual(checker.check("an"), ("wrong", None))
+
+    def test_closest_variant_wins(self):
+        checker = AnswerChecker(["would like", "would love"])
+        self.assertEqual(checker.check("would lik"), ("typo", "would like"))
+        self.assertEqual(checker.check("would lov"), ("typo", "would love"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sys
+import wave
+import shutil
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import AudioClip, ClipCache, FileAudioSink, decode_clip, make_audio_sink  # noqa: E402
+
+
+def fake_decoder(sizes, calls):
+    def decode(path):
+        calls.append(path)
+        if path not in sizes:
+            raise RuntimeError(f"no clip {path}")
+        return AudioClip(path, b"\0" * sizes[path], 1, 2, 8000)
+    return decode
+
+
+class ClipCacheTest(unittest.TestCase):
+    def make(self, sizes, max_bytes=100):
+        self.calls = []
+        cache = ClipCache(max_bytes=max_bytes, decoder=fake_decoder(sizes, self.calls))
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_prefetch_decodes_once(self):
+        cache = self.make({"a": 10})
+        self.assertIsNone(cache.get("a"))
+        clip = cache.prefetch("a").result(timeout=5)
+        self.assertIs(cache.get("a"), clip)
+        self.assertIs(cache.prefetch("a").result(timeout=5), clip)
+        self.assertEqual(self.calls, ["a"])
+        self.assertEqual(cache.bytes, 10)
+
+    def test_concurrent_prefetch_shares_the_future(self):
+        gate = threading.Event()
+        calls = []
+
+        def slow(path):
+            gate.wait(5)
+            calls.append(path)
+            return AudioClip(path, b"\0" * 4, 1, 2, 8000)
+        cache = ClipCache(decoder=slow)
+        self.addCleanup(cache.close)
+        first, second = cache.prefetch("a"), cache.prefetch("a")
+        self.assertIs(first, second)
+        gate.set()
+        first.result(timeout=5)
+        self.assertEqual(calls, ["a"])
+
+    def test_lru_eviction_by_bytes(self):
+        cache = self.make({"a": 40, "b": 40, "c": 40})
+        cache.prefetch("a").result(timeout=5)
+        cache.prefetch("b").result(timeout=5)
+        cache.get("a")  # a is now the most recently used
+        cache.prefetch("c").result(timeout=5)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.bytes, 80)
+
+    def test_oversized_clip_is_kept_alone(self):
+        cache = self.make({"a": 40, "huge": 500})
+        cache.prefetch("a").result(timeout=5)
+        cache.prefetch("huge").result(timeout=5)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("huge"))
+
+    def test_failed_decode_can_be_retried(self):
+        sizes = {}
+        cache = self.make(sizes)
+        with self.assertRaises(RuntimeError):
+            cache.prefetch("a").result(timeout=5)
+        sizes["a"] = 8
+        self.assertEqual(cache.prefetch("a").result(timeout=5).nbytes, 8)
+
+
+class AudioFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="ql_test_audio_")
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+
+    def test_wav_round_trip_through_file_sink(self):
+        src = os.path.join(self.tmp, "hello.wav")
+        with wave.open(src, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\1\0" * 8000)
+        clip = decode_clip(src)
+        self.assertAlmostEqual(clip.duration, 1.0)
+        sink = make_audio_sink("file:" + os.path.join(self.tmp, "out"))
+        self.assertIsInstance(sink, FileAudioSink)
+        sink.play(clip)
+        out = os.path.join(self.tmp, "out", "0001_hello.wav")
+        self.assertEqual(decode_clip(out).frames, clip.frames)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(RuntimeError):
+            decode_clip(os.path.join(self.tmp, "clip.mp3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
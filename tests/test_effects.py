@@ -0,0 +1,143 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import EFFECT_TIMER_MAX_MS, EffectsEngine  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRoot:
+    # enough of a Tk widget for schedule()/unschedule(): after() just records
+    def __init__(self):
+        self.pending = {}
+        self._next = 0
+
+    def winfo_toplevel(self):
+        return self
+
+    def after(self, ms, func, *args):
+        self._next += 1
+        after_id = f"after#{self._next}"
+        self.pending[after_id] = (ms, func, args)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def fire(self):
+        for after_id, (ms, func, args) in list(self.pending.items()):
+            del self.pending[after_id]
+            func(*args)
+
+
+class EffectsEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.root = FakeRoot()
+        self.expired = []
+        self.effects = []
+        self.engine = self.make_engine()
+
+    def make_engine(self):
+        return EffectsEngine(self.effects, clock=self.clock, root=self.root,
+                             on_expire=self.expired.extend)
+
+    def test_activate(self):
+        e = self.engine.activate("xp_boost", {"xp_mult": 2.0}, 900)
+        self.assertEqual(e["start"], self.clock.now)
+        self.assertEqual(e["expires"], self.clock.now + 900)
+        self.assertEqual(self.effects, [e])
+        self.assertEqual(self.engine.active(), [e])
+        self.assertEqual(self.engine.remaining("xp_boost"), 900)
+        self.assertEqual(self.engine.remaining("missing"), 0.0)
+        # one timer, armed just past the expiry
+        [(ms, _, _)] = self.root.pending.values()
+        self.assertEqual(ms, 900 * 1000 + 1)
+
+    def test_extend(self):
+        self.engine.activate("xp_boost", {"xp_mult": 2.0}, 900)
+        self.clock.now += 300
+        e = self.engine.activate("xp_boost", {"xp_mult": 2.0}, 900)
+        self.assertEqual(len(self.effects), 1)
+        self.assertEqual(self.engine.remaining("xp_boost"), 600 + 900)
+        self.assertEqual(len(self.root.pending), 1)
+        # the heap entry for the first expiry is stale and must not end it early
+        self.clock.now += 600
+        self.assertEqual(self.engine.expire(), [])
+        self.assertEqual(self.engine.active(), [e])
+
+    def test_extend_after_expiry_starts_from_now(self):
+        self.engine.activate("xp_boost", {"xp_mult": 2.0}, 60)
+        self.clock.now += 100
+        e = self.engine.activate("xp_boost", {"xp_mult": 2.0}, 60)
+        self.assertEqual(e["expires"], self.clock.now + 60)
+
+    def test_expire(self):
+        self.engine.activate("short", {"xp_mult": 2.0}, 60)
+        self.engine.activate("long", {"xp_mult": 1.5}, 600)
+        self.clock.now += 61
+        self.root.fire()
+        self.assertEqual([e["id"] for e in self.expired], ["short"])
+        self.assertEqual([e["id"] for e in self.effects], ["long"])
+        [(ms, _, _)] = self.root.pending.values()
+        self.assertEqual(ms, (600 - 61) * 1000 + 1)
+        self.clock.now += 600
+        self.root.fire()
+        self.assertEqual([e["id"] for e in self.expired], ["short", "long"])
+        self.assertEqual(self.effects, [])
+        self.assertEqual(self.root.pending, {})
+
+    def test_long_effect_timer_is_capped(self):
+        self.engine.activate("week", {"xp_mult": 2.0}, 7 * 86400)
+        [(ms, _, _)] = self.root.pending.values()
+        self.assertEqual(ms, EFFECT_TIMER_MAX_MS)
+        # an early wakeup just re-arms
+        self.clock.now += EFFECT_TIMER_MAX_MS / 1000
+        self.root.fire()
+        self.assertEqual(self.expired, [])
+        self.assertEqual(len(self.root.pending), 1)
+
+    def test_restart_keeps_running_effects(self):
+        self.engine.activate("xp_boost", {"xp_mult": 2.0}, 900)
+        self.engine.activate("gem_boost", {"gem_mult": 3.0}, 60)
+        # the app closes; the effects list is what save_data persists
+        self.clock.now += 120
+        self.root = FakeRoot()
+        engine = self.make_engine()
+        self.assertEqual([e["id"] for e in self.expired], ["gem_boost"])
+        self.assertEqual([e["id"] for e in self.effects], ["xp_boost"])
+        self.assertEqual(engine.remaining("xp_boost"), 900 - 120)
+        self.assertEqual(len(self.root.pending), 1)
+
+    def test_restart_after_extension(self):
+        self.engine.activate("xp_boost", {"xp_mult": 2.0}, 900)
+        self.engine.activate("xp_boost", {"xp_mult": 2.0}, 900)
+        self.clock.now += 1000
+        engine = self.make_engine()
+        self.assertEqual(self.expired, [])
+        self.assertEqual(engine.remaining("xp_boost"), 800)
+
+    def test_multiplier(self):
+        self.assertEqual(self.engine.multiplier("xp_mult"), 1.0)
+        self.engine.activate("xp_boost", {"xp_mult": 2.0}, 900)
+        self.engine.activate("mega_boost", {"xp_mult": 1.5, "gem_mult": 2.0}, 60)
+        self.assertEqual(self.engine.multiplier("xp_mult"), 3.0)
+        self.assertEqual(self.engine.multiplier("gem_mult"), 2.0)
+        self.assertEqual(self.engine.multiplier("heart_mult"), 1.0)
+        # past its expiry an effect stops counting even before the timer fires
+        self.clock.now += 60
+        self.assertEqual(self.engine.multiplier("xp_mult"), 2.0)
+        self.assertEqual(self.engine.multiplier("xp_mult", now=self.clock.now + 900), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
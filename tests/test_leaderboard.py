@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import random
+import shutil
+import datetime
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import SELF_PROFILE, Leaderboard, LocalLeaderboards, load_profiles, window_start  # noqa: E402
+
+
+class LeaderboardTest(unittest.TestCase):
+    def test_order_and_rank(self):
+        lb = Leaderboard([("a", "Ann", 50), ("b", "Bob", 80), ("c", "Cid", 50)])
+        self.assertEqual(lb.top(3), [(1, "Bob", 80, "b"), (2, "Ann", 50, "a"), (3, "Cid", 50, "c")])
+        self.assertEqual(lb.rank("c"), 3)
+        self.assertIsNone(lb.rank("nobody"))
+        self.assertEqual(lb.rows(1, 2), [(2, "Ann", 50, "a")])
+
+    def test_add_moves_one_entry(self):
+        lb = Leaderboard([("a", "Ann", 50), ("b", "Bob", 80)])
+        lb.add("a", 40)
+        self.assertEqual(lb.rank("a"), 1)
+        self.assertEqual(lb.xp("a"), 90)
+        lb.add("nobody", 10)  # unknown ids are ignored
+        self.assertEqual(len(lb), 2)
+
+    def test_set(self):
+        lb = Leaderboard([("a", "Ann", 50)])
+        lb.set("b", "Bob", 10)
+        lb.set("a", "Ann", 5)
+        self.assertEqual([r[3] for r in lb.top(2)], ["b", "a"])
+
+    def test_matches_a_full_sort(self):
+        rng = random.Random(5)
+        lb = Leaderboard((f"p{i}", f"name {i % 50}", rng.randint(0, 500)) for i in range(500))
+        for _ in range(2000):
+            lb.add(f"p{rng.randrange(500)}", rng.randint(1, 30))
+        want = sorted((-lb.xp(f"p{i}"), f"name {i % 50}", f"p{i}") for i in range(500))
+        self.assertEqual([r[3] for r in lb.top(500)], [pid for _, _, pid in want])
+        for i in range(0, 500, 37):
+            self.assertEqual(lb.rank(want[i][2]), i + 1)
+
+
+class LocalLeaderboardsTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="ql_test_profiles_")
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        # a Wednesday noon, so this week and this month both started earlier
+        self.now = datetime.datetime(2024, 5, 15, 12).timestamp()
+        self.week = window_start("week", self.now)
+        self.month = window_start("month", self.now)
+
+    def write(self, name, obj):
+        with open(os.path.join(self.dir, name), "w", encoding="utf-8") as f:
+            json.dump(obj, f)
+
+    def test_window_start(self):
+        self.assertEqual(datetime.datetime.fromtimestamp(self.week), datetime.datetime(2024, 5, 13))
+        self.assertEqual(datetime.datetime.fromtimestamp(self.month), datetime.datetime(2024, 5, 1))
+        self.assertEqual(window_start("all", self.now), 0)
+
+    def test_windows_and_self(self):
+        self.write("roster.json", {"profiles": [
+            {"id": "old", "name": "Old", "xp": 900, "xp_events": [[self.month - 10, 900]]},
+            {"id": "new", "name": "New", "xp": 60, "xp_events": [[self.week + 10, 60]]},
+        ]})
+        boards = LocalLeaderboards(lambda window: ("Me", 30), self.dir, clock=lambda: self.now)
+        week = boards.board("week")
+        self.assertEqual([r[3] for r in week.top(3)], ["new", SELF_PROFILE, "old"])
+        self.assertEqual(week.xp("old"), 0)
+        self.assertEqual(boards.board("all").top(1)[0][3], "old")
+        boards.record(40, self.now)
+        self.assertEqual(week.rank(SELF_PROFILE), 1)
+        self.assertIs(boards.board("week"), week)  # cached until the window rolls over
+
+    def test_duplicate_profiles_are_merged(self):
+        self.write("a.json", {"id": "x", "name": "X", "xp": 10, "xp_events": [[1, 10]]})
+        self.write("b.json", [{"id": "x", "name": "X", "xp": 30, "xp_events": [[1, 10], [2, 20]]}])
+        with open(os.path.join(self.dir, "broken.json"), "w", encoding="utf-8") as f:
+            f.write("{not json")
+        profiles = load_profiles(self.dir)
+        self.assertEqual(profiles["x"]["xp"], 30)
+        self.assertEqual(profiles["x"]["events"], [[1, 10], [2, 20]])
+
+
+if __name__ == "__main__":
+    unittest.main()
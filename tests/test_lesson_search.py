@@ -0,0 +1,90 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import LessonSearch, bind_debounced  # noqa: E402
+
+
+def entry(lid, title, subtitle="", items=(), phrases=()):
+    return {"meta": {"id": lid, "title": title, "subtitle": subtitle}, "path": f"/nonexistent/{lid}.py",
+            "review_items": list(items), "phrases": list(phrases)}
+
+
+LESSONS = [
+    entry("greet", "Greetings", "Say hello", items=[{"id": "h", "q": "Hello!", "a": "Hello!"}]),
+    entry("food", "Ordering food", "At the café", phrases=["The bill, please."]),
+    entry("plans", "Weekend plans", "Fill in the blank"),
+]
+
+
+class LessonSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.index = LessonSearch()
+        self.index.update_from_lessons(LESSONS)
+
+    def test_empty_query_is_no_filter(self):
+        self.assertIsNone(self.index.search(""))
+        self.assertIsNone(self.index.search("  ,! "))
+
+    def test_prefix_and_all_tokens(self):
+        self.assertEqual(self.index.search("gree"), {"greet"})
+        self.assertEqual(self.index.search("cafe"), {"food"})  # accents folded
+        self.assertEqual(self.index.search("BILL plea"), {"food"})
+        self.assertEqual(self.index.search("the"), {"food", "plans"})
+        self.assertEqual(self.index.search("the bill"), {"food"})
+        self.assertEqual(self.index.search("zebra"), set())
+
+    def test_item_text_is_indexed(self):
+        self.assertEqual(self.index.search("hello"), {"greet"})
+
+    def test_update_and_remove(self):
+        changed = entry("plans", "Holiday plans", "Fill in the blank")
+        self.assertTrue(self.index.update("plans", (2, 2), changed))
+        self.assertEqual(self.index.search("weekend"), set())
+        self.assertEqual(self.index.search("holiday"), {"plans"})
+        # same signature: not re-indexed
+        self.assertFalse(self.index.update("plans", (2, 2), changed))
+        self.index.update_from_lessons(LESSONS[:1])
+        self.assertEqual(self.index.search("bill"), set())
+        self.assertNotIn("bill", self.index._vocab)
+        self.assertEqual(self.index._vocab, sorted(self.index._vocab))
+
+
+class FakeEntry:
+    def __init__(self):
+        self.bindings = {}
+        self.pending = {}
+        self._n = 0
+
+    def bind(self, sequence, fn):
+        self.bindings[sequence] = fn
+
+    def winfo_toplevel(self):
+        return self
+
+    def after(self, ms, fn, *args):
+        self._n += 1
+        self.pending[self._n] = fn
+        return self._n
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+
+class DebounceTest(unittest.TestCase):
+    def test_one_call_per_pause(self):
+        widget = FakeEntry()
+        calls = []
+        bind_debounced(widget, "<KeyRelease>", 150, lambda: calls.append(1))
+        for _ in range(10):
+            widget.bindings["<KeyRelease>"](None)
+        self.assertEqual(len(widget.pending), 1)
+        for fn in list(widget.pending.values()):
+            fn()
+        self.assertEqual(calls, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
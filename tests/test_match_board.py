@@ -0,0 +1,77 @@
+import os
+import sys
+import random
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import MatchBoard  # noqa: E402
+
+
+def pairs(n):
+    return [{"id": f"p{i}", "left": f"word {i}", "right": "same text"} for i in range(n)]
+
+
+class MatchBoardTest(unittest.TestCase):
+    def test_match_and_miss(self):
+        board = MatchBoard(pairs(3))
+        self.assertEqual(board.click("L", "p0"), (MatchBoard.SELECT, [("L", "p0")]))
+        self.assertEqual(board.click("R", "p1"), (MatchBoard.MISS, [("L", "p0"), ("R", "p1")]))
+        self.assertEqual(board.misses, 1)
+        board.click("R", "p1")
+        self.assertEqual(board.click("L", "p1"), (MatchBoard.OK, [("R", "p1"), ("L", "p1")]))
+        self.assertEqual(board.score, 1)
+        # matched pairs ignore further clicks
+        self.assertEqual(board.click("L", "p1"), (MatchBoard.IGNORED, []))
+
+    def test_reselect_on_same_side(self):
+        board = MatchBoard(pairs(3))
+        board.click("L", "p0")
+        self.assertEqual(board.click("L", "p2"), (MatchBoard.SELECT, [("L", "p0"), ("L", "p2")]))
+        self.assertEqual(board.click("L", "p2"), (MatchBoard.SELECT, [("L", "p2")]))
+        self.assertEqual(board.selected, ("L", "p2"))
+
+    def test_duplicate_display_texts_match_by_id(self):
+        board = MatchBoard(pairs(2))  # every right side reads "same text"
+        board.click("L", "p0")
+        self.assertEqual(board.click("R", "p1")[0], MatchBoard.MISS)
+
+    def test_pages(self):
+        rng = random.Random(1)
+        board = MatchBoard(pairs(7), page_size=3, rng=rng)
+        self.assertEqual([len(p) for p in board.pages], [3, 3, 1])
+        seen = []
+        while True:
+            left, right = board.layout()
+            self.assertEqual(sorted(left), sorted(right))
+            for pid in left:
+                board.click("L", pid)
+                self.assertEqual(board.click("R", pid)[0], MatchBoard.OK)
+            seen.extend(left)
+            self.assertTrue(board.page_done)
+            if not board.next_page():
+                break
+        self.assertEqual(sorted(seen), sorted(p["id"] for p in pairs(7)))
+        self.assertTrue(board.done)
+
+    def test_time_limit(self):
+        now = [0.0]
+        board = MatchBoard(pairs(2), time_limit=30, clock=lambda: now[0])
+        self.assertEqual(board.time_left(), 30)
+        now[0] = 31
+        self.assertTrue(board.expired)
+        self.assertTrue(board.done)
+        self.assertEqual(board.click("L", "p0"), (MatchBoard.IGNORED, []))
+
+    def test_untimed(self):
+        board = MatchBoard(pairs(1))
+        self.assertIsNone(board.time_left())
+        self.assertFalse(board.expired)
+
+    def test_ids_default_to_position(self):
+        board = MatchBoard([{"left": "a", "right": "b"}, {"left": "c", "right": "d"}])
+        self.assertEqual(sorted(board.pairs), ["0", "1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
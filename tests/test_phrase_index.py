@@ -0,0 +1,88 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import PhraseIndex  # noqa: E402
+
+FOOD = ["The bill, please.", "The table, please.", "Can I have water?", "Can I have sugar?"]
+GREETINGS = ["Hello!", "Goodbye!", "Good morning!", "Good night!"]
+
+
+class PhraseIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp(prefix="ql_test_phrases_")
+        self.addCleanup(shutil.rmtree, tmp, True)
+        self.path = os.path.join(tmp, "phrase_index.jsonl")
+
+    def lines(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_distractors_are_similar_phrases(self):
+        idx = PhraseIndex(self.path)
+        idx.update_lesson("food", [1, 1], FOOD)
+        idx.update_lesson("greetings", [1, 1], GREETINGS)
+        self.assertEqual(idx.distractors("The bill, please.", k=1), ["The table, please."])
+        out = idx.distractors("Good morning!", k=3, exclude=["Good night!"])
+        self.assertEqual(len(out), 3)
+        self.assertNotIn("Good morning!", out)
+        self.assertNotIn("Good night!", out)
+
+    def test_round_trip(self):
+        idx = PhraseIndex(self.path)
+        idx.update_lesson("food", [1, 1], FOOD)
+        idx.update_lesson("greetings", [1, 1], GREETINGS)
+        idx.save()
+        loaded = PhraseIndex.load(self.path)
+        self.assertEqual(loaded.sources.keys(), idx.sources.keys())
+        self.assertEqual(sorted(p for p in loaded.phrases if p), sorted(FOOD + GREETINGS))
+        for phrase in FOOD + GREETINGS:
+            self.assertEqual(loaded.distractors(phrase, k=2), idx.distractors(phrase, k=2))
+        # unchanged signatures are not reindexed
+        self.assertFalse(loaded.update_lesson("food", [1, 1], FOOD))
+
+    def test_save_appends_only_changed_lessons(self):
+        idx = PhraseIndex(self.path)
+        idx.update_lesson("food", [1, 1], FOOD)
+        idx.update_lesson("greetings", [1, 1], GREETINGS)
+        idx.save()
+        before = self.lines()
+        idx.update_lesson("food", [2, 1], FOOD[:2] + ["Can I have tea?"])
+        idx.remove_lesson("greetings")
+        idx.save()
+        after = self.lines()
+        self.assertEqual(after[:len(before)], before)
+        self.assertEqual(len(after), len(before) + 2)
+        loaded = PhraseIndex.load(self.path)
+        self.assertEqual(list(loaded.sources), ["food"])
+        self.assertEqual(sorted(p for p in loaded.phrases if p),
+                         sorted(FOOD[:2] + ["Can I have tea?"]))
+
+    def test_journal_is_compacted(self):
+        idx = PhraseIndex(self.path)
+        for n in range(200):
+            idx.update_lesson("food", [n, 1], FOOD)
+            idx.save()
+        self.assertLess(len(self.lines()), 80)
+        self.assertEqual(PhraseIndex.load(self.path).sources["food"]["sig"], [199, 1])
+
+    def test_torn_last_line(self):
+        idx = PhraseIndex(self.path)
+        idx.update_lesson("food", [1, 1], FOOD)
+        idx.save()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"lesson": "greetings", "sig": [1, 1], "phr')
+        loaded = PhraseIndex.load(self.path)
+        self.assertEqual(list(loaded.sources), ["food"])
+        # the next save must not append after the fragment
+        loaded.update_lesson("greetings", [1, 1], GREETINGS)
+        loaded.save()
+        self.assertEqual(sorted(PhraseIndex.load(self.path).sources), ["food", "greetings"])
+
+
+if __name__ == "__main__":
+    unittest.main()
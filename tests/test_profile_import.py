@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import import_profiles, iter_profiles  # noqa: E402
+
+
+def profile(n, events):
+    return {"id": f"learner_{n:05d}", "name": f"Learner {n}",
+            "xp": sum(e[1] for e in events), "xp_events": events}
+
+
+class ImportProfilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="ql_test_import_")
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.src = os.path.join(self.tmp, "export.ndjson")
+        self.profiles_dir = os.path.join(self.tmp, "profiles")
+
+    def write_export(self, records):
+        with open(self.src, "w", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec) + "\n")
+
+    def ids_on_disk(self):
+        return [pid for pid, _ in iter_profiles(self.profiles_dir)]
+
+    def test_duplicates_across_batches_land_in_one_file(self):
+        # 100 learners, then 20 of them again with newer events, batches of 30
+        records = [profile(n, [[1000 + n, 10]]) for n in range(100)]
+        records += [profile(n, [[5000 + n, 20]]) for n in range(0, 100, 5)]
+        self.write_export(records)
+        state = import_profiles(self.src, self.profiles_dir, batch_size=30)
+
+        ids = self.ids_on_disk()
+        self.assertEqual(len(ids), 100)
+        self.assertEqual(len(set(ids)), 100)
+        self.assertEqual(state["imported"], 100)
+        self.assertEqual(state["duplicates"], 20)
+        self.assertEqual(state["files"], 4)
+        self.assertEqual(ids, sorted(ids))
+        merged = dict(iter_profiles(self.profiles_dir))["learner_00005"]
+        self.assertEqual(merged["xp_events"], [[1005, 10], [5005, 20]])
+        self.assertFalse(os.path.exists(self.src + ".import.db"))
+
+    def test_resume_keeps_ids_unique(self):
+        records = [profile(n, [[1000 + n, 10]]) for n in range(60)]
+        records += [profile(n, [[5000 + n, 20]]) for n in range(10)]
+        self.write_export(records)
+
+        class Interrupt(Exception):
+            pass
+
+        def stop_after_first_batch(state):
+            if state["batch"] == 1:
+                raise Interrupt()
+        with self.assertRaises(Interrupt):
+            import_profiles(self.src, self.profiles_dir, batch_size=25, report=stop_after_first_batch)
+        state = import_profiles(self.src, self.profiles_dir, batch_size=25)
+
+        ids = self.ids_on_disk()
+        self.assertEqual(sorted(ids), sorted(set(ids)))
+        self.assertEqual(len(ids), 60)
+        self.assertEqual(state["duplicates"], 10)
+
+    def test_reimport_replaces_old_files(self):
+        self.write_export([profile(n, [[1000 + n, 10]]) for n in range(50)])
+        import_profiles(self.src, self.profiles_dir, batch_size=10)
+        self.write_export([profile(n, [[1000 + n, 10]]) for n in range(15)])
+        state = import_profiles(self.src, self.profiles_dir, batch_size=10)
+        self.assertEqual(state["files"], 2)
+        self.assertEqual(len(os.listdir(self.profiles_dir)), 2)
+
+    def test_bad_replica_is_invalid(self):
+        good = {"xp": {"d": 9}, "gems": {"d": [5, 1]}, "adds": {"hat": ["d:1"]},
+                "settings": {"theme": [1, "d", "dark"]}}
+        self.write_export([
+            dict(profile(1, [[1, 10]]), replica=good),
+            dict(profile(1, [[2, 10]]), replica={"xp": {"d": "9"}}),
+            dict(profile(1, [[3, 10]]), replica={"gems": {"d": [5]}}),
+            dict(profile(1, [[4, 10]]), replica={"adds": {"hat": "d:1"}}),
+            dict(profile(1, [[5, 10]]), replica=dict(good, xp={"e": 4})),
+        ])
+        state = import_profiles(self.src, self.profiles_dir)
+        self.assertEqual(state["invalid"], 3)
+        self.assertEqual(len(state["errors"]), 3)
+        self.assertTrue(state["errors"][0].startswith("line 2: bad replica 'xp'"))
+        merged = dict(iter_profiles(self.profiles_dir))["learner_00001"]
+        self.assertEqual(merged["replica"]["xp"], {"d": 9, "e": 4})
+        self.assertEqual(merged["xp"], 13)  # the merged replica's xp
+        self.assertEqual(merged["xp_events"], [[1, 10], [5, 10]])
+
+    def test_unmergeable_records_are_counted(self):
+        # replicas that pass validation but still break the merge
+        import Main
+        original = Main.merge_profile
+
+        def broken(a, b):
+            if b["xp_events"][0][0] == 2:
+                raise TypeError("boom")
+            return original(a, b)
+        Main.merge_profile = broken
+        self.addCleanup(setattr, Main, "merge_profile", original)
+        self.write_export([profile(1, [[1, 10]]), profile(1, [[2, 10]]), profile(1, [[3, 10]])])
+        state = import_profiles(self.src, self.profiles_dir, batch_size=1)
+        self.assertEqual(state["invalid"], 1)
+        self.assertIn("cannot merge 'learner_00001'", state["errors"][0])
+        merged = dict(iter_profiles(self.profiles_dir))["learner_00001"]
+        self.assertEqual(merged["xp_events"], [[1, 10], [3, 10]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import copy
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import ProgressReplica, ShopCatalog  # noqa: E402
+
+CATALOG = ShopCatalog([
+    {"id": "streak_freeze", "price": 10, "consumable": True},
+    {"id": "dark_theme", "price": 50},
+])
+
+
+def replica(device, state=None):
+    return ProgressReplica(copy.deepcopy(state) if state is not None else None, device)
+
+
+def merged(*replicas):
+    out = replica("")
+    for r in replicas:
+        out.merge(copy.deepcopy(r.state))
+    return out
+
+
+class ProgressReplicaTest(unittest.TestCase):
+    def two_devices(self):
+        a, b = replica("a"), replica("b")
+        a.add_gems(30)
+        a.add_gems(-10)
+        a.add_xp(20)
+        a.complete("l01", 100)
+        b.add_gems(5)
+        b.add_xp(7)
+        b.complete("l01", 200)
+        b.complete("l02", 150)
+        a.add_stock("streak_freeze", 2)
+        b.add_stock("streak_freeze", -1)
+        return a, b
+
+    def test_merge_adds_up_devices(self):
+        a, b = self.two_devices()
+        m = merged(a, b)
+        self.assertEqual(m.gems(), 25)
+        self.assertEqual(m.xp(), 27)
+        self.assertEqual(m.stock("streak_freeze"), 1)
+        data = m.materialize({})
+        self.assertEqual(data["completed_lessons"]["l01"], {"times": 2, "last_completed": 200})
+        self.assertEqual(data["completed_lessons"]["l02"], {"times": 1, "last_completed": 150})
+        self.assertEqual(data["inventory"], {"streak_freeze": 1})
+
+    def test_merge_is_commutative_and_idempotent(self):
+        a, b = self.two_devices()
+        ab, ba = merged(a, b), merged(b, a)
+        self.assertEqual(ab.state, ba.state)
+        again = merged(a, b, a, b)
+        again.merge(copy.deepcopy(ab.state))
+        self.assertEqual(again.state, ab.state)
+
+    def test_stale_copy_does_not_undo_progress(self):
+        a = replica("a")
+        a.add_xp(10)
+        old = copy.deepcopy(a.state)
+        a.add_xp(5)
+        a.merge(old)
+        self.assertEqual(a.xp(), 15)
+
+    def test_concurrent_add_wins_over_remove(self):
+        a = replica("a")
+        a.add_item("dark_theme")
+        b = replica("b", a.state)
+        b.remove_item("dark_theme")
+        self.assertEqual(b.owned(), [])
+        a.add_item("dark_theme")  # bought again before seeing the removal
+        self.assertEqual(merged(a, b).owned(), ["dark_theme"])
+        b.merge(copy.deepcopy(a.state))
+        b.remove_item("dark_theme")
+        self.assertEqual(merged(a, b).owned(), [])
+
+    def test_settings_last_writer_wins(self):
+        a, b = replica("a"), replica("b")
+        a.set_setting("theme", "dark", ts=10)
+        b.set_setting("theme", "light", ts=20)
+        a.set_setting("daily_goal", 30, ts=5)
+        m = merged(a, b)
+        self.assertEqual(m.state["settings"]["theme"][2], "light")
+        self.assertEqual(merged(b, a).state, m.state)
+        self.assertEqual(m.materialize({})["settings"], {"theme": "light", "daily_goal": 30})
+
+    def test_seed_counts_one_old_save_once(self):
+        old = {"gems": 40, "xp": 100, "inventory": {"dark_theme": 1, "streak_freeze": 2},
+               "completed_lessons": {"l01": {"times": 3, "last_completed": 50}}}
+        a = ProgressReplica.seed(old, "a", CATALOG)
+        b = ProgressReplica.seed(copy.deepcopy(old), "b", CATALOG)
+        m = merged(a, b)
+        self.assertEqual((m.gems(), m.xp()), (40, 100))
+        data = m.materialize({})
+        self.assertEqual(data["inventory"], {"dark_theme": 1, "streak_freeze": 2})
+        self.assertEqual(data["completed_lessons"]["l01"]["times"], 3)
+        # a different save adds up
+        other = ProgressReplica.seed(dict(old, gems=1), "c", CATALOG)
+        self.assertEqual(merged(a, other).gems(), 41)
+
+
+if __name__ == "__main__":
+    unittest.main()
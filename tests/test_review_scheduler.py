@@ -0,0 +1,89 @@
+import os
+import sys
+import random
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import SRS_DAY, SRS_RELEARN, ReviewScheduler  # noqa: E402
+
+NOW = 1_700_000_000.0
+
+
+class ReviewSchedulerTest(unittest.TestCase):
+    def make(self, n=5, state=None):
+        srs = ReviewScheduler({} if state is None else state, clock=lambda: NOW)
+        srs.set_items((f"k{i}", {"q": f"question {i}"}) for i in range(n))
+        return srs
+
+    def test_new_items_are_due(self):
+        srs = self.make(3)
+        self.assertTrue(srs.has_due())
+        self.assertEqual(sorted(k for k, _ in srs.session(10)), ["k0", "k1", "k2"])
+
+    def test_session_is_limited_and_keeps_items_scheduled(self):
+        srs = self.make(8)
+        self.assertEqual(len(srs.session(3)), 3)
+        # nothing was graded, so the same items are still due
+        self.assertEqual(len(srs.session(10)), 8)
+
+    def test_intervals_grow_on_correct_answers(self):
+        srs = self.make(1)
+        now = NOW
+        intervals = []
+        for _ in range(4):
+            srs.grade("k0", True, now=now)
+            ease, interval, reps, due = srs.state["k0"]
+            intervals.append(interval)
+            self.assertEqual(due, now + interval * SRS_DAY)
+            now = due
+        self.assertEqual(intervals[:2], [1, 6])
+        self.assertGreater(intervals[2], 6)
+        self.assertGreater(intervals[3], intervals[2])
+
+    def test_wrong_answer_relearns_soon(self):
+        srs = self.make(1)
+        srs.grade("k0", True, now=NOW)
+        srs.grade("k0", False, now=NOW + SRS_DAY)
+        ease, interval, reps, due = srs.state["k0"]
+        self.assertEqual((interval, reps), (0, 0))
+        self.assertEqual(due, NOW + SRS_DAY + SRS_RELEARN)
+        self.assertGreaterEqual(ease, 1.3)
+
+    def test_graded_items_leave_the_due_set(self):
+        srs = self.make(3)
+        for key, _ in srs.session(10):
+            srs.grade(key, True, now=NOW)
+        self.assertFalse(srs.has_due(now=NOW))
+        self.assertEqual(srs.session(10, now=NOW), [])
+        self.assertEqual(len(srs.session(10, now=NOW + SRS_DAY)), 3)
+
+    def test_session_is_ordered_by_due_time(self):
+        state = {f"k{i}": [2.5, 1, 1, NOW - 100 * i] for i in range(5)}
+        srs = self.make(5, state)
+        self.assertEqual([k for k, _ in srs.session(5)], ["k4", "k3", "k2", "k1", "k0"])
+
+    def test_uninstalled_items_are_skipped(self):
+        state = {"gone": [2.5, 1, 1, NOW - 10]}
+        srs = self.make(2, state)
+        self.assertNotIn("gone", [k for k, _ in srs.session(10)])
+        srs.grade("gone", True)  # still graded into state, never scheduled
+        self.assertIn("gone", srs.state)
+
+    def test_matches_a_full_scan(self):
+        # random grading; the heap's answer must equal sorting everything
+        rng = random.Random(3)
+        srs = self.make(200)
+        now = NOW
+        for _ in range(2000):
+            key = f"k{rng.randrange(200)}"
+            srs.grade(key, rng.random() < 0.7, now=now)
+            now += rng.randint(0, 3 * 3600)
+        due = sorted((srs._due(k), k) for k in srs.items if srs._due(k) <= now)
+        got = srs.session(len(due) + 5, now=now)
+        self.assertEqual([k for k, _ in got], [k for _, k in due])
+        self.assertLessEqual(len(srs._heap), 2 * len(srs.items) + 64 + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
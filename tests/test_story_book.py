@@ -0,0 +1,91 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import StoryBook  # noqa: E402
+
+STORY = """Alex walks into a café.
+They smile and say: "Hello!"
+
+Alex wants to drink something cold.
+
+?? What does Alex want? | A cold drink | A pizza | A map
+
+The waiter brings water.
+?? What does the waiter bring? | Water | Tea | Bread
+"""
+
+
+def pages(book):
+    out, n = [], 0
+    while book.page(n) is not None:
+        out.append(book.page(n))
+        n += 1
+    return out
+
+
+class StoryBookTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp(prefix="ql_test_story_")
+        self.addCleanup(shutil.rmtree, tmp, True)
+        self.path = os.path.join(tmp, "story.txt")
+
+    def write(self, text):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_pages_and_questions(self):
+        got = pages(StoryBook(text=STORY))
+        self.assertEqual(len(got), 2)
+        self.assertEqual(got[0]["text"], 'Alex walks into a café. They smile and say: "Hello!"\n\n'
+                                         "Alex wants to drink something cold.")
+        q = got[0]["question"]
+        self.assertEqual(q["q"], "What does Alex want?")
+        self.assertEqual(q["a"], "A cold drink")
+        self.assertEqual(sorted(q["choices"]), ["A cold drink", "A map", "A pizza"])
+        self.assertEqual(q["id"], "what_does_alex_want")
+        self.assertEqual(got[1]["question"]["a"], "Water")
+
+    def test_file_chunks_match_text(self):
+        # tiny chunks split lines and paragraphs at every possible point
+        self.write(STORY)
+        want = pages(StoryBook(text=STORY))
+        for chunk in (1, 2, 3, 7, 64):
+            book = StoryBook(self.path, chunk_size=chunk)
+            self.assertEqual(pages(book), want, chunk)
+            self.assertTrue(book.finished)
+
+    def test_page_size(self):
+        text = "\n\n".join(f"Paragraph {i} " + "word " * 40 for i in range(50))
+        book = StoryBook(text=text, page_chars=600)
+        got = pages(book)
+        self.assertGreater(len(got), 5)
+        self.assertEqual(sum(p["text"].count("Paragraph") for p in got), 50)
+        for p in got[:-1]:
+            self.assertGreaterEqual(len(p["text"]), 600)
+
+    def test_huge_paragraph_is_split(self):
+        text = "\n".join("a long line of one endless paragraph" for _ in range(400))
+        got = pages(StoryBook(text=text, page_chars=500))
+        self.assertGreater(len(got), 5)
+        self.assertTrue(all(len(p["text"]) <= 1100 for p in got))
+
+    def test_lazy(self):
+        self.write(STORY * 1000)
+        book = StoryBook(self.path, chunk_size=256)
+        self.assertIsNotNone(book.page(0))
+        self.assertEqual(len(book.pages), 1)
+        self.assertFalse(book.finished)
+        book.close()
+
+    def test_empty(self):
+        self.assertIsNone(StoryBook(text="").page(0))
+        self.assertIsNone(StoryBook(text="\n\n\n").page(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
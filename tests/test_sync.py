@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+import queue
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import SyncClient, SyncServerThread, SyncStore  # noqa: E402
+
+
+def wait_for(cond, timeout=5.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if cond():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class SyncStoreTest(unittest.TestCase):
+    def test_resent_deltas_are_dropped(self):
+        store = SyncStore()
+        batch = [{"device": "a", "seq": 1, "type": "xp", "n": 5},
+                 {"device": "a", "seq": 2, "type": "xp", "n": 5}]
+        self.assertEqual(store.push("u", batch), (2, 2))
+        # the same batch again after a crash, plus one new delta
+        self.assertEqual(store.push("u", batch + [{"device": "a", "seq": 3}]), (3, 1))
+        chunk, cursor, more = store.pull("u", 1)
+        self.assertEqual([d["seq"] for d in chunk], [2, 3])
+        self.assertEqual((cursor, more), (3, False))
+
+
+class SyncClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = SyncServerThread().start()
+        self.addCleanup(self.server.stop)
+
+    def client(self, user, device, **kwargs):
+        host, port = self.server.address
+        c = SyncClient(host, port, user, device, batch_ms=20, **kwargs).start()
+        self.addCleanup(c.close)
+        return c
+
+    def test_acked_seq_and_pending(self):
+        a = self.client("u", "a", seq=2, pending=[{"type": "xp", "n": 1, "device": "a", "seq": 2}])
+        sent = a.push({"type": "xp", "n": 4})
+        self.assertEqual(sent["seq"], 3)
+        self.assertTrue(wait_for(lambda: a.acked_seq == 3))
+        b = self.client("u", "b")
+        got = []
+
+        def received():
+            try:
+                got.extend(b.incoming.get_nowait()[0])
+            except queue.Empty:
+                pass
+            return len(got) == 2
+        self.assertTrue(wait_for(received))
+        self.assertEqual([d["seq"] for d in got], [2, 3])
+        self.assertEqual(a.close(), [])
+
+    def test_rejected_batch_is_handed_back(self):
+        c = self.client("not a valid user!", "a")
+        c.push({"type": "gems", "n": 5})
+        deltas, error = c.rejected.get(timeout=5)
+        self.assertEqual([d["seq"] for d in deltas], [1])
+        self.assertIn("bad user name", error)
+        self.assertEqual(c.acked_seq, 1)
+        self.assertEqual(c.close(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
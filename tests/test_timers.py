@@ -0,0 +1,124 @@
+import os
+import sys
+import itertools
+import unittest
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import CLOCK, Clock, TimerRegistry, frozen_widget_after  # noqa: E402
+
+
+class FakeWidget:
+    # after()/after_idle() that only run when the test says so; like Tk's,
+    # after ids are unique across widgets
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.pending = {}
+        self.bindings = {}
+
+    def after(self, ms, fn, *args):
+        after_id = f"after#{next(self.ids)}"
+        self.pending[after_id] = fn
+        return after_id
+
+    def after_idle(self, fn, *args):
+        return self.after(0, fn)
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def bind(self, sequence, fn, add=None):
+        self.bindings.setdefault(sequence, []).append(fn)
+
+    def fire(self, after_id):
+        self.pending.pop(after_id)()
+
+    def destroy(self):
+        event = type("Event", (), {"widget": self})()
+        for fn in self.bindings.get("<Destroy>", []):
+            fn(event)
+
+
+class TimerRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerRegistry(clock=Clock())
+        self.calls = []
+
+    def test_fire_and_cancel(self):
+        w = FakeWidget()
+        a = self.timers.after(w, 100, self.calls.append, "a")
+        b = self.timers.after_idle(w, self.calls.append, "b")
+        self.assertEqual(self.timers.count(w), 2)
+        w.fire(a)
+        self.assertEqual(self.calls, ["a"])
+        self.assertEqual(self.timers.count(w), 1)
+        self.timers.cancel(b)
+        self.assertEqual(w.pending, {})
+        self.assertEqual(self.timers.live, 0)
+        self.timers.cancel(b)  # cancelling twice is harmless
+
+    def test_destroy_cancels_the_owners_timers(self):
+        w, other = FakeWidget(), FakeWidget()
+        self.timers.after(w, 100, self.calls.append, 1)
+        self.timers.after(w, 200, self.calls.append, 2)
+        self.timers.after(other, 100, self.calls.append, 3)
+        self.assertEqual(len(w.bindings["<Destroy>"]), 1)  # bound once per owner
+        w.destroy()
+        self.assertEqual(w.pending, {})
+        self.assertEqual(self.timers.count(w), 0)
+        self.assertEqual(self.timers.live, 1)
+
+    def test_frozen_clock_fires_in_due_order(self):
+        self.timers.clock.freeze(1000)
+        w = FakeWidget()
+        self.timers.after(w, 300, self.calls.append, "late")
+        self.timers.after(w, 100, self.calls.append, "early")
+        cancelled = self.timers.after(w, 200, self.calls.append, "cancelled")
+        self.assertEqual(w.pending, {})  # nothing handed to Tk
+        self.timers.cancel(cancelled)
+        self.timers.advance(0.15)
+        self.assertEqual(self.calls, ["early"])
+        self.assertAlmostEqual(self.timers.clock.time(), 1000.15)
+        self.timers.advance(1)
+        self.assertEqual(self.calls, ["early", "late"])
+        self.assertEqual(self.timers.live, 0)
+
+    def test_timers_scheduled_while_advancing(self):
+        self.timers.clock.freeze(0)
+        w = FakeWidget()
+
+        def tick(n):
+            self.calls.append((n, self.timers.clock.time()))
+            if n < 3:
+                self.timers.after(w, 100, tick, n + 1)
+        self.timers.after(w, 100, tick, 1)
+        self.timers.advance(1)
+        self.assertEqual([n for n, _ in self.calls], [1, 2, 3])
+        self.assertAlmostEqual(self.calls[-1][1], 0.3)
+
+
+class FrozenWidgetAfterTest(unittest.TestCase):
+    def test_raw_after_runs_on_virtual_time(self):
+        class Root(FakeWidget):
+            def winfo_toplevel(self):
+                return self
+        root = Root()
+        root.timers = TimerRegistry()
+        calls = []
+        CLOCK.freeze(500)
+        self.addCleanup(CLOCK.thaw)
+        with frozen_widget_after():
+            kept = tk.Misc.after(root, 100, calls.append, "kept")
+            dropped = tk.Misc.after(root, 100, calls.append, "dropped")
+            tk.Misc.after_cancel(root, dropped)
+            self.assertTrue(kept.startswith("virtual#"))
+            self.assertEqual(root.pending, {})
+            root.timers.advance(0.2)
+        self.assertEqual(calls, ["kept"])
+        self.assertEqual(tk.Misc.after.__qualname__, "Misc.after")
+
+
+if __name__ == "__main__":
+    unittest.main()
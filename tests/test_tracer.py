@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Main  # noqa: E402
+from Main import Tracer  # noqa: E402
+
+
+class TracerTest(unittest.TestCase):
+    def test_disabled_spans_record_nothing(self):
+        tracer = Tracer()
+        with tracer.span("load"):
+            pass
+        self.assertIs(tracer.span("load"), tracer.span("load"))  # shared idle span
+        self.assertEqual(tracer.events, [])
+
+    def test_spans_and_args(self):
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("build", cat="plugin", lesson="l01"):
+            pass
+        (name, cat, t0, t1, _tid, args), = tracer.events
+        self.assertEqual((name, cat, args), ("build", "plugin", {"lesson": "l01"}))
+        self.assertLessEqual(t0, t1)
+
+    def test_decorator_follows_enable(self):
+        tracer = Tracer()
+
+        @tracer.span("work")
+        def work(x):
+            return x * 2
+        self.assertEqual(work(2), 4)
+        self.assertEqual(tracer.events, [])
+        tracer.enable()
+        work(3)
+        tracer.disable()
+        work(4)
+        self.assertEqual([e[0] for e in tracer.events], ["work"])
+
+    def test_decorator_records_on_error(self):
+        tracer = Tracer()
+        tracer.enable()
+
+        @tracer.span("fails")
+        def fails():
+            raise ValueError("boom")
+        with self.assertRaises(ValueError):
+            fails()
+        self.assertEqual([e[0] for e in tracer.events], ["fails"])
+
+    def test_event_cap(self):
+        tracer = Tracer()
+        tracer.enable()
+        with mock.patch.object(Main, "TRACE_MAX_EVENTS", 3):
+            for _ in range(5):
+                tracer.add("x", "app", 0.0, 0.0)
+        self.assertEqual(len(tracer.events), 3)
+        self.assertEqual(tracer.dropped, 2)
+
+    def test_chrome_export(self):
+        tracer = Tracer()
+        tracer.enable()
+        tracer.add("save_data", "app", tracer._t0 + 0.001, tracer._t0 + 0.003, {"n": 1})
+        tmp = tempfile.mkdtemp(prefix="ql_test_trace_")
+        self.addCleanup(shutil.rmtree, tmp, True)
+        path = os.path.join(tmp, "trace.json")
+        tracer.export(path)
+        with open(path, "r", encoding="utf-8") as f:
+            out = json.load(f)
+        spans = [e for e in out["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual(len(spans), 1)
+        self.assertEqual((spans[0]["ts"], spans[0]["dur"]), (1000.0, 2000.0))
+        self.assertEqual(spans[0]["args"], {"n": 1})
+        self.assertEqual(out["otherData"], {"dropped": 0})
+        self.assertTrue(any(e["name"] == "thread_name" for e in out["traceEvents"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
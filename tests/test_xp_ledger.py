@@ -0,0 +1,95 @@
+import os
+import sys
+import datetime
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import XP_DAY_BUCKETS, XPLedger, local_day, month_of, week_of  # noqa: E402
+
+START = datetime.datetime(2024, 5, 13, 12)  # a Monday noon
+
+
+def ts(day_offset, hour=12):
+    return int((START + datetime.timedelta(days=day_offset, hours=hour - 12)).timestamp())
+
+
+class Freezes:
+    def __init__(self, n):
+        self.n = n
+
+    def __call__(self):
+        if self.n <= 0:
+            return False
+        self.n -= 1
+        return True
+
+
+class XPLedgerTest(unittest.TestCase):
+    def test_rollups(self):
+        ledger = XPLedger({})
+        ledger.record(10, ts(0))
+        ledger.record(5, ts(0, hour=20))
+        ledger.record(7, ts(3))
+        day = local_day(ts(0))
+        self.assertEqual(ledger.day_xp(day), 15)
+        self.assertEqual(ledger.day_xp(day + 1), 0)
+        self.assertEqual(ledger.week_xp(day), 22)
+        self.assertEqual(ledger.month_xp(day), 22)
+        self.assertEqual(week_of(day), day)
+
+    def test_streak_and_freezes(self):
+        freezes = Freezes(1)
+        ledger = XPLedger({}, take_freeze=freezes)
+        ledger.record(10, ts(0))
+        ledger.record(10, ts(1))
+        # day 2 missed: one freeze bridges it
+        ledger.record(10, ts(3))
+        self.assertEqual(freezes.n, 0)
+        self.assertEqual(ledger.streak(local_day(ts(3))), 3)
+        # day 4 and 5 missed, no freezes left
+        self.assertTrue(ledger.settle(local_day(ts(6))))
+        self.assertEqual(ledger.streak(local_day(ts(6))), 0)
+        self.assertEqual(ledger.streak_state["best"], 3)
+
+    def test_remote_history_does_not_spend_freezes(self):
+        freezes = Freezes(5)
+        ledger = XPLedger({}, take_freeze=freezes)
+        ledger.record(10, ts(0))
+        # another device's old xp replayed a few days later
+        ledger.record(10, ts(2), settle=False)
+        ledger.record(10, ts(4), settle=False)
+        self.assertEqual(freezes.n, 5)
+        ledger.settle(local_day(ts(5)))
+        self.assertEqual(freezes.n, 5)
+        self.assertEqual(ledger.week_xp(local_day(ts(0))), 30)
+
+    def test_resume_from_saved_rollup(self):
+        data = {}
+        ledger = XPLedger(data)
+        ledger.record(10, ts(0))
+        data["xp_events"].append([ts(1), 4])  # an older two-field event
+        again = XPLedger(data)
+        self.assertEqual(again.day_xp(local_day(ts(1))), 4)
+        self.assertEqual(data["xp_rollup"]["events"], 2)
+        self.assertEqual(data["xp_events"][1][2], local_day(ts(1)))
+        data["xp_rollup"]["events"] = 99  # stale rollup: rebuilt from the events
+        self.assertEqual(XPLedger(data).week_xp(local_day(ts(0))), 14)
+
+    def test_old_day_buckets_are_compacted(self):
+        ledger = XPLedger({})
+        for i in range(XP_DAY_BUCKETS + 100):
+            ledger.record(1, ts(i))
+        days = ledger.rollup["days"]
+        self.assertLessEqual(len(days), XP_DAY_BUCKETS + 32)
+        last = local_day(ts(XP_DAY_BUCKETS + 99))
+        self.assertEqual(ledger.day_xp(last), 1)
+        self.assertEqual(ledger.day_xp(local_day(ts(0))), 0)
+        # weeks and months keep the full history
+        self.assertEqual(sum(ledger.rollup["months"].values()), XP_DAY_BUCKETS + 100)
+        self.assertEqual(ledger.month_xp(local_day(ts(0))), 19)
+        self.assertEqual(month_of(local_day(ts(0))), 2024 * 12 + 4)
+
+
+if __name__ == "__main__":
+    unittest.main()